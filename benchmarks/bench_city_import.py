@@ -0,0 +1,162 @@
+"""
+Бенчмарк загрузки списка городов OpenWeatherMap.
+
+Создаёт синтетический city.list.json.gz полного размера (~210 тыс.
+записей, часть с русскими названиями в поле "langs") и загружает его:
+
+- наивно: json.load всего файла и вставка по строке при действующих
+  индексах и триггерах;
+- import_cities: потоковый разбор, executemany крупными транзакциями,
+  индексы строятся в конце.
+
+Затем список загружается повторно поверх базы с избранными городами
+и проверяется, что избранное сохранилось. Пиковая память разбора
+измеряется через tracemalloc отдельным проходом.
+
+Запуск:
+    python -m benchmarks.bench_city_import [--cities 210000]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from benchmarks.bench_city_search import COUNTRIES, SYLLABLES
+from weather_app.db.database import Database
+from weather_app.db.importer import (
+    city_rows,
+    import_cities,
+    iter_json_array,
+    open_text,
+)
+
+FAVORITES = [7, 70_000, 140_000]
+
+
+def write_city_list(path: str, count: int) -> None:
+    """
+    Записывает синтетический city.list.json.gz.
+
+    Args:
+        path (str): Путь к файлу.
+        count (int): Количество городов.
+    """
+    rnd = random.Random(42)
+    with gzip.open(path, 'wt', encoding='utf-8') as stream:
+        stream.write('[\n')
+        for city_id in range(1, count + 1):
+            name = ''.join(
+                rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))
+            ).capitalize()
+            record = {
+                'id': city_id,
+                'name': name,
+                'state': '',
+                'country': rnd.choice(COUNTRIES),
+                'coord': {
+                    'lon': round(rnd.uniform(-180, 180), 6),
+                    'lat': round(rnd.uniform(-90, 90), 6),
+                },
+            }
+            if rnd.random() < 0.3:
+                record['langs'] = [{'ru': name}, {'en': name}]
+            if city_id > 1:
+                stream.write(',\n')
+            json.dump(record, stream, ensure_ascii=False)
+        stream.write('\n]\n')
+
+
+def naive_import(db_path: str, city_list_path: str) -> int:
+    """
+    Загрузка без потокового разбора и отложенных индексов.
+
+    Return:
+        int: Количество загруженных городов.
+    """
+    database = Database(db_path)
+    with open_text(city_list_path) as stream:
+        records = json.load(stream)
+    with database.conn:
+        for row in city_rows(iter(records)):
+            database.cursor.execute(
+                'INSERT OR REPLACE INTO cities '
+                '(id, country, name, ru_name, lat, lon) '
+                'VALUES (?, ?, ?, ?, ?, ?)', row
+            )
+    database.close()
+    return len(records)
+
+
+def parse_peak(city_list_path: str, full: bool) -> float:
+    """
+    Пиковая память разбора файла в МБ.
+
+    Args:
+        city_list_path (str): Путь к файлу.
+        full (bool): Разбирать целиком (json.load) или потоково.
+    """
+    tracemalloc.start()
+    with open_text(city_list_path) as stream:
+        if full:
+            json.load(stream)
+        else:
+            for _ in iter_json_array(stream):
+                pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=210_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        city_list = os.path.join(tmp, 'city.list.json.gz')
+        write_city_list(city_list, args.cities)
+        size = os.path.getsize(city_list) / 1024 / 1024
+        print(f'city.list.json.gz: {args.cities} городов, {size:.1f} МБ')
+
+        began = time.perf_counter()
+        count = naive_import(os.path.join(tmp, 'naive.db'), city_list)
+        print(f'Наивная загрузка: {count} городов за '
+              f'{time.perf_counter() - began:.2f} с')
+
+        db_path = os.path.join(tmp, 'import.db')
+        began = time.perf_counter()
+        stats = import_cities(db_path, city_list)
+        print(f'import_cities: {stats["cities"]} городов за '
+              f'{time.perf_counter() - began:.2f} с, с русским '
+              f'названием: {stats["named"]}')
+
+        database = Database(db_path)
+        for city_id in FAVORITES:
+            database.update_city_favorite(city_id, True)
+        database.close()
+
+        began = time.perf_counter()
+        import_cities(db_path, city_list)
+        elapsed = time.perf_counter() - began
+        database = Database(db_path)
+        kept = [row[0] for row in database.get_favorite_cities(['id'])]
+        found = database.get_cities(ru_name='мос', limit=5)
+        database.close()
+        print(f'Повторная загрузка: {elapsed:.2f} с, избранное '
+              f'сохранено: {sorted(kept) == FAVORITES}, '
+              f'поиск «мос»: {len(found)} городов')
+
+        print(f'Пиковая память разбора: json.load '
+              f'{parse_peak(city_list, True):.1f} МБ, потоково '
+              f'{parse_peak(city_list, False):.1f} МБ')
+
+
+if __name__ == '__main__':
+    main()
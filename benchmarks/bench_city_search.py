@@ -0,0 +1,151 @@
+"""
+Бенчмарк поиска городов по мере ввода.
+
+Создаёт временную базу с полноразмерным (~200 тыс. строк) списком
+городов и измеряет время Database.get_cities на каждое нажатие
+клавиши: со старым запросом LIKE '%q%' и с поисковыми индексами.
+
+Запуск:
+    python -m benchmarks.bench_city_search [--cities 200000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from weather_app.db.database import Database
+from typing import Callable, List
+
+SYLLABLES = [
+    'мо', 'ск', 'ва', 'пе', 'тер', 'бург', 'но', 'во', 'си', 'бирск',
+    'ка', 'зань', 'ека', 'те', 'рин', 'ом', 'са', 'ма', 'ра', 'ро',
+    'стов', 'уфа', 'крас', 'но', 'яр', 'пермь', 'во', 'ро', 'неж',
+    'вол', 'го', 'град', 'ки', 'ров', 'тю', 'мень', 'бар', 'на', 'ул',
+]
+COUNTRIES = ['RU', 'RU', 'RU', 'UA', 'BY', 'KZ', 'US', 'DE', 'FR', 'CN']
+QUERY = 'Санкт-Петербург'
+FIELDS = ['id', 'ru_name', 'lat', 'lon', 'country', 'favorite']
+
+
+def populate(db_path: str, count: int) -> None:
+    """
+    Заполняет базу синтетическим списком городов.
+
+    Args:
+        db_path (str): Путь к файлу базы данных.
+        count (int): Количество городов.
+    """
+    rnd = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE cities (
+            id INTEGER PRIMARY KEY, country TEXT, name TEXT,
+            ru_name TEXT, lat REAL, lon REAL, favorite BOOLEAN DEFAULT (0)
+        )
+    ''')
+    rows = []
+    for city_id in range(1, count + 1):
+        name = ''.join(
+            rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))
+        ).capitalize()
+        rows.append((
+            city_id, rnd.choice(COUNTRIES), name, name,
+            rnd.uniform(-90, 90), rnd.uniform(-180, 180),
+            1 if rnd.random() < 0.0005 else 0,
+        ))
+    rows.append((count + 1, 'RU', QUERY, QUERY, 59.94, 30.31, 0))
+    conn.executemany('INSERT INTO cities VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_search(database: Database, query: str) -> List[tuple]:
+    """
+    Поиск исходным запросом LIKE '%q%' (полный просмотр таблицы).
+
+    Args:
+        database (Database): База данных.
+        query (str): Поисковый запрос.
+
+    Return:
+        List[tuple]: Первые 100 найденных городов.
+    """
+    database.cursor.execute(
+        'SELECT ' + ', '.join(FIELDS) + ' FROM cities '
+        'WHERE ru_name IS NOT NULL AND (ru_name COLLATE NOCASE LIKE ? '
+        'OR ru_name COLLATE NOCASE LIKE ?) '
+        "ORDER BY favorite DESC, CASE WHEN country = 'RU' THEN 0 ELSE 1 END,"
+        ' country',
+        (f'%{query.upper()}%', f'%{query}%')
+    )
+    return database.cursor.fetchall()[:100]
+
+
+def measure(search: Callable[[str], List[tuple]], repeat: int) -> None:
+    """
+    Печатает среднее время поиска на каждое нажатие клавиши.
+
+    Запрос набирается посимвольно целиком repeat раз, как при вводе
+    пользователем.
+
+    Args:
+        search (Callable[[str], List[tuple]]): Функция поиска.
+        repeat (int): Количество повторов набора запроса.
+    """
+    prefixes = [QUERY[:length] for length in range(len(QUERY) + 1)]
+    elapsed = [0.0] * len(prefixes)
+    found: List[List[tuple]] = [[] for _ in prefixes]
+    for _ in range(repeat):
+        for i, query in enumerate(prefixes):
+            start = time.perf_counter()
+            found[i] = search(query)
+            elapsed[i] += time.perf_counter() - start
+
+    for query, seconds, rows in zip(prefixes, elapsed, found):
+        print(
+            f'    {query!r:<20} {seconds / repeat * 1000:8.2f} мс  '
+            f'({len(rows)} шт.)'
+        )
+    print(
+        f'    всего: {sum(elapsed) / repeat * 1000:.1f} мс '
+        f'на {len(prefixes)} нажатий'
+    )
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cities.db')
+        populate(db_path, args.cities)
+
+        start = time.perf_counter()
+        database = Database(db_path)
+        print(
+            f'Построение поисковых индексов: '
+            f'{time.perf_counter() - start:.2f} с'
+        )
+
+        print('LIKE \'%q%\' (как раньше):')
+        measure(lambda q: legacy_search(database, q), args.repeat)
+
+        print('Индексированный поиск:')
+        measure(
+            lambda q: database.get_cities(
+                fields=FIELDS, ru_name=q, limit=100
+            ),
+            args.repeat,
+        )
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Бенчмарк общей службы базы данных.
+
+Несколько потоков одновременно записывают мелкие изменения
+(настройки, как LAST_SITY_ID) и читают настройки. Сравниваются:
+
+- отдельное подключение Database на поток с фиксацией каждой записи
+  (журнал отката, как до DatabaseService);
+- DatabaseService: WAL, пул чтения и поток записи с групповой
+  фиксацией.
+
+Измеряется пропускная способность записи и задержка чтения,
+пока идёт запись.
+
+Запуск:
+    python -m benchmarks.bench_db_service [--threads 4] [--writes 500]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from weather_app.db.database import Database
+from weather_app.db.service import DatabaseService
+from typing import Callable, List, Tuple
+
+
+def run_threads(count: int, target: Callable[[int], None]) -> float:
+    """
+    Запускает count потоков и возвращает общее время в секундах.
+
+    Args:
+        count (int): Количество потоков.
+        target (Callable[[int], None]): Функция потока; получает номер.
+
+    Return:
+        float: Время до завершения всех потоков.
+    """
+    threads = [
+        threading.Thread(target=target, args=(number,))
+        for number in range(count)
+    ]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - began
+
+
+def bench_direct(
+    db_path: str,
+    threads: int,
+    writes: int
+) -> Tuple[float, List[float], int]:
+    """
+    Подключение на поток, фиксация каждой записи.
+
+    Return:
+        Tuple[float, List[float], int]: Время записи, задержки чтения
+        в мс и количество ошибок «database is locked».
+    """
+    Database(db_path).close()
+    latencies: List[float] = []
+    errors = [0]
+
+    def writer(number: int) -> None:
+        database = Database(db_path)
+        for i in range(writes):
+            try:
+                database.set_setting(f'BENCH_{number}', str(i))
+            except sqlite3.OperationalError:
+                errors[0] += 1
+        database.close()
+
+    def reader() -> None:
+        database = Database(db_path)
+        while not done.is_set():
+            began = time.perf_counter()
+            try:
+                database.get_setting('BENCH_0')
+            except sqlite3.OperationalError:
+                errors[0] += 1
+            latencies.append((time.perf_counter() - began) * 1000)
+        database.close()
+
+    done = threading.Event()
+    read_thread = threading.Thread(target=reader)
+    read_thread.start()
+    elapsed = run_threads(threads, writer)
+    done.set()
+    read_thread.join()
+    return elapsed, latencies, errors[0]
+
+
+def bench_service(
+    db_path: str,
+    threads: int,
+    writes: int
+) -> Tuple[float, List[float], dict]:
+    """
+    Общая служба: пул чтения и поток записи с групповой фиксацией.
+
+    Return:
+        Tuple[float, List[float], dict]: Время записи, задержки
+        чтения в мс и статистика службы.
+    """
+    service = DatabaseService(db_path)
+    latencies: List[float] = []
+
+    def writer(number: int) -> None:
+        futures = [
+            service.write(
+                lambda database, i=i: database.set_setting(
+                    f'BENCH_{number}', str(i)
+                )
+            )
+            for i in range(writes)
+        ]
+        for future in futures:
+            future.result()
+
+    def reader() -> None:
+        while not done.is_set():
+            began = time.perf_counter()
+            with service.reader() as database:
+                database.get_setting('BENCH_0')
+            latencies.append((time.perf_counter() - began) * 1000)
+
+    done = threading.Event()
+    read_thread = threading.Thread(target=reader)
+    read_thread.start()
+    elapsed = run_threads(threads, writer)
+    done.set()
+    read_thread.join()
+    stats = service.stats()
+    service.close()
+    return elapsed, latencies, stats
+
+
+def describe(latencies: List[float]) -> str:
+    """
+    Возвращает медиану и 99-й перцентиль задержек.
+    """
+    if not latencies:
+        return 'нет замеров'
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f'медиана {statistics.median(ordered):.3f} мс, p99 {p99:.3f} мс'
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=500)
+    args = parser.parse_args()
+    total = args.threads * args.writes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed, latencies, errors = bench_direct(
+            os.path.join(tmp, 'direct.db'), args.threads, args.writes
+        )
+        print(f'Подключение на поток: {total} записей за {elapsed:.2f} с '
+              f'({total / elapsed:,.0f} в с), ошибок блокировки: {errors}')
+        print(f'    чтение во время записи: {describe(latencies)}')
+
+        elapsed, latencies, stats = bench_service(
+            os.path.join(tmp, 'service.db'), args.threads, args.writes
+        )
+        print(f'DatabaseService: {total} записей за {elapsed:.2f} с '
+              f'({total / elapsed:,.0f} в с), транзакций: '
+              f'{stats["batches"]}, наибольшая пачка: '
+              f'{stats["largest_batch"]}')
+        print(f'    чтение во время записи: {describe(latencies)}')
+
+
+if __name__ == '__main__':
+    main()
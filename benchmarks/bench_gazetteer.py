@@ -0,0 +1,64 @@
+"""
+Бенчмарк индекса городов в памяти (CityGazetteer).
+
+Создаёт временную базу с полноразмерным (~200 тыс. строк) списком
+городов, загружает индекс, печатает занимаемую им память и время
+поиска на каждое нажатие клавиши в сравнении с запросами к SQLite.
+
+Запуск:
+    python -m benchmarks.bench_gazetteer [--cities 200000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.bench_city_search import FIELDS, QUERY, measure, populate
+from weather_app.db.database import Database
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cities.db')
+        populate(db_path, args.cities)
+        database = Database(db_path)
+
+        def search(query: str) -> list:
+            return database.get_cities(fields=FIELDS, ru_name=query, limit=100)
+
+        print('SQLite (индексы FTS5):')
+        measure(search, args.repeat)
+        expected = {q: search(q) for q in
+                    (QUERY[:n] for n in range(len(QUERY) + 1))}
+
+        start = time.perf_counter()
+        gazetteer = database.enable_gazetteer()
+        print(
+            f'Загрузка индекса ({len(gazetteer)} городов): '
+            f'{time.perf_counter() - start:.2f} с'
+        )
+        for part, size in gazetteer.memory_usage().items():
+            print(f'    {part:<12} {size / 1024 / 1024:8.2f} МБ')
+
+        print('CityGazetteer:')
+        measure(search, args.repeat)
+
+        mismatched = [
+            q for q, rows in expected.items()
+            if {row[0] for row in rows} != {row[0] for row in search(q)}
+        ]
+        if mismatched:
+            print(f'Расхождения с SQLite для запросов: {mismatched}')
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Бенчмарк ядра приложения без интерфейса.
+
+Запускает WeatherService против локального сервера с ответами
+в формате OpenWeatherMap (benchmarks.fake_owm) и измеряет:
+
+- получение погоды и прогноза по одному городу (кэш пуст);
+- те же запросы из кэша;
+- пакетное получение текущей погоды методом group.
+
+В конце проверяется, что PyQt5 так и не был импортирован, то есть
+ядро работает без дисплея и в серверном процессе.
+
+Запуск:
+    python -m benchmarks.bench_headless [--cities 100] [--delay 0.02]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.fake_owm import FakeOpenWeatherMap
+from weather_app.api.service import WeatherService
+from typing import Callable, List
+
+
+def measure(calls: List[Callable[[], object]]) -> List[float]:
+    """
+    Выполняет вызовы по очереди и возвращает их время в мс.
+    """
+    times = []
+    for call in calls:
+        began = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - began) * 1000)
+    return times
+
+
+def describe(times: List[float]) -> str:
+    """
+    Возвращает медиану и наибольшее время.
+    """
+    return (f'медиана {statistics.median(times):.2f} мс, '
+            f'максимум {max(times):.2f} мс')
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=100)
+    parser.add_argument('--delay', type=float, default=0.02)
+    args = parser.parse_args()
+    city_ids = list(range(1, args.cities + 1))
+
+    server = FakeOpenWeatherMap(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = WeatherService(os.path.join(tmp, 'weather.db'))
+        server.connect(service, os.path.join(tmp, 'icons'))
+        api = service.api
+
+        times = measure([
+            lambda city_id=city_id: api.fetch_weather_and_forecast(city_id)
+            for city_id in city_ids
+        ])
+        print(f'Погода и прогноз из сети (задержка сервера '
+              f'{args.delay * 1000:.0f} мс): {describe(times)}')
+
+        times = measure([
+            lambda city_id=city_id: api.fetch_weather_and_forecast(city_id)
+            for city_id in city_ids
+        ])
+        print(f'Погода и прогноз из кэша: {describe(times)}')
+
+        for city_id in city_ids:
+            api.invalidate(city_id)
+        began = time.perf_counter()
+        weather = api.fetch_weather_by_city_ids(city_ids)
+        print(f'Текущая погода {len(weather)} городов методом group: '
+              f'{(time.perf_counter() - began) * 1000:.1f} мс')
+
+        service.close()
+        stats = service.history.stats()
+        print(f'Запросов к серверу: {server.requests}, записано строк '
+              f'истории: {stats["written"]}')
+        server.close()
+
+    print(f'PyQt5 импортирован: {"да" if "PyQt5" in sys.modules else "нет"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Бенчмарк хранения и выборки истории погоды.
+
+Создаёт временную базу с наблюдениями раз в 10 минут за год
+для нескольких городов (по умолчанию 20 городов, ~1 млн строк),
+записывая их пачками через Database.add_weather_history, затем
+строит почасовые и посуточные агрегаты и измеряет выборку
+«температура за последние 30 дней» для одного города:
+
+- по наблюдениям в таблице WITHOUT ROWID с ключом (city_id, ts);
+- по тем же наблюдениям в обычной таблице с индексом (city_id, ts);
+- по почасовым агрегатам (разрешение, выбираемое автоматически).
+
+Запуск:
+    python -m benchmarks.bench_history [--cities 20] [--days 365]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from weather_app.db.database import Database
+from typing import Callable, Iterator, List, Tuple
+
+STEP = 600
+
+
+def observations(
+    cities: int,
+    start: int,
+    end: int
+) -> Iterator[Tuple]:
+    """
+    Порождает синтетические наблюдения в порядке времени.
+
+    Args:
+        cities (int): Количество городов.
+        start (int): Начало периода, время Unix.
+        end (int): Конец периода, время Unix.
+
+    Return:
+        Iterator[Tuple]: Строки для Database.add_weather_history.
+    """
+    rnd = random.Random(7)
+    for ts in range(start, end, STEP):
+        for city_id in range(1, cities + 1):
+            temperature = round(rnd.uniform(-30, 35), 1)
+            yield (
+                city_id, ts, temperature, temperature - 2,
+                rnd.randint(980, 1040), rnd.randint(20, 100),
+                round(rnd.uniform(0, 15), 1), rnd.randint(0, 359),
+                rnd.randint(0, 100), '01d',
+            )
+
+
+def timed(call: Callable[[], list], repeat: int) -> Tuple[float, list]:
+    """
+    Возвращает среднее время вызова в миллисекундах и его результат.
+
+    Args:
+        call (Callable[[], list]): Измеряемый вызов.
+        repeat (int): Количество повторов.
+
+    Return:
+        Tuple[float, list]: Время в мс и результат последнего вызова.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=20)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+
+    now = int(time.time())
+    now -= now % STEP
+    start = now - args.days * 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, 'history.db'))
+
+        began = time.perf_counter()
+        batch: List[Tuple] = []
+        total = 0
+        for row in observations(args.cities, start, now):
+            batch.append(row)
+            if len(batch) >= args.batch:
+                database.add_weather_history(batch, [])
+                total += len(batch)
+                batch = []
+        database.add_weather_history(batch, [])
+        total += len(batch)
+        elapsed = time.perf_counter() - began
+        print(
+            f'Запись {total} наблюдений пачками по {args.batch}: '
+            f'{elapsed:.1f} с ({total / elapsed:,.0f} строк/с)'
+        )
+
+        began = time.perf_counter()
+        database.rollup_weather_history()
+        print(f'Построение агрегатов: {time.perf_counter() - began:.1f} с')
+
+        # Та же выборка по обычной таблице с rowid и вторичным индексом
+        database.cursor.executescript('''
+            CREATE TABLE observations_rowid AS
+            SELECT * FROM weather_observations ORDER BY ts, city_id;
+            CREATE INDEX idx_observations_rowid
+            ON observations_rowid (city_id, ts);
+        ''')
+
+        city_id = args.cities // 2 or 1
+        month_ago = now - 30 * 86400
+        elapsed_raw, raw = timed(lambda: database.get_weather_history(
+            city_id, month_ago, now, 'raw'
+        ), 20)
+        elapsed_rowid, _ = timed(lambda: database.cursor.execute(
+            'SELECT ts, temperature, pressure, humidity, wind_speed '
+            'FROM observations_rowid '
+            'WHERE city_id = ? AND ts >= ? AND ts < ? ORDER BY ts',
+            (city_id, month_ago, now)
+        ).fetchall(), 20)
+        elapsed_auto, auto = timed(lambda: database.get_weather_history(
+            city_id, month_ago, now
+        ), 20)
+
+        print('Температура за 30 дней для одного города:')
+        print(f'    наблюдения, WITHOUT ROWID:  {elapsed_raw:8.2f} мс '
+              f'({len(raw)} строк)')
+        print(f'    наблюдения, rowid + индекс: {elapsed_rowid:8.2f} мс')
+        print(f'    почасовые агрегаты:         {elapsed_auto:8.2f} мс '
+              f'({len(auto)} строк)')
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Бенчмарк поиска ближайших городов по координатам.
+
+Создаёт временную базу с полноразмерным (~200 тыс. строк) списком
+городов и сравнивает поиск по индексу R*Tree
+(Database.get_nearest_cities и get_cities_within_radius)
+с линейным перебором всех городов по формуле гаверсинусов.
+
+Запуск:
+    python -m benchmarks.bench_nearest_city [--cities 200000]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import tempfile
+import time
+from benchmarks.bench_city_search import populate
+from weather_app.db.database import Database
+from weather_app.db.geo import haversine_km
+from typing import Callable, List, Tuple
+
+
+def timed(call: Callable[[], list], repeat: int) -> Tuple[float, list]:
+    """
+    Возвращает среднее время вызова в миллисекундах и его результат.
+
+    Args:
+        call (Callable[[], list]): Измеряемый вызов.
+        repeat (int): Количество повторов.
+
+    Return:
+        Tuple[float, list]: Время в мс и результат последнего вызова.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cities', type=int, default=200_000)
+    parser.add_argument('--points', type=int, default=20)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--radius', type=float, default=50.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cities.db')
+        populate(db_path, args.cities)
+
+        start = time.perf_counter()
+        database = Database(db_path)
+        print(
+            f'Построение индексов: {time.perf_counter() - start:.2f} с'
+        )
+
+        database.cursor.execute('SELECT id, lat, lon FROM cities')
+        cities: List[Tuple[int, float, float]] = database.cursor.fetchall()
+
+        rnd = random.Random(7)
+        points = [
+            (rnd.uniform(-80, 80), rnd.uniform(-180, 180))
+            for _ in range(args.points)
+        ]
+
+        totals = {'linear': 0.0, 'nearest': 0.0, 'radius': 0.0}
+        for lat, lon in points:
+            elapsed, expected = timed(lambda: heapq.nsmallest(
+                args.k, cities,
+                key=lambda c: haversine_km(lat, lon, c[1], c[2])
+            ), 1)
+            totals['linear'] += elapsed
+
+            elapsed, nearest = timed(lambda: database.get_nearest_cities(
+                lat, lon, args.k, fields=['id']
+            ), 5)
+            totals['nearest'] += elapsed
+            if [row[0] for row in nearest] != [c[0] for c in expected]:
+                print(f'Расхождение для точки ({lat:.3f}, {lon:.3f})')
+
+            elapsed, _ = timed(lambda: database.get_cities_within_radius(
+                lat, lon, args.radius, fields=['id']
+            ), 5)
+            totals['radius'] += elapsed
+
+        print(f'Среднее по {args.points} точкам:')
+        print(f'    линейный перебор, k={args.k}:  '
+              f'{totals["linear"] / args.points:8.2f} мс')
+        print(f'    R*Tree, k={args.k}:            '
+              f'{totals["nearest"] / args.points:8.2f} мс')
+        print(f'    R*Tree, радиус {args.radius:g} км:    '
+              f'{totals["radius"] / args.points:8.2f} мс')
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
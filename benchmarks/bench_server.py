@@ -0,0 +1,199 @@
+"""
+Бенчмарк локального HTTP-сервера погоды.
+
+Запускает WeatherServer поверх локального сервера с ответами
+в формате OpenWeatherMap (benchmarks.fake_owm) с задержкой ответа
+и измеряет:
+
+- сколько запросов к OpenWeatherMap вызывают одновременные
+  одинаковые запросы к серверу (объединение запросов);
+- пропускную способность для данных из кэша по keep-alive
+  соединениям;
+- долю ответов 304 на повторные запросы с If-None-Match.
+
+Запуск:
+    python -m benchmarks.bench_server [--clients 200] [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from benchmarks.fake_owm import FakeOpenWeatherMap
+from weather_app.api.service import WeatherService
+from weather_app.server import WeatherServer
+from typing import Dict, List, Tuple
+
+
+class Client:
+    """
+    HTTP/1.1-клиент с одним keep-alive соединением.
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader: asyncio.StreamReader
+        self.writer: asyncio.StreamWriter
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(
+            '127.0.0.1', self.port
+        )
+
+    async def get(
+        self,
+        path: str,
+        headers: Dict[str, str] = {}
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Выполняет GET-запрос и возвращает код, заголовки и тело.
+        """
+        lines = [f'GET {path} HTTP/1.1', 'Host: localhost']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = (await self.reader.readline()).decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            response_headers[name.lower()] = value.strip()
+        length = int(response_headers.get('content-length', 0))
+        body = await self.reader.readexactly(length) if length else b''
+        return status, response_headers, body
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def coalescing(port: int, clients: int, city_id: int) -> float:
+    """
+    Одновременно запрашивает погоду одного города с clients соединений.
+
+    Return:
+        float: Время до получения всех ответов в мс.
+    """
+    connections = [Client(port) for _ in range(clients)]
+    await asyncio.gather(*(client.connect() for client in connections))
+    began = time.perf_counter()
+    results = await asyncio.gather(*(
+        client.get(f'/weather/{city_id}') for client in connections
+    ))
+    elapsed = (time.perf_counter() - began) * 1000
+    assert all(status == 200 for status, _, _ in results)
+    for client in connections:
+        client.close()
+    return elapsed
+
+
+async def throughput(
+    port: int,
+    connections: int,
+    requests: int,
+    paths: List[str],
+    conditional: bool
+) -> Tuple[float, Dict[int, int]]:
+    """
+    Выполняет requests запросов по connections соединениям.
+
+    Args:
+        conditional (bool): Передавать ли If-None-Match с ETag
+            предыдущего ответа на тот же путь.
+
+    Return:
+        Tuple[float, Dict[int, int]]: Запросов в секунду и количество
+        ответов по кодам.
+    """
+    statuses: Dict[int, int] = {}
+    etags: Dict[str, str] = {}
+
+    async def worker(number: int) -> None:
+        client = Client(port)
+        await client.connect()
+        for i in range(number, requests, connections):
+            path = paths[i % len(paths)]
+            headers = (
+                {'If-None-Match': etags[path]}
+                if conditional and path in etags else {}
+            )
+            status, response_headers, _ = await client.get(path, headers)
+            statuses[status] = statuses.get(status, 0) + 1
+            if 'etag' in response_headers:
+                etags[path] = response_headers['etag']
+        client.close()
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(connections)))
+    return requests / (time.perf_counter() - began), statuses
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--delay', type=float, default=0.2)
+    args = parser.parse_args()
+
+    upstream = FakeOpenWeatherMap(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = WeatherService(
+            os.path.join(tmp, 'weather.db'),
+            record_history=False,
+            prefetch_icons=False,
+        )
+        upstream.connect(service, os.path.join(tmp, 'icons'))
+        server = WeatherServer(service, port=0)
+
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        async def serve() -> None:
+            await server.start()
+            started.set()
+            await server.serve_forever()
+
+        thread = threading.Thread(
+            target=lambda: loop.run_until_complete(serve()), daemon=True
+        )
+        thread.start()
+        started.wait()
+
+        elapsed = asyncio.run(coalescing(server.port, args.clients, 1))
+        print(f'{args.clients} одновременных запросов /weather/1 '
+              f'(задержка API {args.delay * 1000:.0f} мс): {elapsed:.0f} мс, '
+              f'запросов к API: {upstream.requests}')
+
+        paths = [f'/weather/{city_id}' for city_id in range(1, 101)]
+        for path in paths:
+            asyncio.run(coalescing(server.port, 1, int(path.split('/')[2])))
+
+        rate, statuses = asyncio.run(throughput(
+            server.port, args.connections, args.requests, paths, False
+        ))
+        print(f'Из кэша: {rate:,.0f} запросов в с, коды {statuses}')
+
+        rate, statuses = asyncio.run(throughput(
+            server.port, args.connections, args.requests, paths, True
+        ))
+        print(f'С If-None-Match: {rate:,.0f} запросов в с, коды {statuses}')
+
+        metrics = server.metrics.snapshot()
+        print(f'Метрики: запросов {metrics["requests"]}, вызовов кэша и '
+              f'API {metrics["upstream_calls"]}, объединено '
+              f'{metrics["coalesced"]}, запросов к API {upstream.requests}')
+
+        loop.call_soon_threadsafe(server.close)
+        thread.join()
+        service.close()
+        upstream.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Бенчмарк объединения одновременных запросов погоды (single-flight).
+
+Запускает WeatherService против локального сервера с ответами
+в формате OpenWeatherMap (benchmarks.fake_owm) с задержкой ответа
+и считает запросы к API:
+
+- без объединения: потоки одновременно запрашивают один город
+  напрямую через WeatherAPI, как раньше при каждом клике;
+- с объединением: те же потоки запрашивают город через
+  CachedWeatherAPI, часть — только текущую погоду;
+- быстрая навигация: клики по нескольким городам с интервалом
+  меньше задержки API, каждый в своём потоке, как в
+  HomePage.update_weather; результаты устаревших поколений
+  отбрасываются.
+
+Запуск:
+    python -m benchmarks.bench_single_flight [--threads 20] [--delay 0.2]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from benchmarks.fake_owm import FakeOpenWeatherMap
+from weather_app.api.service import WeatherService
+from typing import Callable, List
+
+
+def run_concurrently(calls: List[Callable[[], object]]) -> float:
+    """
+    Запускает вызовы одновременно и ждёт их завершения.
+
+    Return:
+        float: Время до завершения всех вызовов в мс.
+    """
+    barrier = threading.Barrier(len(calls))
+
+    def run(call: Callable[[], object]) -> None:
+        barrier.wait()
+        call()
+
+    threads = [threading.Thread(target=run, args=(call,)) for call in calls]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - began) * 1000
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--clicks', type=int, default=30)
+    parser.add_argument('--cities', type=int, default=3)
+    parser.add_argument('--delay', type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = FakeOpenWeatherMap(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = WeatherService(
+            os.path.join(tmp, 'weather.db'),
+            record_history=False,
+            prefetch_icons=False,
+        )
+        server.connect(service, os.path.join(tmp, 'icons'))
+        api = service.api
+
+        before = server.requests
+        elapsed = run_concurrently([
+            lambda: api.api.fetch_weather_and_forecast(1)
+        ] * args.threads)
+        print(f'Без объединения, {args.threads} потоков: '
+              f'{server.requests - before} запросов к API, '
+              f'{elapsed:.0f} мс')
+
+        before = server.requests
+        elapsed = run_concurrently([
+            lambda: api.fetch_weather_and_forecast(2),
+            lambda: api.fetch_weather_by_city_id(2),
+        ] * (args.threads // 2))
+        print(f'С объединением, {args.threads} потоков: '
+              f'{server.requests - before} запросов к API, '
+              f'{elapsed:.0f} мс')
+
+        # Быстрая навигация: поколения как в HomePage.update_weather
+        before = server.requests
+        lock = threading.Lock()
+        state = {'generation': 0, 'applied': 0, 'discarded': 0}
+        city_ids = [100 + n % args.cities for n in range(args.clicks)]
+
+        def click(generation: int, city_id: int) -> None:
+            api.fetch_weather_and_forecast(city_id)
+            with lock:
+                if generation == state['generation']:
+                    state['applied'] += 1
+                else:
+                    state['discarded'] += 1
+
+        threads = []
+        began = time.perf_counter()
+        for city_id in city_ids:
+            with lock:
+                state['generation'] += 1
+                generation = state['generation']
+            thread = threading.Thread(
+                target=click, args=(generation, city_id)
+            )
+            thread.start()
+            threads.append(thread)
+            time.sleep(args.delay / 20)
+        for thread in threads:
+            thread.join()
+        elapsed = (time.perf_counter() - began) * 1000
+        print(f'Быстрая навигация, {args.clicks} кликов по '
+              f'{args.cities} городам: {server.requests - before} '
+              f'запросов к API, отображено {state["applied"]}, '
+              f'отброшено {state["discarded"]}, {elapsed:.0f} мс')
+
+        print(f'Кэш: {api.cache.stats()}')
+        service.close()
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
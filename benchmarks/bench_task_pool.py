@@ -0,0 +1,157 @@
+"""
+Бенчмарк пула фоновых задач (TaskPool) при частых кликах.
+
+Запускает WeatherService против локального сервера с ответами
+в формате OpenWeatherMap (benchmarks.fake_owm) с задержкой ответа
+и сравнивает:
+
+- поток на каждый клик, как раньше в HomePage.update_weather;
+- пул задач с отменой ещё не начатой загрузки предыдущего города.
+
+Для обоих способов выводится наибольшее число потоков процесса
+и запросов к API. Затем измеряется задержка клика, когда пул занят
+фоновыми обновлениями: интерактивная задача опережает очередь.
+
+Запуск:
+    python -m benchmarks.bench_task_pool [--clicks 200] [--delay 0.2]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from benchmarks.fake_owm import FakeOpenWeatherMap
+from weather_app.api.service import WeatherService
+from weather_app.api.tasks import BACKGROUND, CancellationToken
+from typing import Callable, List, Optional
+
+
+class PeakThreads:
+    """
+    Следит за наибольшим числом потоков процесса.
+    """
+
+    def __init__(self) -> None:
+        self.peak: int = threading.active_count()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(0.001):
+            self.peak = max(self.peak, threading.active_count())
+
+    def stop(self) -> int:
+        self._stopped.set()
+        self._thread.join()
+        return self.peak
+
+
+def clicks(
+    count: int,
+    cities: int,
+    interval: float,
+    click: Callable[[int], None]
+) -> None:
+    """
+    Выполняет count кликов по cities городам с интервалом interval.
+    """
+    for n in range(count):
+        click(1000 + n % cities)
+        time.sleep(interval)
+
+
+def main() -> None:
+    """
+    Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clicks', type=int, default=200)
+    parser.add_argument('--cities', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.002)
+    parser.add_argument('--delay', type=float, default=0.2)
+    parser.add_argument('--background', type=int, default=100)
+    args = parser.parse_args()
+
+    server = FakeOpenWeatherMap(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = WeatherService(
+            os.path.join(tmp, 'weather.db'),
+            record_history=False,
+            prefetch_icons=False,
+        )
+        server.connect(service, os.path.join(tmp, 'icons'))
+        api = service.api
+
+        def reset() -> None:
+            for n in range(args.cities):
+                api.invalidate(1000 + n)
+
+        # Поток на каждый клик
+        threads: List[threading.Thread] = []
+
+        def thread_click(city_id: int) -> None:
+            thread = threading.Thread(
+                target=api.fetch_weather_and_forecast,
+                args=(city_id,),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        before = server.requests
+        peak = PeakThreads()
+        began = time.perf_counter()
+        clicks(args.clicks, args.cities, args.interval, thread_click)
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        print(f'Поток на клик: потоков до {peak.stop()}, запросов к API '
+              f'{server.requests - before}, {elapsed:.1f} с')
+
+        # Пул задач с отменой предыдущей загрузки
+        reset()
+        token: Optional[CancellationToken] = None
+        futures = []
+
+        def pool_click(city_id: int) -> None:
+            nonlocal token
+            if token is not None:
+                token.cancel()
+            token = CancellationToken()
+            futures.append(service.tasks.submit(
+                api.fetch_weather_and_forecast, city_id, token=token
+            ))
+
+        before = server.requests
+        peak = PeakThreads()
+        began = time.perf_counter()
+        clicks(args.clicks, args.cities, args.interval, pool_click)
+        futures[-1].result()
+        elapsed = time.perf_counter() - began
+        print(f'Пул задач: потоков до {peak.stop()}, запросов к API '
+              f'{server.requests - before}, {elapsed:.1f} с, '
+              f'{service.tasks.stats()}')
+
+        # Клик при очереди фоновых обновлений
+        reset()
+        for n in range(args.background):
+            service.tasks.submit(
+                api.refresh_forecast_by_city_id,
+                2000 + n,
+                priority=BACKGROUND,
+            )
+        time.sleep(args.delay / 2)
+        began = time.perf_counter()
+        service.tasks.submit(api.fetch_weather_and_forecast, 1000).result()
+        print(f'Клик при {args.background} фоновых задачах в очереди: '
+              f'{(time.perf_counter() - began) * 1000:.0f} мс '
+              f'(задержка API {args.delay * 1000:.0f} мс)')
+
+        service.close()
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Локальный HTTP-сервер с ответами в формате OpenWeatherMap.
+
+Нужен бенчмаркам, чтобы измерять работу приложения с настоящим
+HTTP-стеком, но без сети и лимитов API. Ответы синтетические
+и зависят только от ID города.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from weather_app.api.icon_cache import IconCache
+from weather_app.api.rate_limit import RateLimiter
+from weather_app.api.service import WeatherService
+from typing import Any, Dict
+
+# Заголовок PNG; иконки в бенчмарках не декодируются
+ICON = b'\x89PNG\r\n\x1a\n' + b'\x00' * 1024
+
+
+def weather_json(city_id: int, now: int) -> Dict[str, Any]:
+    """
+    Ответ метода weather для города.
+    """
+    return {
+        'id': city_id,
+        'name': f'Город {city_id}',
+        'dt': now,
+        'timezone': 10800,
+        'visibility': 10000,
+        'sys': {'country': 'RU', 'sunrise': now - 20000,
+                'sunset': now + 20000},
+        'main': {'temp': city_id % 30, 'feels_like': city_id % 30 - 2,
+                 'temp_min': city_id % 30 - 1, 'temp_max': city_id % 30 + 1,
+                 'pressure': 1013, 'humidity': 60},
+        'wind': {'speed': 3.0, 'deg': 90},
+        'clouds': {'all': 40},
+        'weather': [{'id': 802, 'description': 'облачно', 'icon': '03d'}],
+    }
+
+
+def group_item_json(city_id: int, now: int) -> Dict[str, Any]:
+    """
+    Элемент ответа метода group для города: смещение часового пояса
+    в нём лежит в sys, а не на верхнем уровне.
+    """
+    data = weather_json(city_id, now)
+    data['sys']['timezone'] = data.pop('timezone')
+    return data
+
+
+def forecast_json(city_id: int, now: int) -> Dict[str, Any]:
+    """
+    Ответ метода forecast (40 трёхчасовых интервалов) для города.
+    """
+    start = now // 10800 * 10800
+    entries = []
+    for i in range(40):
+        rain = i % 3 == 0
+        entries.append({
+            'dt': start + i * 10800,
+            'main': {'temp': i % 10, 'temp_min': i % 10 - 1,
+                     'temp_max': i % 10 + 1, 'pressure': 1010,
+                     'humidity': 70},
+            'wind': {'speed': 2.0 + i % 4},
+            'rain': {'3h': 0.4} if rain else {},
+            'weather': [{
+                'id': 500 if rain else 803,
+                'description': 'дождь' if rain else 'пасмурно',
+                'icon': '10d' if rain else '04d',
+            }],
+        })
+    return {'list': entries, 'city': {'id': city_id, 'timezone': 10800}}
+
+
+class FakeOpenWeatherMap:
+    """
+    HTTP-сервер в отдельном потоке.
+
+    Attributes:
+        url (str): Адрес сервера.
+        delay (float): Искусственная задержка ответа в секундах.
+        requests (int): Количество обработанных запросов.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        """
+        Запускает сервер на свободном порту.
+
+        Args:
+            delay (float): Задержка каждого ответа в секундах.
+        """
+        self.delay: float = delay
+        self.requests: int = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_GET(self) -> None:
+                body = server.respond(self.path)
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url: str = f'http://127.0.0.1:{self._server.server_port}'
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def respond(self, path: str) -> bytes:
+        """
+        Возвращает тело ответа на запрос.
+        """
+        with self._lock:
+            self.requests += 1
+        if self.delay:
+            time.sleep(self.delay)
+        url = urlparse(path)
+        if url.path.startswith('/img/'):
+            return ICON
+        ids = [int(i) for i in parse_qs(url.query)['id'][0].split(',')]
+        now = int(time.time())
+        if url.path.endswith('/forecast'):
+            data: Any = forecast_json(ids[0], now)
+        elif url.path.endswith('/group'):
+            data = {'cnt': len(ids),
+                    'list': [group_item_json(i, now) for i in ids]}
+        else:
+            data = weather_json(ids[0], now)
+        return json.dumps(data).encode()
+
+    def connect(self, service: WeatherService, icon_dir: str) -> None:
+        """
+        Направляет запросы ядра приложения на этот сервер и снимает
+        ограничение частоты запросов.
+
+        Args:
+            service (WeatherService): Ядро приложения.
+            icon_dir (str): Каталог дискового кэша иконок.
+        """
+        api = service.api.api
+        api.base_url = f'{self.url}/data/2.5/weather'
+        api.forecast_url = f'{self.url}/data/2.5/forecast'
+        api.group_url = f'{self.url}/data/2.5/group'
+        api.rate_limiter = RateLimiter(rate=1e6, burst=1_000_000)
+        api.transport.probe_url = f'{self.url}/'
+        api.icon_cache = IconCache(
+            api.transport, cache_dir=icon_dir, bundle_dir=icon_dir
+        )
+        api.icon_cache.icon_url = self.url + '/img/wn/{code}@2x.png'
+
+    def close(self) -> None:
+        """
+        Останавливает сервер.
+        """
+        self._server.shutdown()
+        self._server.server_close()
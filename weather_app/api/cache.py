@@ -0,0 +1,634 @@
+import threading
+import time
+from collections import OrderedDict
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.api.single_flight import SingleFlight
+from weather_app.api.tasks import BACKGROUND, TaskPool
+from weather_app.api.weather_api import WeatherAPI
+from weather_app.db.database import Database
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+)
+
+
+class TTLCache:
+    """
+    Кэш ответов с временем жизни и режимом stale-while-revalidate.
+
+    Свежая запись отдаётся сразу. Устаревшая, но не слишком старая
+    запись тоже отдаётся сразу, а в фоне запускается её обновление.
+    Только при отсутствии записи (или если она старше допустимого)
+    вызывающий ждёт загрузки; одновременные загрузки одного ключа
+    объединяются в одну (см. SingleFlight).
+
+    Размер кэша ограничен max_entries: при переполнении вытесняются
+    записи, к которым дольше всего не обращались, поэтому кэш
+    долго работающего сервера не растёт без предела.
+
+    Attributes:
+        max_stale (float):
+            Сколько секунд после истечения TTL запись ещё можно отдавать,
+            пока она обновляется в фоне.
+        max_entries (int): Наибольшее количество записей.
+        hits (int): Количество обращений, обслуженных свежими данными.
+        stale_hits (int): Количество обращений, обслуженных устаревшими
+            данными с фоновым обновлением.
+        misses (int): Количество обращений с синхронной загрузкой.
+        refreshes (int): Количество успешных фоновых обновлений.
+        errors (int): Количество неудачных фоновых обновлений.
+        evictions (int): Количество вытесненных записей.
+        flights (SingleFlight): Выполняющиеся синхронные загрузки.
+        pool (Optional[TaskPool]): Пул для фоновых обновлений.
+    """
+
+    def __init__(
+        self,
+        max_stale: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+        pool: Optional[TaskPool] = None,
+        max_entries: int = 4096,
+    ):
+        """
+        Инициализирует пустой кэш.
+
+        Args:
+            max_stale (float):
+                Допустимый возраст устаревшей записи сверх TTL, в секундах.
+            clock (Callable[[], float]):
+                Источник времени (по умолчанию time.monotonic).
+            pool (Optional[TaskPool]):
+                Пул, в котором выполняются фоновые обновления
+                с приоритетом BACKGROUND. Без пула каждое обновление
+                выполняется в отдельном потоке.
+            max_entries (int):
+                Наибольшее количество записей; при переполнении
+                вытесняются давно не использованные.
+        """
+        if max_entries < 1:
+            raise ValueError("Кэшу нужна хотя бы одна запись")
+        self.max_stale: float = max_stale
+        self.max_entries: int = max_entries
+        self.pool: Optional[TaskPool] = pool
+        self._clock = clock
+        # Порядок записей — от давно не использованных к недавним
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = (
+            OrderedDict()
+        )
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self.flights: SingleFlight = SingleFlight()
+
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self.refreshes: int = 0
+        self.errors: int = 0
+        self.evictions: int = 0
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+    ) -> Any:
+        """
+        Возвращает значение по ключу, загружая или обновляя его при
+        необходимости.
+
+        Args:
+            key (Hashable): Ключ записи.
+            loader (Callable[[], Any]): Функция загрузки значения.
+            ttl (float): Время жизни записи в секундах.
+
+        Return:
+            Any: Закэшированное или только что загруженное значение.
+
+        Exception:
+            Исключения loader пробрасываются, если данных в кэше нет.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                value, stored_at = entry
+                age = now - stored_at
+                if age < ttl:
+                    self.hits += 1
+                    return value
+                if age < ttl + self.max_stale:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._start_revalidate(key, loader)
+                    return value
+            self.misses += 1
+
+        return self.flights.do(key, lambda: self.load(key, loader, ttl))
+
+    def load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+    ) -> Any:
+        """
+        Загружает значение и сохраняет его в кэш.
+
+        Вызывается ведущим SingleFlight: если свежая запись появилась,
+        пока он становился ведущим (предыдущая загрузка только что
+        завершилась), она отдаётся без повторного запроса.
+
+        Args:
+            key (Hashable): Ключ записи.
+            loader (Callable[[], Any]): Функция загрузки значения.
+            ttl (float): Время жизни записи в секундах.
+
+        Return:
+            Any: Загруженное значение.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry[1] < ttl:
+            return entry[0]
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def _start_revalidate(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any]
+    ) -> None:
+        """
+        Запускает фоновое обновление записи в пуле или в потоке.
+
+        Args:
+            key (Hashable): Ключ записи.
+            loader (Callable[[], Any]): Функция загрузки значения.
+        """
+        if self.pool is None:
+            threading.Thread(
+                target=self._revalidate, args=(key, loader), daemon=True
+            ).start()
+            return
+        try:
+            self.pool.submit(
+                self._revalidate, key, loader, priority=BACKGROUND
+            )
+        except RuntimeError:
+            # Пул остановлен: устаревшая запись остаётся до следующего
+            # обращения
+            self._refreshing.discard(key)
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        """
+        Обновляет запись в фоне. При ошибке остаются прежние данные.
+
+        Args:
+            key (Hashable): Ключ записи.
+            loader (Callable[[], Any]): Функция загрузки значения.
+        """
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+                self._refreshing.discard(key)
+            return
+
+        with self._lock:
+            self._store(key, value)
+            self.refreshes += 1
+            self._refreshing.discard(key)
+
+    def has(self, key: Hashable, ttl: float) -> bool:
+        """
+        Проверяет, можно ли отдать запись без синхронной загрузки.
+
+        Args:
+            key (Hashable): Ключ записи.
+            ttl (float): Время жизни записи в секундах.
+
+        Return:
+            bool: True, если запись свежая или ещё допустимо устаревшая.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return self._clock() - entry[1] < ttl + self.max_stale
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """
+        Возвращает возраст записи.
+
+        Args:
+            key (Hashable): Ключ записи.
+
+        Return:
+            Optional[float]: Возраст в секундах или None, если записи нет.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else self._clock() - entry[1]
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        Возвращает значение записи без загрузки и учёта в статистике,
+        даже если запись устарела.
+
+        Args:
+            key (Hashable): Ключ записи.
+
+        Return:
+            Any: Значение или None, если записи нет.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def record_miss(self, count: int = 1) -> None:
+        """
+        Учитывает промахи, загруженные в обход get (например, пакетно).
+
+        Args:
+            count (int): Количество промахов.
+        """
+        with self._lock:
+            self.misses += count
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение в кэш с текущим временем.
+
+        Args:
+            key (Hashable): Ключ записи.
+            value (Any): Значение.
+        """
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение и вытесняет давно не использованные записи
+        сверх max_entries. Вызывается под блокировкой.
+
+        Args:
+            key (Hashable): Ключ записи.
+            value (Any): Значение.
+        """
+        self._entries[key] = (value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Удаляет запись из кэша.
+
+        Args:
+            key (Hashable): Ключ записи.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает счётчики обращений к кэшу.
+
+        Return:
+            Dict[str, int]: Счётчики hits, stale_hits, misses,
+            refreshes, errors, evictions, coalesced (загрузки,
+            объединённые с уже выполняющимися) и текущий размер кэша.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "evictions": self.evictions,
+                "coalesced": self.flights.shared,
+                "size": len(self._entries),
+            }
+
+
+class CachedWeatherAPI:
+    """
+    Кэширующий слой перед WeatherAPI.
+
+    Повторяет интерфейс WeatherAPI, но отдаёт данные из TTLCache.
+    OpenWeatherMap обновляет текущую погоду примерно раз в 10 минут,
+    а прогноз — раз в 3 часа, поэтому TTL задаются раздельно.
+
+    Attributes:
+        api (WeatherAPI): Оборачиваемый клиент API.
+        cache (TTLCache): Кэш ответов.
+        weather_ttl (float): TTL текущей погоды в секундах.
+        forecast_ttl (float): TTL прогноза погоды в секундах.
+    """
+
+    def __init__(
+        self,
+        api: WeatherAPI,
+        weather_ttl: float = 600.0,
+        forecast_ttl: float = 1800.0,
+        cache: Optional[TTLCache] = None,
+        pool: Optional[TaskPool] = None,
+    ):
+        """
+        Инициализирует кэширующий слой.
+
+        Args:
+            api (WeatherAPI): Клиент API OpenWeatherMap.
+            weather_ttl (float): TTL текущей погоды в секундах.
+            forecast_ttl (float): TTL прогноза погоды в секундах.
+            cache (Optional[TTLCache]): Кэш. По умолчанию создаётся новый.
+            pool (Optional[TaskPool]):
+                Пул для фоновых обновлений нового кэша.
+        """
+        self.api: WeatherAPI = api
+        self.weather_ttl: float = weather_ttl
+        self.forecast_ttl: float = forecast_ttl
+        self.cache: TTLCache = cache or TTLCache(pool=pool)
+
+    def fetch_weather_by_city_id(self, city_id: int) -> CurrentWeather:
+        """
+        Возвращает текущую погоду для города с учётом кэша.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            CurrentWeather:
+                Данные о погоде (см. WeatherAPI.fetch_weather_by_city_id).
+
+        Exception:
+            RuntimeError: Если данных нет в кэше и запрос к API не удался.
+        """
+        return self.cache.get(
+            ("weather", int(city_id)),
+            lambda: self.api.fetch_weather_by_city_id(city_id),
+            self.weather_ttl,
+        )
+
+    def fetch_forecast_by_city_id(self, city_id: int) -> List[ForecastDay]:
+        """
+        Возвращает прогноз погоды для города с учётом кэша.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            List[ForecastDay]:
+                Прогноз (см. WeatherAPI.fetch_forecast_by_city_id).
+
+        Exception:
+            RuntimeError: Если данных нет в кэше и запрос к API не удался.
+        """
+        return self.cache.get(
+            ("forecast", int(city_id)),
+            lambda: self.api.fetch_forecast_by_city_id(city_id),
+            self.forecast_ttl,
+        )
+
+    def fetch_weather_and_forecast(
+        self,
+        city_id: int
+    ) -> Tuple[CurrentWeather, List[ForecastDay]]:
+        """
+        Возвращает текущую погоду и прогноз с учётом кэша.
+
+        Если в кэше нет ни того, ни другого, оба запроса выполняются
+        параллельно через WeatherAPI.fetch_weather_and_forecast.
+        Запрос, который уже выполняется для этого города другим
+        потоком (например, после повторного клика по карточке),
+        не повторяется: вызывающий дожидается его результата.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Tuple[CurrentWeather, List[ForecastDay]]:
+                Текущая погода и прогноз.
+
+        Exception:
+            RuntimeError: Если данных нет в кэше и запрос к API не удался.
+        """
+        weather_key = ("weather", int(city_id))
+        forecast_key = ("forecast", int(city_id))
+
+        if (
+            self.cache.has(weather_key, self.weather_ttl)
+            or self.cache.has(forecast_key, self.forecast_ttl)
+        ):
+            return (
+                self.fetch_weather_by_city_id(city_id),
+                self.fetch_forecast_by_city_id(city_id),
+            )
+
+        self.cache.record_miss(2)
+        loaders = {
+            weather_key: (
+                lambda: self.api.fetch_weather_by_city_id(city_id),
+                self.weather_ttl,
+            ),
+            forecast_key: (
+                lambda: self.api.fetch_forecast_by_city_id(city_id),
+                self.forecast_ttl,
+            ),
+        }
+        flights = self.cache.flights
+        joined = {key: flights.join(key) for key in loaders}
+        leading = [key for key, (_, leader) in joined.items() if leader]
+
+        if len(leading) == len(loaders):
+            try:
+                weather, forecast = self.api.fetch_weather_and_forecast(
+                    city_id
+                )
+            except BaseException as e:
+                for key, (future, _) in joined.items():
+                    flights.settle(key, future, error=e)
+                raise
+            for key, value in ((weather_key, weather),
+                               (forecast_key, forecast)):
+                self.cache.put(key, value)
+                flights.settle(key, joined[key][0], value)
+            return weather, forecast
+
+        # Часть данных уже загружается другим потоком: загружаем
+        # недостающее сами и дожидаемся остального
+        for key in leading:
+            loader, ttl = loaders[key]
+            flights.run(
+                key,
+                joined[key][0],
+                lambda: self.cache.load(key, loader, ttl),
+            )
+        return (
+            joined[weather_key][0].result(),
+            joined[forecast_key][0].result(),
+        )
+
+    def fetch_weather_by_city_ids(
+        self,
+        city_ids: Iterable[int]
+    ) -> Dict[int, CurrentWeather]:
+        """
+        Возвращает текущую погоду для нескольких городов с учётом кэша.
+
+        Города, которых нет в кэше, запрашиваются пакетно через
+        WeatherAPI.fetch_weather_by_city_ids.
+
+        Args:
+            city_ids (Iterable[int]): ID городов.
+
+        Return:
+            Dict[int, CurrentWeather]: Данные о погоде по ID города.
+
+        Exception:
+            RuntimeError: Если запрос к API не удался целиком.
+        """
+        weather: Dict[int, CurrentWeather] = {}
+        missing: List[int] = []
+        for city_id in dict.fromkeys(int(city_id) for city_id in city_ids):
+            if self.cache.has(("weather", city_id), self.weather_ttl):
+                weather[city_id] = self.fetch_weather_by_city_id(city_id)
+            else:
+                missing.append(city_id)
+
+        if missing:
+            self.cache.record_miss(len(missing))
+            fetched = self.api.fetch_weather_by_city_ids(missing)
+            for city_id, data in fetched.items():
+                self.cache.put(("weather", city_id), data)
+            weather.update(fetched)
+        return weather
+
+    def is_fresh(self, kind: str, city_id: int) -> bool:
+        """
+        Проверяет, что данные города в кэше не старше своего TTL.
+
+        Args:
+            kind (str): "weather" или "forecast".
+            city_id (int): ID города.
+
+        Return:
+            bool: True, если данные есть и свежие.
+        """
+        ttl = self.weather_ttl if kind == "weather" else self.forecast_ttl
+        age = self.cache.age((kind, int(city_id)))
+        return age is not None and age < ttl
+
+    def cached_weather(self, city_id: int) -> Optional[CurrentWeather]:
+        """
+        Возвращает текущую погоду города из кэша без запроса к API.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Optional[CurrentWeather]:
+                Данные о погоде или None, если их нет в кэше.
+        """
+        return self.cache.peek(("weather", int(city_id)))
+
+    def cached_forecast(self, city_id: int) -> Optional[List[ForecastDay]]:
+        """
+        Возвращает прогноз погоды города из кэша без запроса к API.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Optional[List[ForecastDay]]:
+                Прогноз или None, если его нет в кэше.
+        """
+        return self.cache.peek(("forecast", int(city_id)))
+
+    def last_known(
+        self,
+        city_id: int,
+        database: Database
+    ) -> Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+        """
+        Возвращает последние известные данные города без запроса к API,
+        даже если они устарели.
+
+        Данные берутся из кэша, а при их отсутствии (например, сразу
+        после запуска) — из сохранённых WeatherHistory.
+
+        Args:
+            city_id (int): ID города.
+            database (Database):
+                Подключение к базе данных вызывающего потока.
+
+        Return:
+            Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+                Текущая погода и прогноз; None, если данных нет.
+        """
+        weather = self.cache.peek(("weather", int(city_id)))
+        forecast = self.cache.peek(("forecast", int(city_id)))
+        if (weather is None or forecast is None) and self.api.history:
+            stored_weather, stored_forecast = self.api.history.last_known(
+                city_id, database
+            )
+            weather = weather or stored_weather
+            forecast = forecast or stored_forecast
+        return weather, forecast
+
+    def refresh_weather_by_city_ids(
+        self,
+        city_ids: Iterable[int]
+    ) -> Dict[int, CurrentWeather]:
+        """
+        Принудительно обновляет текущую погоду городов в кэше
+        одним пакетным запросом.
+
+        Args:
+            city_ids (Iterable[int]): ID городов.
+
+        Return:
+            Dict[int, CurrentWeather]: Полученные данные о погоде по ID города.
+
+        Exception:
+            RuntimeError: Если запрос к API не удался целиком.
+        """
+        weather = self.api.fetch_weather_by_city_ids(city_ids)
+        for city_id, data in weather.items():
+            self.cache.put(("weather", city_id), data)
+        return weather
+
+    def refresh_forecast_by_city_id(
+        self,
+        city_id: int
+    ) -> List[ForecastDay]:
+        """
+        Принудительно обновляет прогноз погоды города в кэше.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            List[ForecastDay]: Полученный прогноз.
+
+        Exception:
+            RuntimeError: Если запрос к API не удался.
+        """
+        forecast = self.api.fetch_forecast_by_city_id(city_id)
+        self.cache.put(("forecast", int(city_id)), forecast)
+        return forecast
+
+    def invalidate(self, city_id: int) -> None:
+        """
+        Сбрасывает закэшированные данные города.
+
+        Args:
+            city_id (int): ID города.
+        """
+        self.cache.invalidate(("weather", int(city_id)))
+        self.cache.invalidate(("forecast", int(city_id)))
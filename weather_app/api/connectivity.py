@@ -0,0 +1,141 @@
+import threading
+from typing import Callable, List, Optional
+
+
+class ConnectivityMonitor:
+    """
+    Отслеживает доступность сети по результатам запросов.
+
+    Сетевая ошибка (нет соединения, таймаут) переводит монитор
+    в режим «нет связи»: запросы через HttpTransport сразу завершаются
+    ошибкой, не дожидаясь таймаутов, а фоновый поток периодически
+    проверяет связь пробным запросом с растущим интервалом. Любой
+    ответ сервера, включая ошибку HTTP, означает, что связь есть.
+
+    Слушатели вызываются при каждой смене состояния в потоке,
+    который её обнаружил.
+
+    Attributes:
+        min_interval (float):
+            Задержка первой проверки после потери связи, в секундах.
+        max_interval (float):
+            Наибольший интервал между проверками, в секундах.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], None],
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+    ):
+        """
+        Инициализирует монитор в состоянии «связь есть».
+
+        Args:
+            probe (Callable[[], None]):
+                Пробный запрос; должен бросать исключение,
+                если сервер недоступен.
+            min_interval (float):
+                Задержка первой проверки после потери связи.
+            max_interval (float):
+                Наибольший интервал между проверками.
+        """
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self._probe = probe
+        self._online: bool = True
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def online(self) -> bool:
+        """
+        bool: True, если последний запрос или проверка дошли до сервера.
+        """
+        return self._online
+
+    def add_listener(self, listener: Callable[[bool], None]) -> None:
+        """
+        Подписывает на смену состояния связи.
+
+        Args:
+            listener (Callable[[bool], None]):
+                Получает новое состояние: True — связь восстановлена,
+                False — потеряна.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def report_success(self) -> None:
+        """
+        Отмечает, что сервер ответил.
+        """
+        self._set_online(True)
+
+    def report_failure(self) -> None:
+        """
+        Отмечает сетевую ошибку и запускает проверку связи.
+        """
+        self._set_online(False)
+
+    def check_now(self) -> None:
+        """
+        Проверяет связь без ожидания очередного интервала.
+        """
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """
+        Останавливает поток проверки связи.
+        """
+        with self._lock:
+            self._stopped = True
+        self._wakeup.set()
+
+    def _set_online(self, online: bool) -> None:
+        """
+        Меняет состояние и оповещает слушателей, если оно изменилось.
+        """
+        with self._lock:
+            if self._online == online:
+                return
+            self._online = online
+            listeners = list(self._listeners)
+            if not online and not self._stopped and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="connectivity-probe",
+                    daemon=True,
+                )
+                self._thread.start()
+
+        for listener in listeners:
+            try:
+                listener(online)
+            except Exception as e:
+                print(f"Ошибка обработчика состояния сети: {e}")
+
+    def _run(self) -> None:
+        """
+        Проверяет связь, пока она не восстановится.
+        """
+        interval = self.min_interval
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            with self._lock:
+                if self._stopped or self._online:
+                    self._thread = None
+                    return
+            try:
+                self._probe()
+            except Exception:
+                interval = min(interval * 2, self.max_interval)
+                continue
+            # Поток завершается на следующем шаге, если связь
+            # не пропала снова за это время
+            self._set_online(True)
+            interval = self.min_interval
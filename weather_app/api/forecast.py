@@ -0,0 +1,123 @@
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from weather_app.api.models import ForecastDay
+from typing import Any, Dict, List, Optional, Tuple
+
+SECONDS_PER_DAY = 86400
+
+# Местное время, запись которого считается представительной для дня
+_MIDDAY = 12 * 3600
+
+
+class _DayBucket:
+    """
+    Накопитель статистики за один местный день.
+    """
+
+    __slots__ = (
+        'temp_min', 'temp_max', 'temp_sum', 'wind_sum', 'precipitation',
+        'count', 'conditions', 'representative',
+    )
+
+    def __init__(self) -> None:
+        self.temp_min: float = float('inf')
+        self.temp_max: float = float('-inf')
+        self.temp_sum: float = 0.0
+        self.wind_sum: float = 0.0
+        self.precipitation: float = 0.0
+        self.count: int = 0
+        self.conditions: Counter = Counter()
+        # Условие -> (удалённость от полудня, описание, иконка)
+        self.representative: Dict[Any, Tuple[int, str, str]] = {}
+
+
+def aggregate_forecast(
+    data: Dict[str, Any],
+    days: int = 3,
+    now: Optional[float] = None
+) -> List[ForecastDay]:
+    """
+    Сводит трёхчасовой прогноз по местным дням за один проход.
+
+    Записи раскладываются по дням по целому dt со сдвигом на часовой
+    пояс города (data['city']['timezone']), а не по строке dt_txt в UTC.
+    Сегодняшний день пропускается, возвращаются следующие days дней,
+    для которых в прогнозе есть записи.
+
+    Для каждого дня вычисляются минимум и максимум температуры,
+    средняя температура, средняя скорость ветра, сумма осадков
+    (дождь и снег) и преобладающее состояние погоды. Описание и иконка
+    берутся у записи преобладающего состояния, ближайшей к полудню.
+
+    Args:
+        data (dict): JSON-ответ API прогноза погоды.
+        days (int): Количество дней прогноза.
+        now (Optional[float]):
+            Текущее время в секундах Unix. По умолчанию time.time().
+
+    Return:
+        List[ForecastDay]: Прогноз по дням.
+
+    Exception:
+        KeyError, IndexError: Если в записях нет обязательных полей.
+    """
+    offset = int(data.get("city", {}).get("timezone") or 0)
+    today = (int(time.time() if now is None else now) + offset) \
+        // SECONDS_PER_DAY
+    buckets: List[Optional[_DayBucket]] = [None] * days
+
+    for entry in data["list"]:
+        local = entry["dt"] + offset
+        index = local // SECONDS_PER_DAY - today - 1
+        if not 0 <= index < days:
+            continue
+
+        bucket = buckets[index]
+        if bucket is None:
+            bucket = buckets[index] = _DayBucket()
+
+        main = entry["main"]
+        bucket.temp_min = min(bucket.temp_min, main["temp_min"])
+        bucket.temp_max = max(bucket.temp_max, main["temp_max"])
+        bucket.temp_sum += main["temp"]
+        bucket.wind_sum += entry.get("wind", {}).get("speed", 0.0)
+        bucket.precipitation += (
+            entry.get("rain", {}).get("3h", 0.0)
+            + entry.get("snow", {}).get("3h", 0.0)
+        )
+        bucket.count += 1
+
+        weather = entry["weather"][0]
+        condition = weather.get("id", weather["description"])
+        bucket.conditions[condition] += 1
+        distance = abs(local % SECONDS_PER_DAY - _MIDDAY)
+        best = bucket.representative.get(condition)
+        if best is None or distance < best[0]:
+            bucket.representative[condition] = (
+                distance, weather["description"], weather["icon"]
+            )
+
+    forecast: List[ForecastDay] = []
+    for index, bucket in enumerate(buckets):
+        if bucket is None:
+            continue
+
+        # При равенстве побеждает состояние, встреченное первым
+        condition = bucket.conditions.most_common(1)[0][0]
+        _, description, icon = bucket.representative[condition]
+        day_start = (today + index + 1) * SECONDS_PER_DAY
+        forecast.append(ForecastDay(
+            date=datetime.fromtimestamp(
+                day_start, tz=timezone.utc
+            ).strftime("%Y-%m-%d"),
+            dt=day_start - offset,
+            temp_min=bucket.temp_min,
+            temp_max=bucket.temp_max,
+            temp_mean=round(bucket.temp_sum / bucket.count, 2),
+            wind_speed=round(bucket.wind_sum / bucket.count, 2),
+            precipitation=round(bucket.precipitation, 2),
+            description=description,
+            icon=icon,
+        ))
+    return forecast
@@ -0,0 +1,200 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from weather_app.api.transport import HttpTransport
+from typing import Dict, Optional
+
+
+class IconCache:
+    """
+    Кэш иконок погоды OpenWeatherMap с ключом по коду иконки.
+
+    Иконки ищутся по цепочке: LRU в памяти, каталог на диске,
+    встроенный набор иконок и только затем сеть. Скачанная иконка
+    сохраняется на диск, поэтому после прогрева обновление погоды
+    не делает ни одного запроса за иконками.
+
+    Кэш хранит PNG-данные и не зависит от Qt; декодированные
+    изображения для интерфейса кэширует weather_app.ui.weather_icons.
+
+    Attributes:
+        transport (HttpTransport):
+            HTTP-транспорт для загрузки отсутствующих иконок.
+        cache_dir (str):
+            Каталог, в котором хранятся скачанные иконки.
+        bundle_dir (str):
+            Каталог с заранее подготовленными иконками (может отсутствовать).
+        max_icons (int):
+            Максимальное число иконок в памяти.
+    """
+
+    icon_url: str = "https://openweathermap.org/img/wn/{code}@2x.png"
+
+    # Коды иконок OpenWeatherMap имеют вид "01d", "10n" и т.п.
+    _code_pattern = re.compile(r"^\d{2}[dn]$")
+
+    def __init__(
+        self,
+        transport: HttpTransport,
+        cache_dir: str = 'weather_app/db/icons',
+        bundle_dir: str = 'weather_app/ui/icons/weather',
+        max_icons: int = 32,
+    ):
+        """
+        Инициализирует кэш иконок.
+
+        Args:
+            transport (HttpTransport):
+                HTTP-транспорт для загрузки иконок.
+            cache_dir (str):
+                Каталог для сохранения скачанных иконок.
+            bundle_dir (str):
+                Каталог со встроенными иконками.
+            max_icons (int):
+                Размер LRU иконок в памяти.
+        """
+        self.transport: HttpTransport = transport
+        self.cache_dir: str = cache_dir
+        self.bundle_dir: str = bundle_dir
+        self.max_icons: int = max_icons
+        self._icons: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._code_locks: Dict[str, threading.Lock] = {}
+
+    def _file_name(self, code: str) -> str:
+        """
+        Возвращает имя файла иконки, проверяя код.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+
+        Return:
+            str: Имя файла иконки.
+
+        Exception:
+            ValueError: Если код иконки некорректен.
+        """
+        if not self._code_pattern.match(code or ""):
+            raise ValueError(f"Некорректный код иконки: {code!r}")
+        return f"{code}@2x.png"
+
+    def _read_local(self, file_name: str) -> Optional[bytes]:
+        """
+        Читает иконку из дискового кэша или встроенного набора.
+
+        Args:
+            file_name (str): Имя файла иконки.
+
+        Return:
+            Optional[bytes]: Содержимое файла или None, если его нет.
+        """
+        for directory in (self.cache_dir, self.bundle_dir):
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, 'rb') as file:
+                    return file.read()
+            except OSError:
+                continue
+        return None
+
+    def _write_local(self, file_name: str, data: bytes) -> None:
+        """
+        Атомарно сохраняет иконку в дисковый кэш.
+
+        Ошибки записи игнорируются: кэш лишь ускоряет работу.
+
+        Args:
+            file_name (str): Имя файла иконки.
+            data (bytes): Содержимое иконки.
+        """
+        path = os.path.join(self.cache_dir, file_name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _remember(self, code: str, data: bytes) -> None:
+        """
+        Кладёт иконку в LRU в памяти.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+            data (bytes): Содержимое PNG-файла.
+        """
+        with self._lock:
+            self._icons[code] = data
+            self._icons.move_to_end(code)
+            while len(self._icons) > self.max_icons:
+                self._icons.popitem(last=False)
+
+    def get_cached(self, code: str) -> Optional[bytes]:
+        """
+        Возвращает PNG-данные иконки из памяти, дискового кэша или
+        встроенного набора, никогда не обращаясь к сети.
+
+        Подходит для потока интерфейса: отсутствующую иконку
+        загружает get_bytes в рабочем потоке.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+
+        Return:
+            Optional[bytes]: Содержимое PNG-файла или None,
+            если иконки нет локально.
+
+        Exception:
+            ValueError: Если код иконки некорректен.
+        """
+        with self._lock:
+            data = self._icons.get(code)
+            if data is not None:
+                self._icons.move_to_end(code)
+                return data
+            file_name = self._file_name(code)
+
+        data = self._read_local(file_name)
+        if data is not None:
+            self._remember(code, data)
+        return data
+
+    def get_bytes(self, code: str) -> bytes:
+        """
+        Возвращает PNG-данные иконки, скачивая её только при отсутствии
+        в памяти и на диске.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+
+        Return:
+            bytes: Содержимое PNG-файла.
+
+        Exception:
+            ValueError: Если код иконки некорректен.
+            requests.RequestException: Если загрузка иконки не удалась.
+        """
+        with self._lock:
+            data = self._icons.get(code)
+            if data is not None:
+                self._icons.move_to_end(code)
+                return data
+            file_name = self._file_name(code)
+            code_lock = self._code_locks.setdefault(code, threading.Lock())
+
+        # Одновременные запросы одной иконки скачивают её один раз
+        with code_lock:
+            data = self._read_local(file_name)
+            if data is None:
+                response = self.transport.get(self.icon_url.format(code=code))
+                data = response.content
+                self._write_local(file_name, data)
+
+        self._remember(code, data)
+        return data
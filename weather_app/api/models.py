@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+def _utc_time(timestamp: int) -> str:
+    """
+    Форматирует время Unix как ЧЧ:ММ:СС по UTC.
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(
+        '%H:%M:%S'
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentWeather:
+    """
+    Текущая погода в городе.
+
+    Запись неизменяемая и не содержит объектов интерфейса: иконка
+    хранится кодом OpenWeatherMap, а картинка получается при отрисовке.
+    Поэтому записи можно кэшировать, сериализовать и сравнивать.
+
+    Attributes:
+        city_id (Optional[int]): ID города.
+        city (str): Название города.
+        country (str): Код страны.
+        temperature (Optional[float]): Температура, °C.
+        feels_like (Optional[float]): Ощущаемая температура, °C.
+        temp_min (Optional[float]): Минимальная температура, °C.
+        temp_max (Optional[float]): Максимальная температура, °C.
+        pressure (Optional[int]): Давление, гПа.
+        humidity (Optional[int]): Влажность, %.
+        visibility (Optional[int]): Видимость, м.
+        wind_speed (Optional[float]): Скорость ветра, м/с.
+        wind_deg (Optional[int]): Направление ветра в градусах.
+        wind_gust (Optional[float]): Порывы ветра, м/с.
+        description (str): Описание погоды.
+        icon (str): Код иконки погоды, например '01d'.
+        clouds (Optional[int]): Облачность, %.
+        sunrise (str): Время восхода по UTC.
+        sunset (str): Время заката по UTC.
+        timezone (Optional[int]): Сдвиг часового пояса в секундах.
+        dt (Optional[int]): Время наблюдения, время Unix.
+    """
+
+    city_id: Optional[int]
+    city: str
+    country: str
+    temperature: Optional[float]
+    feels_like: Optional[float]
+    temp_min: Optional[float]
+    temp_max: Optional[float]
+    pressure: Optional[int]
+    humidity: Optional[int]
+    visibility: Optional[int]
+    wind_speed: Optional[float]
+    wind_deg: Optional[int]
+    wind_gust: Optional[float]
+    description: str
+    icon: str
+    clouds: Optional[int]
+    sunrise: str
+    sunset: str
+    timezone: Optional[int]
+    dt: Optional[int]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> 'CurrentWeather':
+        """
+        Создаёт запись из ответа метода weather (или элемента
+        ответа метода group, в котором смещение часового пояса
+        лежит в sys).
+
+        Args:
+            data (dict): JSON-объект текущей погоды.
+
+        Return:
+            CurrentWeather: Текущая погода.
+
+        Exception:
+            KeyError, IndexError: Если в ответе нет обязательных полей.
+        """
+        main = data["main"]
+        wind = data["wind"]
+        sys = data["sys"]
+        weather = data["weather"][0]
+        return cls(
+            city_id=data.get("id"),
+            city=data.get("name", "Неизвестный город"),
+            country=sys.get("country", "Неизвестная страна"),
+            temperature=main.get("temp"),
+            feels_like=main.get("feels_like"),
+            temp_min=main.get("temp_min"),
+            temp_max=main.get("temp_max"),
+            pressure=main.get("pressure"),
+            humidity=main.get("humidity"),
+            visibility=data.get("visibility"),
+            wind_speed=wind.get("speed"),
+            wind_deg=wind.get("deg"),
+            wind_gust=wind.get("gust"),
+            description=weather.get("description", "Описание не найдено"),
+            icon=weather.get("icon", ""),
+            clouds=data["clouds"].get("all"),
+            sunrise=_utc_time(sys["sunrise"]),
+            sunset=_utc_time(sys["sunset"]),
+            timezone=data.get("timezone", sys.get("timezone")),
+            dt=data.get("dt"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastDay:
+    """
+    Прогноз погоды на один местный день.
+
+    Attributes:
+        date (str): Местная дата в формате ГГГГ-ММ-ДД.
+        dt (int): Начало местного дня, время Unix.
+        temp_min (float): Минимальная температура, °C.
+        temp_max (float): Максимальная температура, °C.
+        temp_mean (float): Средняя температура, °C.
+        wind_speed (float): Средняя скорость ветра, м/с.
+        precipitation (float): Сумма осадков (дождь и снег), мм.
+        description (str): Описание преобладающей погоды.
+        icon (str): Код иконки преобладающей погоды.
+    """
+
+    date: str
+    dt: int
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    wind_speed: float
+    precipitation: float
+    description: str
+    icon: str
@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов по алгоритму «корзина токенов».
+
+    Корзина пополняется со скоростью rate токенов в секунду
+    и вмещает не более burst токенов. Каждый запрос забирает токен,
+    а при пустой корзине ждёт его появления.
+
+    Attributes:
+        rate (float): Скорость пополнения, токенов в секунду.
+        burst (int): Вместимость корзины.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Инициализирует ограничитель с полной корзиной.
+
+        Args:
+            rate (float): Допустимое число запросов в секунду.
+            burst (int): Сколько запросов можно сделать подряд без ожидания.
+            clock (Callable[[], float]): Источник времени.
+            sleep (Callable[[float], None]): Функция ожидания.
+        """
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть положительной")
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens: float = float(self.burst)
+        self._updated_at: float = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """
+        Пополняет корзину за время, прошедшее с прошлого обновления.
+        """
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def available(self) -> float:
+        """
+        Возвращает число токенов в корзине, не забирая их.
+
+        Return:
+            float: Текущее число токенов; отрицательное, если токены
+            уже зарезервированы ожидающими запросами.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+    def try_acquire(self) -> bool:
+        """
+        Забирает токен без ожидания.
+
+        Return:
+            bool: True, если токен получен.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Забирает токен, при необходимости дожидаясь его.
+
+        Токен резервируется сразу, поэтому потоки, ждущие одновременно,
+        получают разные моменты времени.
+
+        Return:
+            float: Время ожидания в секундах.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,340 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError
+from weather_app.api.cache import CachedWeatherAPI
+from weather_app.api.models import CurrentWeather
+from weather_app.api.rate_limit import RateLimiter
+from weather_app.api.tasks import BACKGROUND, CancellationToken, TaskPool
+from weather_app.api.weather_api import WeatherAPI
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Виды задач обновления
+WEATHER = "weather"
+FORECAST = "forecast"
+
+
+class RefreshScheduler:
+    """
+    Планировщик фонового обновления погоды в избранных городах.
+
+    Раз в interval секунд ставит в очередь обновление всех избранных
+    городов: текущая погода запрашивается пакетами по GROUP_SIZE,
+    прогноз — по одному городу, если он устарел в кэше. Запросы
+    учитываются общим ограничителем WeatherAPI: фоновый запрос
+    начинается, только когда в корзине остаётся больше reserve токенов,
+    поэтому запросы пользователя не ждут фоновых. Недавно открытые
+    города обновляются первыми, в том числе уже стоящие в очереди.
+
+    Результаты складываются в кэш CachedWeatherAPI, поэтому открытие
+    избранного города не ждёт сети, и передаются в on_weather.
+
+    Если задан pool, поток планировщика лишь выбирает задачи, а запросы
+    выполняются в пуле с приоритетом BACKGROUND по одному: действия
+    пользователя в том же пуле их опережают.
+
+    Attributes:
+        api (CachedWeatherAPI): Кэширующий клиент API.
+        interval (float): Период обновления в секундах.
+        reserve (int):
+            Сколько токенов ограничителя оставлять для запросов
+            пользователя.
+        pool (Optional[TaskPool]): Пул, в котором выполняются запросы.
+    """
+
+    # Пакет не больше, чем принимает метод group
+    GROUP_SIZE = WeatherAPI.GROUP_SIZE
+
+    def __init__(
+        self,
+        api: CachedWeatherAPI,
+        favorites: Callable[[], List[int]],
+        on_weather: Callable[[int, CurrentWeather], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        interval: float = 600.0,
+        reserve: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+        pool: Optional[TaskPool] = None,
+    ):
+        """
+        Инициализирует планировщик. Поток запускается методом start.
+
+        Args:
+            api (CachedWeatherAPI): Кэширующий клиент API.
+            favorites (Callable[[], List[int]]):
+                Возвращает ID избранных городов. Вызывается в потоке
+                планировщика.
+            on_weather (Callable[[int, CurrentWeather], None]):
+                Получает обновлённую текущую погоду города.
+                Вызывается в потоке планировщика.
+            on_error (Optional[Callable[[Exception], None]]):
+                Получает ошибки обновления.
+            interval (float): Период обновления в секундах.
+            reserve (int):
+                Сколько токенов ограничителя WeatherAPI оставлять для
+                запросов пользователя. По умолчанию 5 (половина
+                корзины по умолчанию).
+            clock (Callable[[], float]): Источник времени.
+            pool (Optional[TaskPool]):
+                Пул для запросов. По умолчанию запросы выполняются
+                в потоке планировщика.
+        """
+        self.api: CachedWeatherAPI = api
+        self.pool: Optional[TaskPool] = pool
+        self.interval: float = interval
+        self.reserve: int = reserve
+        self._favorites = favorites
+        self._on_weather = on_weather
+        self._on_error = on_error
+        self._clock = clock
+
+        # Задачи: (приоритет, порядковый номер, вид, ID города, срок)
+        self._queue: List[Tuple[float, int, str, int, float]] = []
+        self._queued: set = set()
+        self._sequence = itertools.count()
+        self._last_viewed: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._token = CancellationToken()
+        self._thread: Optional[threading.Thread] = None
+
+        self._next_cycle: float = clock()
+        self._cycle_started: Optional[float] = None
+        self._cycle_duration: Optional[float] = None
+        self._refreshed: int = 0
+        self._errors: int = 0
+
+    def start(self) -> None:
+        """
+        Запускает поток планировщика.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name="refresh-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Останавливает поток планировщика и отменяет ещё не начатый
+        запрос в пуле.
+        """
+        self._stopped.set()
+        self._token.cancel()
+        self._wakeup.set()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        Возвращает общий ограничитель частоты запросов WeatherAPI.
+        """
+        return self.api.api.rate_limiter
+
+    def mark_viewed(self, city_id: int) -> None:
+        """
+        Отмечает, что пользователь открыл город; такие города
+        обновляются раньше остальных. Задачи города, уже стоящие
+        в очереди, получают новый приоритет.
+
+        Args:
+            city_id (int): ID города.
+        """
+        city_id = int(city_id)
+        with self._lock:
+            self._last_viewed[city_id] = self._clock()
+            if not any(
+                (kind, city_id) in self._queued for kind in (WEATHER, FORECAST)
+            ):
+                return
+            priority = self._priority(city_id)
+            self._queue = [
+                (priority, *task[1:]) if task[3] == city_id else task
+                for task in self._queue
+            ]
+            heapq.heapify(self._queue)
+
+    def refresh_now(self, city_ids: Optional[List[int]] = None) -> None:
+        """
+        Ставит обновление в очередь вне расписания.
+
+        Args:
+            city_ids (Optional[List[int]]):
+                ID городов. По умолчанию — новый цикл по всем избранным.
+        """
+        if city_ids is None:
+            with self._lock:
+                self._next_cycle = self._clock()
+        else:
+            self._enqueue(city_ids)
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние очереди планировщика.
+
+        Return:
+            Dict[str, Any]:
+                queue_depth — задач в очереди;
+                lag — на сколько секунд самая старая задача
+                просрочена относительно момента постановки;
+                next_cycle_in — секунд до следующего цикла;
+                last_cycle_duration — длительность последнего цикла;
+                refreshed и errors — счётчики обновлений и ошибок.
+        """
+        now = self._clock()
+        with self._lock:
+            oldest = min((task[4] for task in self._queue), default=None)
+            return {
+                "queue_depth": len(self._queue),
+                "lag": 0.0 if oldest is None else max(0.0, now - oldest),
+                "next_cycle_in": max(0.0, self._next_cycle - now),
+                "last_cycle_duration": self._cycle_duration,
+                "refreshed": self._refreshed,
+                "errors": self._errors,
+            }
+
+    def _priority(self, city_id: int) -> float:
+        """
+        Возвращает приоритет города: чем недавнее просмотр, тем меньше.
+        """
+        return -self._last_viewed.get(city_id, 0.0)
+
+    def _enqueue(self, city_ids: List[int]) -> None:
+        """
+        Ставит задачи обновления погоды и прогноза для городов.
+        """
+        now = self._clock()
+        with self._lock:
+            for city_id in map(int, city_ids):
+                for kind in (WEATHER, FORECAST):
+                    if (kind, city_id) in self._queued:
+                        continue
+                    self._queued.add((kind, city_id))
+                    heapq.heappush(self._queue, (
+                        self._priority(city_id),
+                        next(self._sequence),
+                        kind,
+                        city_id,
+                        now,
+                    ))
+
+    def _take_batch(self) -> Tuple[str, List[int]]:
+        """
+        Забирает из очереди следующую задачу; задачи текущей погоды
+        объединяются в пакет до GROUP_SIZE городов.
+        """
+        with self._lock:
+            _, _, kind, city_id, _ = heapq.heappop(self._queue)
+            self._queued.discard((kind, city_id))
+            batch = [city_id]
+            if kind == WEATHER:
+                rest = []
+                while self._queue and len(batch) < self.GROUP_SIZE:
+                    task = heapq.heappop(self._queue)
+                    if task[2] == WEATHER:
+                        self._queued.discard((WEATHER, task[3]))
+                        batch.append(task[3])
+                    else:
+                        rest.append(task)
+                for task in rest:
+                    heapq.heappush(self._queue, task)
+            return kind, batch
+
+    def _wait_token(self) -> bool:
+        """
+        Ждёт, пока в общем ограничителе останется больше reserve
+        токенов, прерываясь при остановке. Сам токен забирает запрос
+        WeatherAPI.
+
+        Return:
+            bool: False, если планировщик остановлен.
+        """
+        limiter = self.rate_limiter
+        reserve = min(self.reserve, limiter.burst - 1)
+        while limiter.available() < reserve + 1:
+            if self._stopped.wait(1.0 / limiter.rate):
+                return False
+        return not self._stopped.is_set()
+
+    def _report_error(self, error: Exception) -> None:
+        """
+        Учитывает ошибку обновления и передаёт её в on_error.
+        """
+        with self._lock:
+            self._errors += 1
+        if self._on_error:
+            self._on_error(error)
+
+    def _run(self) -> None:
+        """
+        Цикл потока планировщика.
+        """
+        while not self._stopped.is_set():
+            now = self._clock()
+
+            if now >= self._next_cycle:
+                try:
+                    city_ids = self._favorites()
+                except Exception as e:
+                    city_ids = []
+                    self._report_error(e)
+                with self._lock:
+                    self._next_cycle = now + self.interval
+                    self._cycle_started = now
+                self._enqueue(city_ids)
+
+            with self._lock:
+                has_tasks = bool(self._queue)
+                if not has_tasks and self._cycle_started is not None:
+                    self._cycle_duration = now - self._cycle_started
+                    self._cycle_started = None
+                timeout = max(0.0, self._next_cycle - now)
+
+            if not has_tasks:
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+                continue
+
+            if not self._wait_token():
+                break
+            kind, batch = self._take_batch()
+
+            try:
+                if self.pool is None:
+                    self._refresh(kind, batch)
+                else:
+                    self.pool.submit(
+                        self._refresh,
+                        kind,
+                        batch,
+                        priority=BACKGROUND,
+                        token=self._token,
+                    ).result()
+                with self._lock:
+                    self._refreshed += len(batch)
+            except CancelledError:
+                break
+            except Exception as e:
+                if self.pool is not None and self.pool.closed:
+                    break
+                self._report_error(e)
+
+    def _refresh(self, kind: str, batch: List[int]) -> None:
+        """
+        Обновляет текущую погоду пакета городов или прогноз города.
+
+        Args:
+            kind (str): WEATHER или FORECAST.
+            batch (List[int]): ID городов; для прогноза — один.
+        """
+        if kind == WEATHER:
+            weather = self.api.refresh_weather_by_city_ids(batch)
+            for city_id, data in weather.items():
+                self._on_weather(city_id, data)
+        elif not self.api.is_fresh(FORECAST, batch[0]):
+            self.api.refresh_forecast_by_city_id(batch[0])
@@ -0,0 +1,167 @@
+import os
+from weather_app.api.cache import CachedWeatherAPI
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.api.tasks import TaskPool
+from weather_app.api.transport import HttpTransport
+from weather_app.api.weather_api import WeatherAPI
+from weather_app.db.history import WeatherHistory
+from weather_app.db.service import DatabaseService
+from weather_app.db.settings import Settings
+from typing import List, Optional, Tuple
+
+# Файл базы данных приложения по умолчанию
+DEFAULT_DB_PATH = 'weather_app/db/database.db'
+
+# Переменная окружения с API-ключом; заменяет ключ из настроек
+API_KEY_ENV = 'OPEN_WEATHER_MAP_API_KEY'
+
+
+class WeatherService:
+    """
+    Ядро приложения без интерфейса: получение, разбор, кэширование
+    и сохранение погоды.
+
+    Собирает вместе службу базы данных, настройки, HTTP-транспорт,
+    клиент API с кэшем и запись истории. Не зависит от PyQt, поэтому
+    работает в фоновом опросе, командной строке, на сервере и в
+    бенчмарках без дисплея; интерфейс подключается к тому же ядру
+    (см. HomePage).
+
+    Attributes:
+        database (DatabaseService): Общая служба базы данных.
+        settings (Settings): Настройки приложения.
+        history (Optional[WeatherHistory]): Запись истории погоды.
+        api (CachedWeatherAPI): Клиент API с кэшем ответов.
+        tasks (TaskPool):
+            Ограниченный пул фоновых задач: загрузки по действиям
+            пользователя, фоновые обновления кэша и избранного.
+    """
+
+    # Поля городов в результатах search_cities
+    CITY_FIELDS = ['id', 'ru_name', 'country', 'lat', 'lon', 'favorite']
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        transport: Optional[HttpTransport] = None,
+        record_history: bool = True,
+        weather_ttl: float = 600.0,
+        forecast_ttl: float = 1800.0,
+        prefetch_icons: bool = True,
+        max_tasks: int = 4,
+        api_key: Optional[str] = None,
+    ):
+        """
+        Создаёт ядро приложения поверх файла базы данных.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            transport (Optional[HttpTransport]):
+                HTTP-транспорт. По умолчанию создаётся новый пул
+                соединений.
+            record_history (bool):
+                Сохранять ли полученную погоду в историю.
+            weather_ttl (float): TTL текущей погоды в кэше в секундах.
+            forecast_ttl (float): TTL прогноза в кэше в секундах.
+            prefetch_icons (bool):
+                Загружать ли иконки погоды вместе с данными.
+            max_tasks (int): Наибольшее число потоков пула задач.
+            api_key (Optional[str]):
+                API-ключ вместо ключа из настроек (в базу он не
+                сохраняется). По умолчанию берётся из переменной
+                окружения API_KEY_ENV, если она задана.
+        """
+        self.database: DatabaseService = DatabaseService.shared(db_path)
+        self.settings: Settings = Settings.shared(db_path)
+        self.history: Optional[WeatherHistory] = (
+            WeatherHistory(db_path) if record_history else None
+        )
+        self.tasks: TaskPool = TaskPool(
+            max_workers=max_tasks, name="weather-tasks"
+        )
+        self.api: CachedWeatherAPI = CachedWeatherAPI(
+            WeatherAPI(
+                self.settings,
+                transport=transport,
+                history=self.history,
+                prefetch_icons=prefetch_icons,
+            ),
+            weather_ttl=weather_ttl,
+            forecast_ttl=forecast_ttl,
+            pool=self.tasks,
+        )
+        api_key = api_key or os.environ.get(API_KEY_ENV)
+        if api_key:
+            self.api.api.set_api_key(api_key)
+
+    def search_cities(
+        self,
+        query: str,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        country: Optional[str] = None
+    ) -> List[Tuple]:
+        """
+        Ищет города по русскому названию.
+
+        Args:
+            query (str): Начало или часть названия.
+            limit (Optional[int]): Наибольшее число городов.
+            offset (int): Количество пропускаемых городов.
+            country (Optional[str]): Код страны, например 'RU'.
+
+        Return:
+            List[Tuple]: Строки с полями CITY_FIELDS.
+        """
+        with self.database.reader() as database:
+            return database.get_cities(
+                country=country,
+                ru_name=query or None,
+                fields=self.CITY_FIELDS,
+                limit=limit,
+                offset=offset,
+            )
+
+    def favorite_city_ids(self) -> List[int]:
+        """
+        Возвращает ID избранных городов.
+
+        Return:
+            List[int]: ID городов в порядке названия.
+        """
+        with self.database.reader() as database:
+            return [
+                city_id
+                for city_id, in database.get_favorite_cities(['id'])
+            ]
+
+    def last_known(
+        self,
+        city_id: int
+    ) -> Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+        """
+        Возвращает последние известные данные города без обращения
+        к сети (см. CachedWeatherAPI.last_known).
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+                Текущая погода и прогноз; None, если данных нет.
+        """
+        with self.database.reader() as database:
+            return self.api.last_known(city_id, database)
+
+    def close(self) -> None:
+        """
+        Записывает накопленную историю и закрывает соединения.
+
+        Служба базы данных и настройки общие и закрываются
+        при выходе из процесса.
+        """
+        self.tasks.shutdown()
+        if self.history:
+            self.history.close()
+        self.api.api.executor.shutdown(wait=False)
+        self.api.api.transport.close()
@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых запросов.
+
+    Первый вызывающий по ключу (ведущий) выполняет запрос, остальные,
+    пришедшие до его завершения, ждут и получают тот же результат или
+    то же исключение. После завершения ключ освобождается, и следующий
+    вызов выполняет запрос заново.
+
+    Attributes:
+        calls (int): Количество выполненных запросов.
+        shared (int): Количество вызовов, получивших результат чужого
+            запроса.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует пустой набор выполняющихся запросов.
+        """
+        self._flights: Dict[Hashable, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+        self.calls: int = 0
+        self.shared: int = 0
+
+    def join(self, key: Hashable) -> Tuple["Future[Any]", bool]:
+        """
+        Присоединяется к выполняющемуся запросу или начинает новый.
+
+        Ведущий обязан завершить запрос через run или settle, иначе
+        остальные вызывающие будут ждать вечно.
+
+        Args:
+            key (Hashable): Ключ запроса, например ("weather", city_id).
+
+        Return:
+            Tuple[Future[Any], bool]: Будущий результат запроса и True,
+            если вызывающий стал ведущим.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            self.calls += 1
+            return future, True
+
+    def settle(
+        self,
+        key: Hashable,
+        future: "Future[Any]",
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Завершает запрос ведущего и освобождает ключ.
+
+        Args:
+            key (Hashable): Ключ запроса.
+            future (Future[Any]): Будущий результат, полученный из join.
+            result (Any): Результат запроса.
+            error (Optional[BaseException]): Исключение вместо результата.
+        """
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run(
+        self,
+        key: Hashable,
+        future: "Future[Any]",
+        call: Callable[[], Any]
+    ) -> Any:
+        """
+        Выполняет запрос ведущего и передаёт результат остальным.
+
+        Args:
+            key (Hashable): Ключ запроса.
+            future (Future[Any]): Будущий результат, полученный из join.
+            call (Callable[[], Any]): Функция запроса.
+
+        Return:
+            Any: Результат call.
+
+        Exception:
+            Исключения call пробрасываются ведущему и всем ожидающим.
+        """
+        try:
+            result = call()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            raise
+        self.settle(key, future, result)
+        return result
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        Выполняет запрос или дожидается такого же выполняющегося.
+
+        Args:
+            key (Hashable): Ключ запроса.
+            call (Callable[[], Any]): Функция запроса.
+
+        Return:
+            Any: Результат запроса.
+
+        Exception:
+            Исключения call пробрасываются всем вызывающим.
+        """
+        future, leader = self.join(key)
+        if leader:
+            return self.run(key, future, call)
+        return future.result()
+
+    def in_flight(self) -> int:
+        """
+        Возвращает количество выполняющихся запросов.
+        """
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,256 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Приоритеты задач: меньшее значение выполняется раньше
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class CancellationToken:
+    """
+    Признак отмены, общий для вызывающего и задачи.
+
+    Задача, отменённая до начала выполнения, не запускается.
+    Выполняющаяся задача может проверять признак сама
+    (raise_if_cancelled), а её результат после отмены не доставляется
+    (см. TaskRunner).
+    """
+
+    def __init__(self) -> None:
+        """
+        Создаёт неотменённый признак.
+        """
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Отменяет задачи с этим признаком.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Return:
+            bool: True, если задачи отменены.
+        """
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Прерывает задачу, если она отменена.
+
+        Exception:
+            CancelledError: Если задачи отменены.
+        """
+        if self._event.is_set():
+            raise CancelledError()
+
+
+class TaskPool:
+    """
+    Ограниченный пул потоков с очередью задач по приоритету.
+
+    Потоки создаются по мере надобности, но не больше max_workers,
+    поэтому их число не растёт при частых кликах и обновлениях.
+    Задачи с приоритетом INTERACTIVE выполняются раньше фоновых
+    (BACKGROUND и ниже), а reserved потоков фоновые задачи не
+    занимают никогда: действие пользователя не ждёт, пока завершится
+    медленное фоновое обновление.
+
+    Задачи пула не должны ждать других задач того же пула, иначе
+    при занятых потоках они будут ждать вечно.
+
+    Attributes:
+        max_workers (int): Наибольшее число потоков.
+        reserved (int): Потоков, недоступных фоновым задачам.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        reserved: int = 1,
+        name: str = "tasks",
+    ):
+        """
+        Инициализирует пул без потоков.
+
+        Args:
+            max_workers (int): Наибольшее число потоков.
+            reserved (int):
+                Сколько потоков оставлять для интерактивных задач;
+                не больше max_workers - 1.
+            name (str): Префикс имён потоков.
+        """
+        if max_workers < 1:
+            raise ValueError("Пулу нужен хотя бы один поток")
+        self.max_workers: int = max_workers
+        self.reserved: int = min(max(0, reserved), max_workers - 1)
+        self._name = name
+
+        # Задачи: (приоритет, порядковый номер, future, функция,
+        # аргументы, признак отмены)
+        self._queue: List[Tuple[int, int, Future, Callable[..., Any],
+                                Tuple, Optional[CancellationToken]]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._idle: int = 0
+        self._running: int = 0
+        self._background: int = 0
+        self._shutdown: bool = False
+
+        self._completed: int = 0
+        self._failed: int = 0
+        self._cancelled: int = 0
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = INTERACTIVE,
+        token: Optional[CancellationToken] = None
+    ) -> "Future[Any]":
+        """
+        Ставит задачу в очередь.
+
+        Args:
+            fn (Callable[..., Any]): Функция задачи.
+            *args (Any): Аргументы функции.
+            priority (int):
+                Приоритет; INTERACTIVE для действий пользователя,
+                BACKGROUND для фоновых обновлений.
+            token (Optional[CancellationToken]):
+                Признак отмены; отменённая задача не запускается.
+
+        Return:
+            Future[Any]: Будущий результат задачи. Исключение задачи
+            сохраняется в нём, а не теряется в потоке.
+
+        Exception:
+            RuntimeError: Если пул остановлен.
+        """
+        future: "Future[Any]" = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Пул задач остановлен")
+            heapq.heappush(self._queue, (
+                priority, next(self._sequence), future, fn, args, token
+            ))
+            if self._idle == 0 and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"{self._name}-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            else:
+                self._condition.notify()
+        return future
+
+    def _take(self) -> Optional[Tuple]:
+        """
+        Ждёт задачу, которую можно выполнить.
+
+        Return:
+            Optional[Tuple]: Задача или None, если пул остановлен.
+        """
+        with self._condition:
+            while True:
+                if self._shutdown:
+                    return None
+                if self._queue:
+                    background = self._queue[0][0] >= BACKGROUND
+                    if not background or (
+                        self._background < self.max_workers - self.reserved
+                    ):
+                        task = heapq.heappop(self._queue)
+                        self._running += 1
+                        self._background += background
+                        return task
+                self._idle += 1
+                self._condition.wait()
+                self._idle -= 1
+
+    def _work(self) -> None:
+        """
+        Цикл потока пула.
+        """
+        while True:
+            task = self._take()
+            if task is None:
+                return
+            priority, _, future, fn, args, token = task
+            if token is not None and token.cancelled:
+                future.cancel()
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+
+            with self._condition:
+                self._running -= 1
+                self._background -= priority >= BACKGROUND
+                if future.cancelled() or isinstance(
+                    future.exception(), CancelledError
+                ):
+                    self._cancelled += 1
+                elif future.exception() is not None:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                # Освободилось место для отложенной фоновой задачи
+                self._condition.notify()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Return:
+            bool: True, если пул остановлен.
+        """
+        with self._condition:
+            return self._shutdown
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает состояние пула.
+
+        Return:
+            Dict[str, int]: threads — создано потоков, queued — задач
+            в очереди, running — выполняется, completed, failed
+            и cancelled — счётчики завершённых задач.
+        """
+        with self._condition:
+            return {
+                "threads": len(self._threads),
+                "queued": len(self._queue),
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Отменяет задачи в очереди и останавливает потоки
+        после завершения выполняющихся задач.
+
+        Args:
+            wait (bool): Ждать ли завершения потоков.
+        """
+        with self._condition:
+            self._shutdown = True
+            queue, self._queue = self._queue, []
+            self._condition.notify_all()
+        for task in queue:
+            task[2].cancel()
+        if wait:
+            for thread in self._threads:
+                thread.join()
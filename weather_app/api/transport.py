@@ -0,0 +1,138 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from weather_app.api.connectivity import ConnectivityMonitor
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class HttpTransport:
+    """
+    Пул HTTP-соединений для запросов к OpenWeatherMap.
+
+    Оборачивает одну общую сессию requests, поэтому TCP/TLS-соединения
+    с api.openweathermap.org и openweathermap.org переиспользуются
+    (keep-alive), а не открываются заново на каждый запрос.
+
+    Результаты запросов передаются в монитор связи: после сетевой
+    ошибки запросы сразу завершаются ошибкой, пока пробный запрос
+    к probe_url не пройдёт, поэтому без сети интерфейс и фоновые
+    потоки не ждут таймаутов.
+
+    Attributes:
+        session (requests.Session):
+            Общая сессия с пулом соединений для каждого хоста.
+        timeout (Tuple[float, float]):
+            Таймауты (подключение, чтение) в секундах.
+        connectivity (ConnectivityMonitor):
+            Монитор доступности сети.
+    """
+
+    probe_url: str = "https://api.openweathermap.org/"
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 10.0),
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Инициализирует транспорт с пулом соединений.
+
+        Args:
+            pool_connections (int):
+                Количество хостов, для которых хранится пул соединений.
+            pool_maxsize (int):
+                Максимальное число соединений в пуле одного хоста.
+            timeout (Union[float, Tuple[float, float]]):
+                Таймаут запроса или пара (подключение, чтение).
+            retries (int):
+                Количество повторов при сетевых ошибках и ответах 5xx/429.
+            backoff_factor (float):
+                Коэффициент экспоненциальной задержки между повторами.
+            session (Optional[requests.Session]):
+                Готовая сессия (например, для тестового сервера).
+                Если передана, адаптеры к ней не монтируются.
+        """
+        if isinstance(timeout, (int, float)):
+            timeout = (timeout, timeout)
+        self.timeout: Tuple[float, float] = timeout
+        self.connectivity: ConnectivityMonitor = ConnectivityMonitor(
+            self.probe
+        )
+
+        if session is not None:
+            self.session: requests.Session = session
+            return
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=False,
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Выполняет GET-запрос через пул соединений.
+
+        Args:
+            url (str): Адрес запроса.
+            params (Optional[Dict[str, Any]]): Параметры строки запроса.
+
+        Return:
+            requests.Response: Ответ сервера со статусом 2xx.
+
+        Exception:
+            requests.RequestException:
+                Если запрос завершился ошибкой или статусом 4xx/5xx.
+                Без связи — requests.ConnectionError сразу.
+        """
+        if not self.connectivity.online:
+            raise requests.ConnectionError("Нет подключения к сети")
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            self.connectivity.report_failure()
+            raise
+        self.connectivity.report_success()
+        response.raise_for_status()
+        return response
+
+    def probe(self) -> None:
+        """
+        Проверяет, что сервер API отвечает. Статус ответа не важен.
+
+        Exception:
+            requests.RequestException: Если сервер недоступен.
+        """
+        self.session.head(self.probe_url, timeout=self.timeout)
+
+    def close(self) -> None:
+        """
+        Закрывает все соединения пула и останавливает проверку связи.
+        """
+        self.connectivity.stop()
+        self.session.close()
@@ -1,9 +1,34 @@
+import re
 import requests
-from weather_app.db.database import Database
-from datetime import datetime, timedelta, timezone
-from PyQt5.QtGui import QPixmap
-from io import BytesIO
-from typing import Any, Dict, List, Optional
+from weather_app.api.forecast import aggregate_forecast
+from weather_app.api.icon_cache import IconCache
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.api.rate_limit import RateLimiter
+from weather_app.api.transport import HttpTransport
+from weather_app.db.history import WeatherHistory
+from weather_app.db.settings import Settings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Строка запроса в URL внутри сообщения об ошибке (содержит appid)
+_QUERY_RE = re.compile(r"\?[^\s'\"()<>]*")
+
+
+def redact(message: str) -> str:
+    """
+    Убирает строки запроса из URL в сообщении об ошибке.
+
+    Сообщения исключений requests содержат полный URL запроса,
+    а вместе с ним и API-ключ (параметр appid). Такие сообщения нельзя
+    выводить клиентам сервера, в файлы выгрузки и журналы.
+
+    Args:
+        message (str): Сообщение об ошибке.
+
+    Return:
+        str: Сообщение без строк запроса.
+    """
+    return _QUERY_RE.sub("", message)
 
 
 class WeatherAPI:
@@ -12,42 +37,197 @@ class WeatherAPI:
     для получения текущей погоды и прогноза погоды.
 
     Attributes:
-        database (Database):
-            Экземпляр базы данных для получения настроек,
-            таких как API-ключ.
+        transport (HttpTransport):
+            Пул HTTP-соединений, через который выполняются все запросы.
+        icon_cache (IconCache):
+            Кэш иконок погоды в памяти и на диске.
         api_key (str): API-ключ OpenWeatherMap.
         base_url (str): Базовый URL для API текущей погоды.
         forecast_url (str): Базовый URL для API прогноза погоды.
+        group_url (str): Базовый URL для API погоды в нескольких городах.
+        rate_limiter (RateLimiter):
+            Ограничитель частоты запросов к API (иконки не учитываются).
         default_params (dict): Параметры по умолчанию для запросов к API.
+        forecast_days (int): Количество дней в прогнозе.
+        history (Optional[WeatherHistory]):
+            Запись истории погоды; в неё попадает каждое полученное
+            наблюдение и снимок прогноза.
+        prefetch_icons (bool):
+            Загружать ли иконки погоды вместе с данными.
+        executor (ThreadPoolExecutor):
+            Ограниченный пул потоков для параллельных запросов.
     """
 
-    def __init__(self, database: Database, parent: Optional[Any] = None):
+    # Максимальное количество городов в одном запросе метода group
+    GROUP_SIZE = 20
+
+    def __init__(
+        self,
+        settings: Settings,
+        parent: Optional[Any] = None,
+        transport: Optional[HttpTransport] = None,
+        icon_cache: Optional[IconCache] = None,
+        max_workers: int = 6,
+        rate_limiter: Optional[RateLimiter] = None,
+        forecast_days: int = 3,
+        history: Optional[WeatherHistory] = None,
+        prefetch_icons: bool = True,
+    ):
         """
-        Инициализирует экземпляр WeatherAPI с подключением к базе данных.
+        Инициализирует экземпляр WeatherAPI с настройками приложения.
 
         Args:
-            database (Database):
-                Экземпляр базы данных для получения настроек.
+            settings (Settings):
+                Настройки приложения. API-ключ читается из них и
+                обновляется при изменении настройки.
             parent (Optional[Any]):
                 Необязательный родительский объект для интеграции с PyQt.
+            transport (Optional[HttpTransport]):
+                HTTP-транспорт. По умолчанию создаётся пул соединений
+                с настройками по умолчанию.
+            icon_cache (Optional[IconCache]):
+                Кэш иконок. По умолчанию создаётся поверх transport.
+            max_workers (int):
+                Максимальное число параллельных запросов.
+            rate_limiter (Optional[RateLimiter]):
+                Ограничитель частоты запросов. По умолчанию 60 запросов
+                в минуту (лимит бесплатного тарифа) с запасом в 10 подряд.
+            forecast_days (int):
+                Количество дней в прогнозе (не больше 5).
+            history (Optional[WeatherHistory]):
+                Запись истории погоды. По умолчанию история не ведётся.
+            prefetch_icons (bool):
+                Загружать ли иконки погоды вместе с данными; без
+                интерфейса они не нужны. По умолчанию True.
         """
-        self.database: Database = database
-        self.api_key: str = self.database.get_setting(
-            'OPEN_WEATHER_MAP_API_KEY'
-        )
+        self.transport: HttpTransport = transport or HttpTransport()
+        self.icon_cache: IconCache = icon_cache or IconCache(self.transport)
+        self.api_key: str = settings.get('OPEN_WEATHER_MAP_API_KEY')
         self.base_url: str = (
             "https://api.openweathermap.org/data/2.5/weather"
         )
         self.forecast_url: str = (
             "https://api.openweathermap.org/data/2.5/forecast"
         )
+        self.group_url: str = (
+            "https://api.openweathermap.org/data/2.5/group"
+        )
+        self.rate_limiter: RateLimiter = (
+            rate_limiter or RateLimiter(rate=1.0, burst=10)
+        )
         self.default_params: Dict[str, str] = {
             "units": "metric",
             "lang": "ru",
             "appid": self.api_key,
         }
+        self.forecast_days: int = forecast_days
+        self.history: Optional[WeatherHistory] = history
+        self.prefetch_icons: bool = prefetch_icons
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="weather-api",
+        )
+        settings.subscribe('OPEN_WEATHER_MAP_API_KEY', self.set_api_key)
 
-    def fetch_weather_by_city_id(self, city_id: int) -> Dict[str, Any]:
+    def set_api_key(self, api_key: str) -> None:
+        """
+        Меняет API-ключ для следующих запросов.
+
+        Args:
+            api_key (str): API-ключ OpenWeatherMap.
+        """
+        self.api_key = api_key
+        self.default_params["appid"] = api_key
+
+    def _request(self, url: str, city_id: Any) -> Dict[str, Any]:
+        """
+        Выполняет запрос к API для города и возвращает JSON-ответ.
+
+        Args:
+            url (str): Адрес метода API.
+            city_id (Any): ID города или список ID через запятую.
+
+        Return:
+            dict: Разобранный JSON-ответ.
+
+        Exception:
+            RuntimeError: Если запрос к API завершился с ошибкой.
+        """
+        params = self.default_params.copy()
+        params["id"] = city_id
+
+        self.rate_limiter.acquire()
+        try:
+            return self.transport.get(url, params=params).json()
+        except (requests.RequestException, ValueError) as e:
+            raise RuntimeError(
+                f"Ошибка при выполнении запроса к API: {redact(str(e))}"
+            ) from e
+
+    def _parse_weather(self, data: Dict[str, Any]) -> CurrentWeather:
+        """
+        Преобразует ответ метода weather в запись о текущей погоде.
+
+        Args:
+            data (dict): JSON-ответ API текущей погоды.
+
+        Return:
+            CurrentWeather: Текущая погода.
+
+        Exception:
+            RuntimeError: Если в ответе нет обязательных полей.
+        """
+        try:
+            return CurrentWeather.from_api(data)
+        except (KeyError, IndexError) as e:
+            raise RuntimeError(f"Ошибка обработки данных о погоде: {e}")
+
+    def _parse_forecast(self, data: Dict[str, Any]) -> List[ForecastDay]:
+        """
+        Преобразует ответ метода forecast в прогноз на forecast_days
+        дней (см. aggregate_forecast).
+
+        Args:
+            data (dict): JSON-ответ API прогноза погоды.
+
+        Return:
+            List[ForecastDay]: Прогноз по дням.
+
+        Exception:
+            RuntimeError: Если в ответе нет обязательных полей.
+        """
+        try:
+            return aggregate_forecast(data, days=self.forecast_days)
+        except (KeyError, IndexError, TypeError) as e:
+            raise RuntimeError(f"Ошибка обработки данных прогноза: {e}")
+
+    def _prefetch_icons(self, items: Iterable[Any]) -> None:
+        """
+        Загружает в дисковый кэш иконки записей о погоде.
+
+        Сеть используется только в рабочем потоке; интерфейс затем
+        читает иконки по коду из кэша при отрисовке. Повторяющиеся
+        коды загружаются один раз, а разные — параллельно.
+
+        Загрузка не обязательна: ошибка выводится в журнал, а данные
+        о погоде возвращаются как есть. При отрисовке отсутствующая
+        иконка заменяется пустым изображением.
+
+        Args:
+            items (Iterable[Any]): Записи с атрибутом icon.
+        """
+        if not self.prefetch_icons:
+            return
+        codes = list(dict.fromkeys(item.icon for item in items))
+        try:
+            if len(codes) == 1:
+                self.icon_cache.get_bytes(codes[0])
+            else:
+                list(self.executor.map(self.icon_cache.get_bytes, codes))
+        except (requests.RequestException, ValueError) as e:
+            print(f"Ошибка загрузки иконки погоды: {e}")
+
+    def fetch_weather_by_city_id(self, city_id: int) -> CurrentWeather:
         """
         Получает текущие данные о погоде для заданного города по его ID.
 
@@ -55,136 +235,138 @@ class WeatherAPI:
             city_id (int): ID города.
 
         Return:
-            dict:
+            CurrentWeather:
                 Данные о погоде, включая температуру,
-                ветер, время восхода/заката,
-                а также иконку в формате QPixmap.
+                ветер, время восхода/заката и код иконки.
 
         Exception:
             RuntimeError:
                 Если запрос к API или обработка данных завершились с ошибкой.
         """
-        params = self.default_params.copy()
-        params["id"] = city_id
+        weather_info = self._parse_weather(
+            self._request(self.base_url, city_id)
+        )
+        self._prefetch_icons([weather_info])
+        if self.history:
+            self.history.record_weather(weather_info)
+        return weather_info
 
-        try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            weather_info: Dict[str, Any] = {
-                "city": data.get("name", "Неизвестный город"),
-                "country": data["sys"].get("country", "Неизвестная страна"),
-                "temperature": data["main"].get("temp", None),
-                "feels_like": data["main"].get("feels_like", None),
-                "temp_min": data["main"].get("temp_min", None),
-                "temp_max": data["main"].get("temp_max", None),
-                "pressure": data["main"].get("pressure", None),
-                "humidity": data["main"].get("humidity", None),
-                "visibility": data.get("visibility", None),
-                "wind_speed": data["wind"].get("speed", None),
-                "wind_deg": data["wind"].get("deg", None),
-                "wind_gust": data["wind"].get("gust", None),
-                "description": data["weather"][0].get(
-                    "description", "Описание не найдено"
-                ),
-                "icon": data["weather"][0].get("icon", ""),
-                "clouds": data["clouds"].get("all", None),
-                "sunrise": datetime.fromtimestamp(
-                    data["sys"]["sunrise"], tz=timezone.utc
-                ).strftime('%H:%M:%S'),
-                "sunset": datetime.fromtimestamp(
-                    data["sys"]["sunset"], tz=timezone.utc
-                ).strftime('%H:%M:%S'),
-                "timezone": data.get("timezone", None),
-            }
-
-            icon_url = (
-                f"https://openweathermap.org/img/wn/"
-                f"{weather_info['icon']}@2x.png"
-            )
-            icon_response = requests.get(icon_url)
-            icon_response.raise_for_status()
-            image_data = BytesIO(icon_response.content)
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data.read())
-            weather_info["pixmap"] = pixmap
-
-            return weather_info
-
-        except requests.RequestException as e:
-            raise RuntimeError(f"Ошибка при выполнении запроса к API: {e}")
-        except KeyError as e:
-            raise RuntimeError(f"Ошибка обработки данных о погоде: {e}")
+    def fetch_forecast_by_city_id(self, city_id: int) -> List[ForecastDay]:
+        """
+        Получает прогноз погоды на forecast_days дней
+        для заданного города по его ID.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            List[ForecastDay]:
+                Прогноз по дням, включая дату, минимальную/максимальную
+                температуру, осадки, средний ветер, описание и код иконки.
+
+        Exception:
+            RuntimeError:
+                Если запрос к API или обработка данных завершились с ошибкой.
+        """
+        forecast = self._parse_forecast(
+            self._request(self.forecast_url, city_id)
+        )
+        self._prefetch_icons(forecast)
+        if self.history:
+            self.history.record_forecast(city_id, forecast)
+        return forecast
 
-    def fetch_forecast_by_city_id(self, city_id: int) -> List[Dict[str, Any]]:
+    def fetch_weather_and_forecast(
+        self,
+        city_id: int
+    ) -> Tuple[CurrentWeather, List[ForecastDay]]:
         """
-        Получает прогноз погоды на 3 дня для заданного города по его ID.
+        Получает текущую погоду и прогноз параллельно.
+
+        Оба запроса к API выполняются одновременно, затем все различные
+        иконки загружаются параллельно. Общее время близко к самому
+        медленному запросу, а не к их сумме.
 
         Args:
             city_id (int): ID города.
 
         Return:
-            list:
-                Список словарей, содержащих данные прогноза,
-                включая дату, минимальную/максимальную температуру,
-                описание и иконку в формате QPixmap.
+            Tuple[CurrentWeather, List[ForecastDay]]:
+                Текущая погода и прогноз (см.
+                fetch_weather_by_city_id и fetch_forecast_by_city_id).
 
         Exception:
             RuntimeError:
                 Если запрос к API или обработка данных завершились с ошибкой.
         """
-        params = self.default_params.copy()
-        params["id"] = city_id
+        weather_future = self.executor.submit(
+            self._request, self.base_url, city_id
+        )
+        forecast_future = self.executor.submit(
+            self._request, self.forecast_url, city_id
+        )
+        weather_info = self._parse_weather(weather_future.result())
+        forecast = self._parse_forecast(forecast_future.result())
 
-        try:
-            response = requests.get(self.forecast_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            forecast: List[Dict[str, Any]] = []
-            current_date = datetime.now(timezone.utc).date()
-            target_dates = [
-                (current_date + timedelta(days=i)).strftime("%Y-%m-%d")
-                for i in range(1, 4)
-            ]
-
-            for target_date in target_dates:
-                min_temp = float('inf')
-                max_temp = float('-inf')
-                description = ""
-                icon_url = ""
-
-                for entry in data["list"]:
-                    entry_date = entry["dt_txt"].split()[0]
-                    if entry_date == target_date:
-                        min_temp = min(min_temp, entry["main"]["temp_min"])
-                        max_temp = max(max_temp, entry["main"]["temp_max"])
-
-                        if entry["dt_txt"].endswith("12:00:00"):
-                            description = entry["weather"][0]["description"]
-                            icon_url = (
-                                f"https://openweathermap.org/img/wn/"
-                                f"{entry['weather'][0]['icon']}@2x.png"
-                            )
-
-                icon_response = requests.get(icon_url)
-                icon_response.raise_for_status()
-                image_data = BytesIO(icon_response.content)
-                pixmap = QPixmap()
-                pixmap.loadFromData(image_data.read())
-
-                forecast.append({
-                    "date": target_date,
-                    "temp_min": min_temp,
-                    "temp_max": max_temp,
-                    "description": description,
-                    "pixmap": pixmap,
-                })
-
-            return forecast
-
-        except requests.RequestException as e:
-            raise RuntimeError(f"Ошибка при выполнении запроса к API: {e}")
-        except KeyError as e:
-            raise RuntimeError(f"Ошибка обработки данных прогноза: {e}")
+        self._prefetch_icons([weather_info, *forecast])
+        if self.history:
+            self.history.record_weather(weather_info)
+            self.history.record_forecast(city_id, forecast)
+        return weather_info, forecast
+
+    def fetch_weather_by_city_ids(
+        self,
+        city_ids: Iterable[int]
+    ) -> Dict[int, CurrentWeather]:
+        """
+        Получает текущую погоду для нескольких городов пакетно.
+
+        ID разбиваются на группы по GROUP_SIZE для метода group,
+        группы запрашиваются параллельно с учётом rate_limiter.
+        100 городов требуют 5 запросов вместо 100.
+
+        Args:
+            city_ids (Iterable[int]): ID городов.
+
+        Return:
+            Dict[int, CurrentWeather]:
+                Данные о погоде по ID города. Города из неудавшихся групп
+                в результат не попадают.
+
+        Exception:
+            RuntimeError: Если не удалось получить ни одной группы.
+        """
+        ids = list(dict.fromkeys(int(city_id) for city_id in city_ids))
+        chunks = [
+            ids[i:i + self.GROUP_SIZE]
+            for i in range(0, len(ids), self.GROUP_SIZE)
+        ]
+        futures = [
+            self.executor.submit(
+                self._request,
+                self.group_url,
+                ",".join(str(city_id) for city_id in chunk),
+            )
+            for chunk in chunks
+        ]
+
+        weather: Dict[int, CurrentWeather] = {}
+        errors: List[Exception] = []
+        for future in futures:
+            try:
+                data = future.result()
+                for item in data["list"]:
+                    weather[int(item["id"])] = self._parse_weather(item)
+            except (RuntimeError, KeyError, TypeError) as e:
+                errors.append(e)
+
+        if errors and not weather:
+            raise RuntimeError(
+                f"Ошибка при пакетном запросе погоды: {errors[0]}"
+            )
+
+        self._prefetch_icons(weather.values())
+        if self.history:
+            for weather_info in weather.values():
+                self.history.record_weather(weather_info)
+        return weather
@@ -0,0 +1,377 @@
+"""
+Выгрузка погоды для многих городов из командной строки.
+
+Города задаются списком ID, файлом с ID (по одному в строке, «-» —
+стандартный ввод), поиском по названию или избранным. Текущая погода
+запрашивается пакетами методом group, прогноз — по городу. Запросы
+выполняются параллельно (--concurrency) и не чаще --rate в секунду.
+Результаты выводятся по мере получения в порядке городов в формате
+JSON Lines или CSV.
+
+Запуск:
+    python -m weather_app.cli 524901 498817 --forecast
+    python -m weather_app.cli --query Моск --country RU --format csv \\
+        --output weather.csv
+"""
+
+import argparse
+import collections
+import csv
+import dataclasses
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.api.rate_limit import RateLimiter
+from weather_app.api.service import (
+    API_KEY_ENV,
+    DEFAULT_DB_PATH,
+    WeatherService,
+)
+from weather_app.api.weather_api import redact
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы; по умолчанию sys.argv.
+
+    Return:
+        argparse.Namespace: Аргументы.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m weather_app.cli',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('city_ids', nargs='*', type=int, help='ID городов')
+    parser.add_argument('--ids-file', help='файл с ID городов или «-»')
+    parser.add_argument('--query', help='поиск городов по названию')
+    parser.add_argument('--country', help='код страны для --query')
+    parser.add_argument('--limit', type=int, help='наибольшее число городов')
+    parser.add_argument(
+        '--favorites', action='store_true', help='избранные города'
+    )
+    parser.add_argument(
+        '--forecast', action='store_true', help='добавить прогноз'
+    )
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('--output', '-o', help='файл вывода (stdout)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=1.0,
+        help='запросов в секунду (бесплатный тариф: 1)',
+    )
+    parser.add_argument('--burst', type=int, default=10)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--api-key', help=f'API-ключ (или ${API_KEY_ENV})')
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help='не сохранять полученную погоду в историю',
+    )
+    args = parser.parse_args(argv)
+    if not (args.city_ids or args.ids_file or args.query or args.country
+            or args.favorites):
+        parser.error('укажите ID городов, --ids-file, --query или '
+                     '--favorites')
+    if args.concurrency < 1 or args.rate <= 0 or args.burst < 1:
+        parser.error('--concurrency, --rate и --burst должны быть '
+                     'положительными')
+    return args
+
+
+def read_ids(stream: IO[str]) -> Iterator[int]:
+    """
+    Читает ID городов: по одному или несколько через пробел
+    или запятую в строке. Пустые строки и строки с # пропускаются.
+
+    Args:
+        stream (IO[str]): Текстовый поток.
+
+    Return:
+        Iterator[int]: ID городов.
+
+    Exception:
+        ValueError: Если строка содержит не число.
+    """
+    for line in stream:
+        line = line.split('#', 1)[0]
+        for part in line.replace(',', ' ').split():
+            yield int(part)
+
+
+def city_ids(args: argparse.Namespace, service: WeatherService) -> List[int]:
+    """
+    Собирает ID городов из аргументов без повторов.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки.
+        service (WeatherService): Ядро приложения.
+
+    Return:
+        List[int]: ID городов в порядке указания.
+    """
+    ids: List[int] = list(args.city_ids)
+    if args.ids_file == '-':
+        ids.extend(read_ids(sys.stdin))
+    elif args.ids_file:
+        with open(args.ids_file, encoding='utf-8') as stream:
+            ids.extend(read_ids(stream))
+    if args.query or args.country:
+        ids.extend(
+            row[0] for row in service.search_cities(
+                args.query or '', limit=args.limit, country=args.country
+            )
+        )
+    if args.favorites:
+        ids.extend(service.favorite_city_ids())
+
+    ids = list(dict.fromkeys(ids))
+    return ids[:args.limit] if args.limit else ids
+
+
+def fetch_chunk(
+    service: WeatherService,
+    chunk: List[int],
+    forecast: bool
+) -> List[Dict[str, Any]]:
+    """
+    Получает погоду для пачки городов: текущую одним запросом group,
+    прогноз — по городу.
+
+    Ошибки не прерывают выгрузку и попадают в поле error записи
+    (без строк запроса URL, в которых передаётся API-ключ).
+
+    Запросы идут мимо кэша CachedWeatherAPI: каждый город выгружается
+    один раз, а кэш хранил бы все полученные данные до конца выгрузки.
+
+    Args:
+        service (WeatherService): Ядро приложения.
+        chunk (List[int]): ID городов, не больше GROUP_SIZE.
+        forecast (bool): Запрашивать ли прогноз.
+
+    Return:
+        List[Dict[str, Any]]: Записи в порядке chunk.
+    """
+    api = service.api.api
+    try:
+        weather = api.fetch_weather_by_city_ids(chunk)
+        group_error = None
+    except RuntimeError as e:
+        weather, group_error = {}, redact(str(e))
+
+    records = []
+    for city_id in chunk:
+        record: Dict[str, Any] = {
+            'city_id': city_id,
+            'weather': None,
+            'forecast': None,
+            'error': None,
+        }
+        if city_id in weather:
+            record['weather'] = dataclasses.asdict(weather[city_id])
+        else:
+            record['error'] = group_error or 'город не найден'
+        if forecast and record['error'] is None:
+            try:
+                record['forecast'] = [
+                    dataclasses.asdict(day)
+                    for day in api.fetch_forecast_by_city_id(city_id)
+                ]
+            except RuntimeError as e:
+                record['error'] = redact(str(e))
+        records.append(record)
+    return records
+
+
+def fetch_all(
+    service: WeatherService,
+    ids: List[int],
+    forecast: bool,
+    concurrency: int
+) -> Iterator[Dict[str, Any]]:
+    """
+    Получает погоду для всех городов параллельно и отдаёт записи
+    в порядке ids по мере готовности.
+
+    В работе одновременно не больше concurrency пачек, а готовых,
+    но не выведенных — не больше ещё стольких же. Данные не
+    кэшируются (см. fetch_chunk), поэтому память не зависит
+    от числа городов.
+
+    Args:
+        service (WeatherService): Ядро приложения.
+        ids (List[int]): ID городов.
+        forecast (bool): Запрашивать ли прогноз.
+        concurrency (int): Наибольшее число одновременных пачек.
+
+    Return:
+        Iterator[Dict[str, Any]]: Записи о погоде.
+    """
+    size = service.api.api.GROUP_SIZE
+    chunks = (ids[i:i + size] for i in range(0, len(ids), size))
+    pending: Deque["Future[List[Dict[str, Any]]]"] = collections.deque()
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix='weather-cli'
+    ) as executor:
+        try:
+            for chunk in chunks:
+                pending.append(
+                    executor.submit(fetch_chunk, service, chunk, forecast)
+                )
+                while len(pending) >= 2 * concurrency:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def csv_columns(forecast_days: int) -> List[str]:
+    """
+    Возвращает столбцы CSV: поля текущей погоды и поля каждого дня
+    прогноза с префиксом day1_, day2_ и т. д.
+
+    Args:
+        forecast_days (int): Количество дней прогноза; 0 — без прогноза.
+
+    Return:
+        List[str]: Названия столбцов.
+    """
+    columns = ['city_id', 'error']
+    columns += [
+        field.name for field in dataclasses.fields(CurrentWeather)
+        if field.name != 'city_id'
+    ]
+    for day in range(1, forecast_days + 1):
+        columns += [
+            f'day{day}_{field.name}'
+            for field in dataclasses.fields(ForecastDay)
+        ]
+    return columns
+
+
+def csv_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Превращает запись о погоде в строку CSV.
+    """
+    row = {'city_id': record['city_id'], 'error': record['error'] or ''}
+    weather = dict(record['weather'] or {})
+    weather.pop('city_id', None)
+    row.update(weather)
+    for day, data in enumerate(record['forecast'] or (), start=1):
+        row.update({f'day{day}_{key}': value for key, value in data.items()})
+    return row
+
+
+def write_records(
+    records: Iterable[Dict[str, Any]],
+    stream: IO[str],
+    output_format: str,
+    forecast_days: int
+) -> Dict[str, int]:
+    """
+    Записывает записи о погоде в поток по мере получения.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): Записи о погоде.
+        stream (IO[str]): Поток вывода.
+        output_format (str): 'jsonl' или 'csv'.
+        forecast_days (int): Дней прогноза в столбцах CSV.
+
+    Return:
+        Dict[str, int]: cities — выведено городов, errors — с ошибкой.
+    """
+    writer: Optional[csv.DictWriter] = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(
+            stream, csv_columns(forecast_days), extrasaction='ignore'
+        )
+        writer.writeheader()
+
+    stats = {'cities': 0, 'errors': 0}
+    for record in records:
+        if writer:
+            writer.writerow(csv_row(record))
+        else:
+            stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stream.flush()
+        stats['cities'] += 1
+        if record['error']:
+            stats['errors'] += 1
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа выгрузки погоды.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы; по умолчанию sys.argv.
+
+    Return:
+        int: Код выхода: 0 — успех, 1 — ошибки по части городов,
+        2 — ошибка запуска.
+    """
+    args = parse_args(argv)
+    service = WeatherService(
+        args.db,
+        record_history=not args.no_history,
+        prefetch_icons=False,
+        api_key=args.api_key,
+    )
+    api = service.api.api
+    if not api.api_key:
+        print('API-ключ не задан: укажите --api-key, переменную '
+              f'{API_KEY_ENV} или сохраните его в настройках приложения',
+              file=sys.stderr)
+        service.close()
+        return 2
+    api.rate_limiter = RateLimiter(rate=args.rate, burst=args.burst)
+
+    output = (
+        open(args.output, 'w', encoding='utf-8', newline='')
+        if args.output else sys.stdout
+    )
+    began = time.perf_counter()
+    try:
+        ids = city_ids(args, service)
+        stats = write_records(
+            fetch_all(service, ids, args.forecast, args.concurrency),
+            output,
+            args.format,
+            api.forecast_days if args.forecast else 0,
+        )
+    except BrokenPipeError:
+        # Вывод закрыт раньше времени (например, `| head`)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        print(f'Ошибка выгрузки погоды: {e}', file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        service.close()
+
+    print(
+        f"Городов: {stats['cities']}, с ошибкой: {stats['errors']}, "
+        f"за {time.perf_counter() - began:.1f} с",
+        file=sys.stderr,
+    )
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import sqlite3
-from typing import List, Optional, Tuple
+from contextlib import contextmanager
+from weather_app.db.gazetteer import CityGazetteer
+from weather_app.db.geo import MAX_DISTANCE_KM, bounding_boxes, haversine_km
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class Database:
@@ -11,16 +14,76 @@ class Database:
             Объект соединения с базой данных SQLite.
         cursor (sqlite3.Cursor):
             Курсор для выполнения SQL-запросов.
+        db_path (str):
+            Путь к файлу базы данных.
+        use_gazetteer (bool):
+            Искать ли города по индексу в памяти (см. enable_gazetteer).
     """
 
-    def __init__(self):
+    # Минимальная длина запроса для поиска подстроки по триграммам
+    MIN_FTS_QUERY_LENGTH = 3
+
+    # Таблицы истории погоды по разрешению
+    HISTORY_TABLES = {
+        'raw': 'weather_observations',
+        'hourly': 'weather_hourly',
+        'daily': 'weather_daily',
+    }
+
+    # Наибольший период запроса (в секундах), для которого
+    # автоматически выбирается разрешение
+    HISTORY_RAW_SPAN = 2 * 86400
+    HISTORY_HOURLY_SPAN = 90 * 86400
+
+    def __init__(
+        self,
+        db_path: str = 'weather_app/db/database.db',
+        connection: Optional[sqlite3.Connection] = None,
+        autocommit: bool = True
+    ):
         """
         Инициализация подключения к базе данных.
+
+        Args:
+            db_path (str, optional):
+                Путь к файлу базы данных.
+                По умолчанию 'weather_app/db/database.db'.
+            connection (Optional[sqlite3.Connection], optional):
+                Готовое подключение (см. DatabaseService). Таблицы
+                для него не создаются. По умолчанию открывается новое
+                подключение и создаются таблицы.
+            autocommit (bool, optional):
+                Фиксировать ли каждое изменение. False — транзакцией
+                управляет владелец подключения. По умолчанию True.
         """
-        db_path = 'weather_app/db/database.db'
-        self.conn: sqlite3.Connection = sqlite3.connect(db_path)
+        self.db_path: str = db_path
+        self.use_gazetteer: bool = False
+        self.autocommit: bool = autocommit
+        self.conn: sqlite3.Connection = connection or sqlite3.connect(db_path)
         self.conn.text_factory = str
         self.cursor: sqlite3.Cursor = self.conn.cursor()
+        if connection is None:
+            self.create_tables()
+
+    def commit(self) -> None:
+        """
+        Фиксирует изменения, если включена автофиксация.
+        """
+        if self.autocommit:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Выполняет блок with одной транзакцией, если включена
+        автофиксация; иначе блок входит в транзакцию владельца
+        подключения.
+        """
+        if self.autocommit:
+            with self.conn:
+                yield
+        else:
+            yield
 
     def __to_ascii_equivalent(self, char: str) -> str:
         """
@@ -47,7 +110,7 @@ class Database:
                 ru_name  TEXT,
                 lat      REAL,
                 lon      REAL,
-                favorite BOOLEAN DEFAULT (0) 
+                favorite BOOLEAN DEFAULT (0)
             )
         ''')
 
@@ -58,18 +121,296 @@ class Database:
                 setting_value TEXT
             )
         ''')
+
+        self.create_search_index()
+        self.create_spatial_index()
+        self.create_history_tables()
         self.conn.commit()
 
+    def create_search_index(self) -> None:
+        """
+        Создаёт индексы для поиска городов по названию.
+
+        - cities_fts: триграммный FTS5-индекс по ru_name для поиска
+          подстроки без учёта регистра, синхронизируемый триггерами;
+        - idx_cities_ru_name: индекс для поиска по префиксу;
+        - idx_cities_search_order: покрывающий индекс в порядке выдачи
+          списка (избранные, российские, по стране).
+        """
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'cities_fts'"
+        )
+        fts_exists = self.cursor.fetchone() is not None
+
+        self.cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS cities_fts USING fts5(
+                ru_name,
+                content = 'cities',
+                content_rowid = 'id',
+                tokenize = 'trigram'
+            )
+        ''')
+        self.cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS cities_fts_insert
+            AFTER INSERT ON cities BEGIN
+                INSERT INTO cities_fts (rowid, ru_name)
+                VALUES (new.id, new.ru_name);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cities_fts_delete
+            AFTER DELETE ON cities BEGIN
+                INSERT INTO cities_fts (cities_fts, rowid, ru_name)
+                VALUES ('delete', old.id, old.ru_name);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cities_fts_update
+            AFTER UPDATE OF ru_name ON cities BEGIN
+                INSERT INTO cities_fts (cities_fts, rowid, ru_name)
+                VALUES ('delete', old.id, old.ru_name);
+                INSERT INTO cities_fts (rowid, ru_name)
+                VALUES (new.id, new.ru_name);
+            END;
+
+            CREATE INDEX IF NOT EXISTS idx_cities_ru_name
+            ON cities (ru_name);
+
+            CREATE INDEX IF NOT EXISTS idx_cities_search_order
+            ON cities (
+                favorite DESC,
+                (CASE WHEN country = 'RU' THEN 0 ELSE 1 END),
+                country,
+                id, ru_name, lat, lon
+            )
+            WHERE ru_name IS NOT NULL;
+        ''')
+
+        # Индекс создан впервые для уже заполненной таблицы
+        if not fts_exists:
+            self.cursor.execute(
+                "INSERT INTO cities_fts (cities_fts) VALUES ('rebuild')"
+            )
+
+    def create_spatial_index(self) -> None:
+        """
+        Создаёт пространственный индекс R*Tree по координатам городов.
+
+        Индекс cities_rtree синхронизируется с таблицей cities
+        триггерами и используется для поиска ближайших городов.
+        """
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'cities_rtree'"
+        )
+        rtree_exists = self.cursor.fetchone() is not None
+
+        self.cursor.executescript('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS cities_rtree USING rtree(
+                id,
+                min_lat, max_lat,
+                min_lon, max_lon
+            );
+
+            CREATE TRIGGER IF NOT EXISTS cities_rtree_insert
+            AFTER INSERT ON cities
+            WHEN new.lat IS NOT NULL AND new.lon IS NOT NULL BEGIN
+                INSERT INTO cities_rtree
+                VALUES (new.id, new.lat, new.lat, new.lon, new.lon);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cities_rtree_delete
+            AFTER DELETE ON cities BEGIN
+                DELETE FROM cities_rtree WHERE id = old.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS cities_rtree_update
+            AFTER UPDATE OF id, lat, lon ON cities BEGIN
+                DELETE FROM cities_rtree WHERE id = old.id;
+                INSERT INTO cities_rtree
+                SELECT new.id, new.lat, new.lat, new.lon, new.lon
+                WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL;
+            END;
+        ''')
+
+        # Индекс создан впервые для уже заполненной таблицы
+        if not rtree_exists:
+            self.cursor.execute('''
+                INSERT INTO cities_rtree
+                SELECT id, lat, lat, lon, lon FROM cities
+                WHERE lat IS NOT NULL AND lon IS NOT NULL
+            ''')
+
+    def drop_city_indexes(self) -> None:
+        """
+        Удаляет индексы и триггеры таблицы cities перед массовой
+        загрузкой городов. Восстанавливаются методами
+        create_search_index и create_spatial_index, которые заново
+        заполняют индексы cities_fts и cities_rtree.
+        """
+        self.cursor.executescript('''
+            DROP TRIGGER IF EXISTS cities_fts_insert;
+            DROP TRIGGER IF EXISTS cities_fts_delete;
+            DROP TRIGGER IF EXISTS cities_fts_update;
+            DROP TRIGGER IF EXISTS cities_rtree_insert;
+            DROP TRIGGER IF EXISTS cities_rtree_delete;
+            DROP TRIGGER IF EXISTS cities_rtree_update;
+            DROP INDEX IF EXISTS idx_cities_ru_name;
+            DROP INDEX IF EXISTS idx_cities_search_order;
+            DROP TABLE IF EXISTS cities_fts;
+            DROP TABLE IF EXISTS cities_rtree;
+        ''')
+
+    def create_history_tables(self) -> None:
+        """
+        Создаёт таблицы истории погоды.
+
+        - weather_observations: наблюдения в том виде, в каком пришли
+          от API;
+        - weather_hourly и weather_daily: почасовые и посуточные
+          агрегаты наблюдений (см. rollup_weather_history);
+        - forecast_snapshots: снимки прогноза по дням на момент
+          загрузки;
+        - last_weather: последние полученные текущая погода и прогноз
+          каждого города целиком (JSON) для работы без сети;
+        - history_meta: служебные значения истории, например начало
+          ещё не пересчитанного периода (см. rollup_weather_history).
+
+        Таблицы WITHOUT ROWID с первичным ключом (city_id, ts) хранят
+        строки одного города подряд в порядке времени, поэтому выборка
+        за период читает одну непрерывную область B-дерева.
+        Индексы по ts нужны для агрегации и удаления старых строк.
+        """
+        aggregate_columns = '''
+                city_id    INTEGER NOT NULL,
+                ts         INTEGER NOT NULL,
+                samples    INTEGER NOT NULL,
+                temp_min   REAL,
+                temp_max   REAL,
+                temp_avg   REAL,
+                pressure   REAL,
+                humidity   REAL,
+                wind_speed REAL,
+                PRIMARY KEY (city_id, ts)
+        '''
+        self.cursor.executescript(f'''
+            CREATE TABLE IF NOT EXISTS weather_observations (
+                city_id     INTEGER NOT NULL,
+                ts          INTEGER NOT NULL,
+                temperature REAL,
+                feels_like  REAL,
+                pressure    REAL,
+                humidity    REAL,
+                wind_speed  REAL,
+                wind_deg    REAL,
+                clouds      REAL,
+                icon        TEXT,
+                PRIMARY KEY (city_id, ts)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_weather_observations_ts
+            ON weather_observations (ts);
+
+            CREATE TABLE IF NOT EXISTS weather_hourly (
+                {aggregate_columns}
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_weather_hourly_ts
+            ON weather_hourly (ts);
+
+            CREATE TABLE IF NOT EXISTS weather_daily (
+                {aggregate_columns}
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS forecast_snapshots (
+                city_id       INTEGER NOT NULL,
+                ts            INTEGER NOT NULL,
+                fetched_at    INTEGER NOT NULL,
+                temp_min      REAL,
+                temp_max      REAL,
+                temp_mean     REAL,
+                wind_speed    REAL,
+                precipitation REAL,
+                description   TEXT,
+                icon          TEXT,
+                PRIMARY KEY (city_id, ts, fetched_at)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_forecast_snapshots_fetched_at
+            ON forecast_snapshots (fetched_at);
+
+            CREATE TABLE IF NOT EXISTS last_weather (
+                city_id    INTEGER NOT NULL,
+                kind       TEXT NOT NULL,
+                fetched_at INTEGER NOT NULL,
+                payload    TEXT NOT NULL,
+                PRIMARY KEY (city_id, kind)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS history_meta (
+                name  TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        ''')
+
+    def enable_gazetteer(self) -> CityGazetteer:
+        """
+        Включает поиск городов по индексу в памяти.
+
+        Индекс загружается один раз на файл базы данных и общий для всех
+        подключений. После включения get_cities отвечает без обращения
+        к SQLite, если индекс поддерживает запрос (см.
+        CityGazetteer.supports).
+
+        Return:
+            CityGazetteer: Загруженный индекс.
+        """
+        self.use_gazetteer = True
+        return CityGazetteer.shared(self.db_path, self.conn)
+
+    @property
+    def gazetteer(self) -> Optional[CityGazetteer]:
+        """
+        Возвращает общий индекс городов, если он включён и загружен.
+
+        Return:
+            Optional[CityGazetteer]: Индекс или None.
+        """
+        if not self.use_gazetteer:
+            return None
+        return CityGazetteer.loaded(self.db_path)
+
+    def __name_prefixes(self, ru_name: str) -> List[str]:
+        """
+        Возвращает варианты написания префикса в разных регистрах.
+
+        Args:
+            ru_name (str): Введённый префикс названия.
+
+        Return:
+            List[str]: Уникальные варианты префикса.
+        """
+        return list(dict.fromkeys([
+            ru_name,
+            ru_name.capitalize(),
+            ru_name.lower(),
+            self.__to_ascii_equivalent(ru_name),
+        ]))
+
     def get_cities(
         self,
         country: Optional[str] = None,
         ru_name: Optional[str] = None,
-        fields: Optional[List[str]] = None
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Tuple]:
         """
         Получает список городов из базы данных
         с возможностью фильтрации и выбора полей.
 
+        Запросы короче MIN_FTS_QUERY_LENGTH ищутся по префиксу
+        через индекс idx_cities_ru_name, более длинные — как подстрока
+        через триграммный индекс cities_fts. Города, название которых
+        начинается с запроса, выдаются раньше остальных.
+
         Args:
             country (Optional[str], optional):
                 Фильтр по стране. По умолчанию None.
@@ -77,10 +418,29 @@ class Database:
                 Фильтр по названию города. По умолчанию None.
             fields (Optional[List[str]], optional):
                 Список полей для выборки. По умолчанию None.
+            limit (Optional[int], optional):
+                Максимальное количество городов. По умолчанию без ограничений.
+            offset (int, optional):
+                Количество пропускаемых городов. По умолчанию 0.
 
         Return:
             List[Tuple]: Список городов, соответствующих критериям.
         """
+        gazetteer = self.gazetteer
+        if gazetteer and not gazetteer.is_current(self.conn):
+            # Города загружены заново, возможно другим процессом:
+            # до перезагрузки индекса ищем в SQLite
+            CityGazetteer.invalidate(self.db_path, gazetteer)
+            gazetteer = None
+        if gazetteer and gazetteer.supports(fields, ru_name):
+            return gazetteer.search(
+                fields,
+                ru_name=ru_name,
+                country=country,
+                limit=limit,
+                offset=offset,
+            )
+
         query = 'SELECT '
 
         if fields:
@@ -89,30 +449,134 @@ class Database:
             query += '*'
 
         query += ' FROM cities WHERE ru_name IS NOT NULL'
-        params = []
+        params: list = []
+        order_params: list = []
+        prefix_order = ''
 
         if country:
             query += ' AND country = ?'
             params.append(country)
 
         if ru_name:
-            query += (
-                ' AND (ru_name COLLATE NOCASE LIKE ? '
-                'OR ru_name COLLATE NOCASE LIKE ?)'
-            )
-            params.extend(
-                [f'%{self.__to_ascii_equivalent(ru_name)}%', f'%{ru_name}%']
-            )
+            prefixes = self.__name_prefixes(ru_name)
 
-        query += '''
+            if len(ru_name) < self.MIN_FTS_QUERY_LENGTH:
+                query += ' AND (' + ' OR '.join(
+                    ['(ru_name >= ? AND ru_name < ?)'] * len(prefixes)
+                ) + ')'
+                for prefix in prefixes:
+                    params.extend([prefix, prefix + '\U0010ffff'])
+            else:
+                query += (
+                    ' AND id IN (SELECT rowid FROM cities_fts'
+                    ' WHERE cities_fts MATCH ?)'
+                )
+                params.append('"' + ru_name.replace('"', '""') + '"')
+
+                prefix_order = (
+                    'CASE WHEN substr(ru_name, 1, ?) IN ('
+                    + ', '.join(['?'] * len(prefixes))
+                    + ') THEN 0 ELSE 1 END,'
+                )
+                order_params = [len(ru_name), *prefixes]
+
+        query += f'''
             ORDER BY favorite DESC,
-                    CASE WHEN country = 'RU' THEN 0 ELSE 1 END,
+                    {prefix_order}
+                    (CASE WHEN country = 'RU' THEN 0 ELSE 1 END),
                     country
         '''
+        params.extend(order_params)
+
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
 
         self.cursor.execute(query, params)
         return self.cursor.fetchall()
 
+    def get_cities_within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        fields: Optional[List[str]] = None
+    ) -> List[Tuple]:
+        """
+        Получает города в пределах радиуса от точки,
+        отсортированные по расстоянию.
+
+        Кандидаты отбираются по индексу cities_rtree в прямоугольнике,
+        покрывающем круг, затем отсеиваются по точному расстоянию.
+
+        Args:
+            lat (float): Широта точки в градусах.
+            lon (float): Долгота точки в градусах.
+            radius_km (float): Радиус поиска в километрах.
+            fields (Optional[List[str]], optional):
+                Список полей для выборки. По умолчанию None.
+
+        Return:
+            List[Tuple]:
+                Города в виде кортежей полей, к которым последним
+                элементом добавлено расстояние до точки в километрах.
+        """
+        columns = (
+            ', '.join(f'c.{field}' for field in fields) if fields else 'c.*'
+        )
+
+        found: List[Tuple] = []
+        for min_lat, max_lat, min_lon, max_lon in bounding_boxes(
+            lat, lon, radius_km
+        ):
+            self.cursor.execute(f'''
+                SELECT c.lat, c.lon, {columns}
+                FROM cities_rtree AS r
+                JOIN cities AS c ON c.id = r.id
+                WHERE r.max_lat >= ? AND r.min_lat <= ?
+                  AND r.max_lon >= ? AND r.min_lon <= ?
+            ''', (min_lat, max_lat, min_lon, max_lon))
+
+            for city_lat, city_lon, *row in self.cursor.fetchall():
+                distance = haversine_km(lat, lon, city_lat, city_lon)
+                if distance <= radius_km:
+                    found.append((*row, distance))
+
+        found.sort(key=lambda row: row[-1])
+        return found
+
+    def get_nearest_cities(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        fields: Optional[List[str]] = None
+    ) -> List[Tuple]:
+        """
+        Получает k ближайших к точке городов.
+
+        Радиус поиска начинается с 25 км и удваивается,
+        пока в нём не окажется k городов.
+
+        Args:
+            lat (float): Широта точки в градусах.
+            lon (float): Долгота точки в градусах.
+            k (int, optional): Количество городов. По умолчанию 10.
+            fields (Optional[List[str]], optional):
+                Список полей для выборки. По умолчанию None.
+
+        Return:
+            List[Tuple]:
+                Города в виде кортежей полей, к которым последним
+                элементом добавлено расстояние до точки в километрах.
+        """
+        radius_km = 25.0
+        while True:
+            found = self.get_cities_within_radius(lat, lon, radius_km, fields)
+            if len(found) >= k or radius_km >= MAX_DISTANCE_KM:
+                return found[:k]
+            radius_km = min(radius_km * 2, MAX_DISTANCE_KM)
+
     def is_city_favorite(self, city_id: int) -> bool:
         """
         Проверяет, является ли город избранным.
@@ -128,6 +592,27 @@ class Database:
         result = self.cursor.fetchone()
         return bool(result and result[0] == 1)
 
+    def get_favorite_cities(
+        self,
+        fields: Optional[List[str]] = None
+    ) -> List[Tuple]:
+        """
+        Получает избранные города.
+
+        Args:
+            fields (Optional[List[str]]):
+                Поля городов в результате. По умолчанию все поля.
+
+        Return:
+            List[Tuple]: Избранные города в порядке названия.
+        """
+        columns = ', '.join(fields) if fields else '*'
+        self.cursor.execute(
+            f'SELECT {columns} FROM cities WHERE favorite = 1 '
+            'ORDER BY ru_name, id'
+        )
+        return self.cursor.fetchall()
+
     def set_setting(self, name: str, value: str) -> None:
         """
         Устанавливает значение для указанной настройки.
@@ -142,7 +627,33 @@ class Database:
             ON CONFLICT(setting_name)
             DO UPDATE SET setting_value=?
         ''', (name, value, value))
-        self.conn.commit()
+        self.commit()
+
+    def set_settings(self, settings: Iterable[Tuple[str, str]]) -> None:
+        """
+        Устанавливает значения нескольких настроек одним запросом.
+
+        Args:
+            settings (Iterable[Tuple[str, str]]):
+                Пары (название, значение).
+        """
+        self.cursor.executemany('''
+            INSERT INTO settings (setting_name, setting_value)
+            VALUES (?, ?)
+            ON CONFLICT(setting_name)
+            DO UPDATE SET setting_value = excluded.setting_value
+        ''', settings)
+        self.commit()
+
+    def get_settings(self) -> Dict[str, Optional[str]]:
+        """
+        Получает все настройки.
+
+        Return:
+            Dict[str, Optional[str]]: Значения настроек по названию.
+        """
+        self.cursor.execute('SELECT setting_name, setting_value FROM settings')
+        return dict(self.cursor.fetchall())
 
     def get_setting(self, name: str) -> Optional[str]:
         """
@@ -161,6 +672,56 @@ class Database:
         result = self.cursor.fetchone()
         return result[0] if result else None
 
+    def upsert_cities(self, cities: Iterable[Tuple]) -> None:
+        """
+        Добавляет города или обновляет сохранённые.
+
+        Отметка избранного сохраняется. Русское название заменяется,
+        только если передано новое.
+
+        Args:
+            cities (Iterable[Tuple]):
+                Строки (id, country, name, ru_name, lat, lon);
+                ru_name может быть None.
+        """
+        self.cursor.executemany('''
+            INSERT INTO cities (id, country, name, ru_name, lat, lon)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                country = excluded.country,
+                name = excluded.name,
+                ru_name = COALESCE(excluded.ru_name, cities.ru_name),
+                lat = excluded.lat,
+                lon = excluded.lon
+        ''', cities)
+        self.__touch_cities()
+        self.commit()
+
+    def set_city_names(self, names: Iterable[Tuple[int, str]]) -> None:
+        """
+        Устанавливает русские названия городов.
+
+        Args:
+            names (Iterable[Tuple[int, str]]): Пары (id, ru_name).
+        """
+        self.cursor.executemany(
+            'UPDATE cities SET ru_name = ?2 WHERE id = ?1', names
+        )
+        self.__touch_cities()
+        self.commit()
+
+    def __touch_cities(self) -> None:
+        """
+        Увеличивает версию списка городов и сбрасывает индекс в памяти.
+
+        Версия хранится в PRAGMA user_version и меняется в той же
+        транзакции, что и города, поэтому устаревший индекс замечают
+        и другие процессы (см. CityGazetteer.is_current).
+        """
+        version = CityGazetteer.cities_version(self.conn)
+        self.cursor.execute(f'PRAGMA user_version = {int(version) + 1}')
+        CityGazetteer.invalidate(self.db_path)
+
     def update_city_favorite(self, city_id: int, is_favorite: bool) -> None:
         """
         Обновляет статус избранного для города.
@@ -175,7 +736,244 @@ class Database:
             WHERE id = ?
         '''
         self.cursor.execute(query, (is_favorite, city_id))
-        self.conn.commit()
+        self.commit()
+
+        gazetteer = CityGazetteer.loaded(self.db_path)
+        if gazetteer:
+            gazetteer.set_favorite(city_id, is_favorite)
+
+    def add_weather_history(
+        self,
+        observations: List[Tuple],
+        forecasts: List[Tuple],
+        last_weather: Iterable[Tuple] = ()
+    ) -> None:
+        """
+        Сохраняет пачку наблюдений и снимков прогноза одной транзакцией.
+
+        Повторно загруженное наблюдение (тот же город и время)
+        заменяет сохранённое. Затронутые периоды отмечаются
+        для rollup_weather_history.
+
+        Args:
+            observations (List[Tuple]):
+                Строки (city_id, ts, temperature, feels_like, pressure,
+                humidity, wind_speed, wind_deg, clouds, icon).
+            forecasts (List[Tuple]):
+                Строки (city_id, ts, fetched_at, temp_min, temp_max,
+                temp_mean, wind_speed, precipitation, description, icon).
+            last_weather (Iterable[Tuple]):
+                Последние данные городов: строки (city_id, kind,
+                fetched_at, payload), где kind — 'weather' или
+                'forecast'. Заменяют ранее сохранённые.
+        """
+        with self.transaction():
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO weather_observations '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                observations
+            )
+            if observations:
+                self.conn.execute('''
+                    INSERT INTO history_meta (name, value)
+                    VALUES ('dirty_ts', ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        value = MIN(value, excluded.value)
+                ''', (min(row[1] for row in observations),))
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO forecast_snapshots '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                forecasts
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO last_weather VALUES (?, ?, ?, ?)',
+                last_weather
+            )
+
+    def get_last_weather(self, city_id: int) -> Dict[str, Tuple[int, str]]:
+        """
+        Возвращает последние сохранённые данные о погоде в городе.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Dict[str, Tuple[int, str]]:
+                (fetched_at, payload) по виду данных
+                ('weather', 'forecast').
+        """
+        self.cursor.execute(
+            'SELECT kind, fetched_at, payload FROM last_weather '
+            'WHERE city_id = ?',
+            (city_id,)
+        )
+        return {
+            kind: (fetched_at, payload)
+            for kind, fetched_at, payload in self.cursor.fetchall()
+        }
+
+    def rollup_weather_history(self) -> None:
+        """
+        Пересчитывает почасовые и посуточные агрегаты наблюдений.
+
+        add_weather_history запоминает самое раннее время записанных
+        с прошлого пересчёта наблюдений (значение dirty_ts таблицы
+        history_meta), поэтому пересчитываются только затронутые часы
+        и дни, включая запоздавшие наблюдения. Границы дней — по UTC.
+        """
+        self.cursor.execute(
+            "SELECT value FROM history_meta WHERE name = 'dirty_ts'"
+        )
+        result = self.cursor.fetchone()
+        if result is None:
+            return
+        dirty = result[0]
+        hourly_from = dirty - dirty % 3600
+        daily_from = dirty - dirty % 86400
+
+        with self.transaction():
+            self.conn.execute('''
+                INSERT OR REPLACE INTO weather_hourly
+                SELECT city_id, ts - ts % 3600, COUNT(*),
+                       MIN(temperature), MAX(temperature), AVG(temperature),
+                       AVG(pressure), AVG(humidity), AVG(wind_speed)
+                FROM weather_observations
+                WHERE ts >= ?
+                GROUP BY city_id, ts - ts % 3600
+            ''', (hourly_from,))
+            self.conn.execute('''
+                INSERT OR REPLACE INTO weather_daily
+                SELECT city_id, ts - ts % 86400, SUM(samples),
+                       MIN(temp_min), MAX(temp_max),
+                       SUM(temp_avg * samples) / SUM(samples),
+                       SUM(pressure * samples) / SUM(samples),
+                       SUM(humidity * samples) / SUM(samples),
+                       SUM(wind_speed * samples) / SUM(samples)
+                FROM weather_hourly
+                WHERE ts >= ?
+                GROUP BY city_id, ts - ts % 86400
+            ''', (daily_from,))
+            # Если за время пересчёта записаны более ранние наблюдения,
+            # отметка останется до следующего пересчёта
+            self.conn.execute(
+                "DELETE FROM history_meta "
+                "WHERE name = 'dirty_ts' AND value = ?",
+                (dirty,)
+            )
+
+    def prune_weather_history(
+        self,
+        now: int,
+        raw_retention: int,
+        hourly_retention: int,
+        forecast_retention: int
+    ) -> None:
+        """
+        Удаляет строки истории старше срока хранения.
+
+        Посуточные агрегаты хранятся бессрочно. Перед удалением
+        наблюдений нужно вызвать rollup_weather_history, чтобы
+        они попали в агрегаты.
+
+        Args:
+            now (int): Текущее время Unix.
+            raw_retention (int): Срок хранения наблюдений в секундах.
+            hourly_retention (int):
+                Срок хранения почасовых агрегатов в секундах.
+            forecast_retention (int):
+                Срок хранения снимков прогноза в секундах.
+        """
+        with self.transaction():
+            self.conn.execute(
+                'DELETE FROM weather_observations WHERE ts < ?',
+                (now - raw_retention,)
+            )
+            self.conn.execute(
+                'DELETE FROM weather_hourly WHERE ts < ?',
+                (now - hourly_retention,)
+            )
+            self.conn.execute(
+                'DELETE FROM forecast_snapshots WHERE fetched_at < ?',
+                (now - forecast_retention,)
+            )
+
+    @classmethod
+    def history_resolution(cls, span: int) -> str:
+        """
+        Выбирает разрешение истории погоды по длине периода.
+
+        Args:
+            span (int): Длина периода в секундах.
+
+        Return:
+            str: 'raw', 'hourly' или 'daily'.
+        """
+        if span <= cls.HISTORY_RAW_SPAN:
+            return 'raw'
+        if span <= cls.HISTORY_HOURLY_SPAN:
+            return 'hourly'
+        return 'daily'
+
+    def get_weather_history(
+        self,
+        city_id: int,
+        start: int,
+        end: int,
+        resolution: Optional[str] = None
+    ) -> List[Tuple]:
+        """
+        Получает историю погоды города за период.
+
+        Если разрешение не указано, оно выбирается по длине периода:
+        наблюдения для периодов до HISTORY_RAW_SPAN, почасовые агрегаты
+        до HISTORY_HOURLY_SPAN, иначе посуточные. Так число читаемых
+        строк ограничено независимо от объёма истории.
+
+        Args:
+            city_id (int): ID города.
+            start (int): Начало периода, время Unix (включительно).
+            end (int): Конец периода, время Unix (не включительно).
+            resolution (Optional[str]): 'raw', 'hourly' или 'daily'.
+
+        Return:
+            List[Tuple]:
+                Строки (ts, temp_min, temp_max, temp_avg, pressure,
+                humidity, wind_speed) в порядке времени. Для наблюдений
+                все три температуры совпадают.
+
+        Exception:
+            ValueError: Если разрешение неизвестно.
+        """
+        if resolution is None:
+            resolution = self.history_resolution(end - start)
+        if resolution not in self.HISTORY_TABLES:
+            raise ValueError(f"Неизвестное разрешение: {resolution}")
+
+        if resolution == 'raw':
+            columns = (
+                'ts, temperature, temperature, temperature, '
+                'pressure, humidity, wind_speed'
+            )
+        else:
+            columns = (
+                'ts, temp_min, temp_max, temp_avg, '
+                'pressure, humidity, wind_speed'
+            )
+        self.cursor.execute(
+            f'SELECT {columns} FROM {self.HISTORY_TABLES[resolution]} '
+            'WHERE city_id = ? AND ts >= ? AND ts < ? ORDER BY ts',
+            (city_id, start, end)
+        )
+        return self.cursor.fetchall()
+
+    def interrupt(self) -> None:
+        """
+        Прерывает выполняющийся запрос.
+
+        Может вызываться из другого потока. Прерванный запрос
+        завершается исключением sqlite3.OperationalError.
+        """
+        self.conn.interrupt()
 
     def close(self) -> None:
         """
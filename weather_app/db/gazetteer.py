@@ -0,0 +1,534 @@
+import codecs
+import heapq
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import (
+    Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+)
+
+
+class CityGazetteer:
+    """
+    Компактный индекс городов в памяти для поиска по мере ввода.
+
+    Загружается один раз из таблицы cities и хранит данные
+    в типизированных массивах, а названия — в общем строковом пуле
+    со смещениями. Для поиска используется второй пул: названия
+    в нижнем регистре в однобайтовой кодировке cp1251 (по байту
+    на символ, смещения совпадают с основным пулом). Отсортированный
+    по названию массив номеров строк служит индексом для поиска
+    по префиксу, подстрока ищется по поисковому пулу.
+
+    Символы названий вне cp1251 (например, китайские названия,
+    попавшие в ru_name при импорте с --name-fallback) записываются
+    в поисковый пул байтом 0x98, которого нет в cp1251: с ними
+    не совпадает ни один запрос. Запросы с такими символами индекс
+    не обрабатывает (см. supports), и get_cities ищет их в SQLite.
+
+    Экземпляр общий для всех подключений к одному файлу базы данных
+    (см. shared), поэтому изменение избранного через любой Database
+    сразу видно в поиске. Индекс помнит версию списка городов
+    (PRAGMA user_version), при которой он загружен: после загрузки
+    городов (в том числе другим процессом) индекс устаревает
+    (см. is_current) и загружается заново.
+
+    Attributes:
+        FIELDS (Tuple[str, ...]): Поля городов, которые хранит индекс.
+        MIN_SUBSTRING_LENGTH (int):
+            Минимальная длина запроса для поиска подстроки;
+            более короткие запросы ищутся по префиксу.
+    """
+
+    FIELDS = ('id', 'ru_name', 'lat', 'lon', 'country', 'favorite')
+    MIN_SUBSTRING_LENGTH = 3
+
+    _SEPARATOR = '\x00'
+    _ENCODING = 'cp1251'
+    # Обработчик ошибок кодирования названий: символ вне cp1251
+    # становится неопределённым в cp1251 байтом 0x98
+    _UNMATCHABLE = 'gazetteer-unmatchable'
+
+    _instances: Dict[str, 'CityGazetteer'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, rows: Iterable[Tuple], version: int = 0):
+        """
+        Строит индекс по строкам (id, ru_name, lat, lon, country, favorite),
+        отсортированным по id.
+
+        Args:
+            rows (Iterable[Tuple]): Строки таблицы cities.
+            version (int): Версия списка городов (см. cities_version).
+        """
+        self._lock = threading.Lock()
+        self.version: int = version
+        self.ids = array('q')
+        self.lat = array('d')
+        self.lon = array('d')
+        self.country_index = array('H')
+        self.favorite = bytearray()
+        self.countries: List[str] = []
+        self._favorite_rows: set = set()
+
+        country_codes: Dict[str, int] = {}
+        names: List[str] = []
+        for city_id, ru_name, lat, lon, country, favorite in rows:
+            self.ids.append(city_id)
+            self.lat.append(lat or 0.0)
+            self.lon.append(lon or 0.0)
+            country = country or ''
+            code = country_codes.get(country)
+            if code is None:
+                code = country_codes[country] = len(self.countries)
+                self.countries.append(country)
+            self.country_index.append(code)
+            if favorite:
+                self._favorite_rows.add(len(self.favorite))
+            self.favorite.append(1 if favorite else 0)
+            names.append(ru_name)
+
+        # Пул названий: название i занимает [offsets[i], offsets[i+1] - 1)
+        self.offsets = array('I', [0])
+        for name in names:
+            self.offsets.append(self.offsets[-1] + len(name) + 1)
+        self.names: str = self._SEPARATOR.join(names) + self._SEPARATOR
+        folded = self.names.lower()
+        if len(folded) != len(self.names):
+            folded = self._SEPARATOR.join(
+                self._fold(name) for name in names
+            ) + self._SEPARATOR
+        # Символы вне cp1251 заменяются на 0x98, длина не меняется
+        self.search_names: bytes = folded.encode(
+            self._ENCODING, self._UNMATCHABLE
+        )
+        del names, folded
+
+        count = len(self.ids)
+        self.by_name = array('I', sorted(range(count), key=self._search_name))
+        self.name_position = array('I', bytes(4 * count))
+        for position, row in enumerate(self.by_name):
+            self.name_position[row] = position
+
+        # Порядок выдачи без учёта избранного: российские города,
+        # затем по стране
+        self.by_rank = array('I', sorted(
+            range(count),
+            key=lambda row: (
+                self.countries[self.country_index[row]] != 'RU',
+                self.countries[self.country_index[row]],
+                self.ids[row],
+            )
+        ))
+        self.rank = array('I', bytes(4 * count))
+        for position, row in enumerate(self.by_rank):
+            self.rank[row] = position
+
+        # Последний поиск подстроки для уточнения при допечатывании
+        self._last_needle: bytes = b''
+        self._last_rows: List[int] = []
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> 'CityGazetteer':
+        """
+        Загружает индекс из таблицы cities.
+
+        Args:
+            conn (sqlite3.Connection): Подключение к базе данных.
+
+        Return:
+            CityGazetteer: Построенный индекс.
+        """
+        version = cls.cities_version(conn)
+        cursor = conn.execute(
+            'SELECT id, ru_name, lat, lon, country, favorite FROM cities '
+            'WHERE ru_name IS NOT NULL ORDER BY id'
+        )
+        return cls(cursor, version)
+
+    @staticmethod
+    def cities_version(conn: sqlite3.Connection) -> int:
+        """
+        Возвращает версию списка городов в базе данных.
+
+        Версия увеличивается при каждой загрузке городов и названий
+        (см. Database.upsert_cities).
+
+        Args:
+            conn (sqlite3.Connection): Подключение к базе данных.
+
+        Return:
+            int: Версия списка городов.
+        """
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+    def is_current(self, conn: sqlite3.Connection) -> bool:
+        """
+        Проверяет, что список городов не менялся после загрузки индекса.
+
+        Args:
+            conn (sqlite3.Connection): Подключение к базе данных.
+
+        Return:
+            bool: True, если индекс соответствует базе данных.
+        """
+        return self.version == self.cities_version(conn)
+
+    @classmethod
+    def shared(
+        cls,
+        db_path: str,
+        conn: sqlite3.Connection
+    ) -> 'CityGazetteer':
+        """
+        Возвращает общий индекс для файла базы данных,
+        загружая его при первом обращении.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            conn (sqlite3.Connection): Подключение для загрузки.
+
+        Return:
+            CityGazetteer: Общий индекс.
+        """
+        with cls._instances_lock:
+            gazetteer = cls._instances.get(db_path)
+            if gazetteer is None:
+                gazetteer = cls._instances[db_path] = (
+                    cls.from_connection(conn)
+                )
+            return gazetteer
+
+    @classmethod
+    def loaded(cls, db_path: str) -> Optional['CityGazetteer']:
+        """
+        Возвращает общий индекс, если он уже загружен.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+
+        Return:
+            Optional[CityGazetteer]: Индекс или None.
+        """
+        return cls._instances.get(db_path)
+
+    @classmethod
+    def invalidate(
+        cls,
+        db_path: str,
+        gazetteer: Optional['CityGazetteer'] = None
+    ) -> None:
+        """
+        Сбрасывает общий индекс, чтобы он был загружен заново.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            gazetteer (Optional[CityGazetteer]):
+                Устаревший индекс. Если передан, сбрасывается только он,
+                а уже загруженный заново индекс остаётся.
+        """
+        with cls._instances_lock:
+            current = cls._instances.get(db_path)
+            if current is not None and gazetteer in (None, current):
+                del cls._instances[db_path]
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество городов в индексе.
+        """
+        return len(self.ids)
+
+    @staticmethod
+    def _fold(name: str) -> str:
+        """
+        Приводит название к нижнему регистру, сохраняя его длину.
+        """
+        folded = name.lower()
+        return folded if len(folded) == len(name) else name
+
+    def _search_name(self, row: int) -> bytes:
+        """
+        Возвращает название города из поискового пула.
+        """
+        return self.search_names[self.offsets[row]:self.offsets[row + 1] - 1]
+
+    def _row_of(self, city_id: int) -> Optional[int]:
+        """
+        Возвращает номер строки города по его ID.
+        """
+        row = bisect_left(self.ids, city_id)
+        if row < len(self.ids) and self.ids[row] == city_id:
+            return row
+        return None
+
+    def _prefix_range(self, prefix: bytes) -> Tuple[int, int]:
+        """
+        Возвращает границы отрезка by_name с названиями,
+        начинающимися с префикса.
+        """
+        def key(row: int) -> bytes:
+            start = self.offsets[row]
+            return self.search_names[start:start + len(prefix)]
+
+        return (
+            bisect_left(self.by_name, prefix, key=key),
+            bisect_right(self.by_name, prefix, key=key),
+        )
+
+    def _substring_rows(self, needle: bytes) -> List[int]:
+        """
+        Возвращает строки, название которых содержит подстроку.
+
+        Если запрос продолжает предыдущий (пользователь допечатал
+        символы), проверяются только совпадения предыдущего запроса.
+        """
+        if self._last_needle and self._last_needle in needle:
+            rows = [
+                row for row in self._last_rows
+                if needle in self._search_name(row)
+            ]
+        else:
+            rows = []
+            pool = self.search_names
+            offsets = self.offsets
+            position = pool.find(needle)
+            while position != -1:
+                row = bisect_right(offsets, position) - 1
+                rows.append(row)
+                position = pool.find(needle, offsets[row + 1])
+
+        self._last_needle, self._last_rows = needle, rows
+        return rows
+
+    def _ranked(
+        self,
+        candidates: Sequence[int],
+        member: Callable[[int], bool],
+        need: Optional[int]
+    ) -> List[int]:
+        """
+        Возвращает первые need строк из кандидатов в порядке выдачи.
+
+        Для больших наборов кандидатов дешевле пройти общий порядок
+        выдачи by_rank до первых need совпадений, для малых —
+        отобрать need лучших среди самих кандидатов.
+
+        Args:
+            candidates (Sequence[int]): Строки-кандидаты.
+            member (Callable[[int], bool]):
+                Проверка, что строка входит в кандидаты и проходит фильтры.
+            need (Optional[int]): Количество строк или None для всех.
+
+        Return:
+            List[int]: Строки в порядке выдачи.
+        """
+        count = len(candidates)
+        if need is not None and need * len(self.ids) < count * count:
+            return list(islice(filter(member, self.by_rank), need))
+
+        rows = filter(member, candidates)
+        if need is None:
+            return sorted(rows, key=self.rank.__getitem__)
+        return heapq.nsmallest(need, rows, key=self.rank.__getitem__)
+
+    def _getter(self, field: str) -> Callable[[int], object]:
+        """
+        Возвращает функцию чтения поля по номеру строки.
+        """
+        getters = {
+            'id': self.ids.__getitem__,
+            'ru_name': lambda row: self.names[
+                self.offsets[row]:self.offsets[row + 1] - 1
+            ],
+            'lat': self.lat.__getitem__,
+            'lon': self.lon.__getitem__,
+            'country': lambda row: self.countries[self.country_index[row]],
+            'favorite': self.favorite.__getitem__,
+        }
+        return getters[field]
+
+    def supports(
+        self,
+        fields: Optional[List[str]],
+        ru_name: Optional[str] = None
+    ) -> bool:
+        """
+        Проверяет, может ли индекс ответить на запрос.
+
+        Args:
+            fields (Optional[List[str]]): Запрашиваемые поля.
+            ru_name (Optional[str]): Фильтр по названию города.
+
+        Return:
+            bool: True, если все поля хранятся в индексе, а запрос
+            записывается в cp1251 без потерь.
+        """
+        if not fields or not all(field in self.FIELDS for field in fields):
+            return False
+        if ru_name:
+            try:
+                ru_name.lower().encode(self._ENCODING)
+            except UnicodeEncodeError:
+                return False
+        return True
+
+    def search(
+        self,
+        fields: List[str],
+        ru_name: Optional[str] = None,
+        country: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Tuple]:
+        """
+        Ищет города так же, как Database.get_cities. Запрос должен
+        поддерживаться индексом (см. supports).
+
+        Порядок выдачи: избранные, затем начинающиеся с запроса,
+        затем российские, затем по стране.
+
+        Args:
+            fields (List[str]): Поля городов в результате.
+            ru_name (Optional[str]): Фильтр по названию города.
+            country (Optional[str]): Фильтр по стране.
+            limit (Optional[int]): Максимальное количество городов.
+            offset (int): Количество пропускаемых городов.
+
+        Return:
+            List[Tuple]: Список городов, соответствующих критериям.
+        """
+        getters = [self._getter(field) for field in fields]
+        need = None if limit is None else offset + limit
+
+        with self._lock:
+            country_code = None
+            if country:
+                if country not in self.countries:
+                    return []
+                country_code = self.countries.index(country)
+
+            def allowed(row: int) -> bool:
+                return (
+                    country_code is None
+                    or self.country_index[row] == country_code
+                )
+
+            needle = ru_name.lower().encode(
+                self._ENCODING, self._UNMATCHABLE
+            ) if ru_name else b''
+
+            def is_prefix(row: int) -> bool:
+                return self.search_names.startswith(needle, self.offsets[row])
+
+            # Группы строк без избранных в порядке выдачи:
+            # (кандидаты, проверка принадлежности)
+            groups: List[Tuple[Sequence[int], Callable[[int], bool]]] = []
+            if not needle:
+                favorites = list(filter(allowed, self._favorite_rows))
+                groups.append((self.by_rank, lambda row: (
+                    not self.favorite[row] and allowed(row)
+                )))
+            elif len(ru_name) < self.MIN_SUBSTRING_LENGTH:
+                start, end = self._prefix_range(needle)
+                favorites = [
+                    row for row in self._favorite_rows
+                    if start <= self.name_position[row] < end
+                    and allowed(row)
+                ]
+                groups.append((self.by_name[start:end], lambda row: (
+                    start <= self.name_position[row] < end
+                    and not self.favorite[row] and allowed(row)
+                )))
+            else:
+                rows = self._substring_rows(needle)
+                favorites = [
+                    row for row in rows
+                    if self.favorite[row] and allowed(row)
+                ]
+                prefixed = set(filter(is_prefix, rows))
+                others = set(rows) - prefixed
+                groups.append((list(prefixed), lambda row: (
+                    row in prefixed and not self.favorite[row]
+                    and allowed(row)
+                )))
+                groups.append((list(others), lambda row: (
+                    row in others and not self.favorite[row]
+                    and allowed(row)
+                )))
+
+            found = sorted(favorites, key=lambda row: (
+                not is_prefix(row), self.rank[row]
+            ))
+            for candidates, member in groups:
+                if need is not None and len(found) >= need:
+                    break
+                found.extend(self._ranked(
+                    candidates,
+                    member,
+                    None if need is None else need - len(found),
+                ))
+
+            found = found[offset:need]
+            return [
+                tuple(getter(row) for getter in getters) for row in found
+            ]
+
+    def set_favorite(self, city_id: int, is_favorite: bool) -> None:
+        """
+        Обновляет признак избранного у города на месте.
+
+        Args:
+            city_id (int): ID города.
+            is_favorite (bool): Новый статус избранного.
+        """
+        with self._lock:
+            row = self._row_of(int(city_id))
+            if row is None:
+                return
+            self.favorite[row] = 1 if is_favorite else 0
+            if is_favorite:
+                self._favorite_rows.add(row)
+            else:
+                self._favorite_rows.discard(row)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Возвращает объём памяти, занимаемой индексом, по частям.
+
+        Return:
+            Dict[str, int]: Размер каждой части в байтах и общий итог.
+        """
+        usage = {
+            'ids': self.ids.itemsize * len(self.ids),
+            'coordinates': (
+                self.lat.itemsize * len(self.lat)
+                + self.lon.itemsize * len(self.lon)
+            ),
+            'countries': (
+                self.country_index.itemsize * len(self.country_index)
+                + sum(sys.getsizeof(code) for code in self.countries)
+            ),
+            'favorite': len(self.favorite),
+            'names': (
+                sys.getsizeof(self.names)
+                + sys.getsizeof(self.search_names)
+                + self.offsets.itemsize * len(self.offsets)
+            ),
+            'indexes': (
+                self.by_name.itemsize * len(self.by_name)
+                + self.name_position.itemsize * len(self.name_position)
+                + self.by_rank.itemsize * len(self.by_rank)
+                + self.rank.itemsize * len(self.rank)
+            ),
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+
+
+codecs.register_error(
+    CityGazetteer._UNMATCHABLE,
+    lambda error: (b'\x98' * (error.end - error.start), error.end),
+)
@@ -0,0 +1,82 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Половина длины экватора: дальше от точки на сфере уйти нельзя
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Вычисляет расстояние между двумя точками по формуле гаверсинусов.
+
+    Args:
+        lat1 (float): Широта первой точки в градусах.
+        lon1 (float): Долгота первой точки в градусах.
+        lat2 (float): Широта второй точки в градусах.
+        lon2 (float): Долгота второй точки в градусах.
+
+    Return:
+        float: Расстояние в километрах.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(
+    lat: float,
+    lon: float,
+    radius_km: float
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Возвращает прямоугольники (min_lat, max_lat, min_lon, max_lon),
+    покрывающие круг заданного радиуса.
+
+    Если круг пересекает линию перемены дат, возвращаются
+    два прямоугольника; если он накрывает полюс — полоса по всем
+    долготам.
+
+    Args:
+        lat (float): Широта центра в градусах.
+        lon (float): Долгота центра в градусах.
+        radius_km (float): Радиус в километрах.
+
+    Return:
+        List[Tuple[float, float, float, float]]: Покрывающие прямоугольники.
+    """
+    d_lat = radius_km / _KM_PER_DEGREE
+    min_lat = max(-90.0, lat - d_lat)
+    max_lat = min(90.0, lat + d_lat)
+
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    # Ширина по долготе на самой дальней от экватора широте круга
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    d_lon = radius_km / (_KM_PER_DEGREE * cos_lat)
+    if d_lon >= 180.0:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    min_lon = lon - d_lon
+    max_lon = lon + d_lon
+    if min_lon < -180.0:
+        return [
+            (min_lat, max_lat, min_lon + 360.0, 180.0),
+            (min_lat, max_lat, -180.0, max_lon),
+        ]
+    if max_lon > 180.0:
+        return [
+            (min_lat, max_lat, min_lon, 180.0),
+            (min_lat, max_lat, -180.0, max_lon - 360.0),
+        ]
+    return [(min_lat, max_lat, min_lon, max_lon)]
@@ -0,0 +1,319 @@
+import atexit
+import dataclasses
+import json
+import sqlite3
+import threading
+import time
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.db.database import Database
+from weather_app.db.service import DatabaseService
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class WeatherHistory:
+    """
+    Фоновая запись истории погоды в базу данных.
+
+    Наблюдения и снимки прогноза копятся в памяти и записываются
+    пачками одной задачей DatabaseService из отдельного потока:
+    по заполнении пачки или раз в flush_interval секунд.
+    Тот же поток раз в maintenance_interval секунд пересчитывает
+    почасовые и посуточные агрегаты и удаляет устаревшие строки.
+
+    Кроме истории сохраняются последние полученные данные каждого
+    города целиком (см. last_known): по ним интерфейс показывает
+    погоду без сети и сразу после запуска.
+
+    Attributes:
+        db_path (str): Путь к файлу базы данных.
+        batch_size (int): Размер пачки, после которого запись идёт сразу.
+        flush_interval (float): Наибольшая задержка записи в секундах.
+        maintenance_interval (float):
+            Период пересчёта агрегатов и очистки в секундах.
+        raw_retention (int): Срок хранения наблюдений в секундах.
+        hourly_retention (int):
+            Срок хранения почасовых агрегатов в секундах.
+        forecast_retention (int):
+            Срок хранения снимков прогноза в секундах.
+    """
+
+    def __init__(
+        self,
+        db_path: str = 'weather_app/db/database.db',
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        maintenance_interval: float = 3600.0,
+        raw_retention: int = 14 * 86400,
+        hourly_retention: int = 400 * 86400,
+        forecast_retention: int = 30 * 86400,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Инициализирует запись истории и запускает её поток.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            batch_size (int): Размер пачки записи.
+            flush_interval (float): Наибольшая задержка записи в секундах.
+            maintenance_interval (float):
+                Период пересчёта агрегатов и очистки в секундах.
+            raw_retention (int): Срок хранения наблюдений в секундах.
+            hourly_retention (int):
+                Срок хранения почасовых агрегатов в секундах.
+            forecast_retention (int):
+                Срок хранения снимков прогноза в секундах.
+            clock (Callable[[], float]): Источник времени Unix.
+        """
+        self.db_path: str = db_path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.maintenance_interval: float = maintenance_interval
+        self.raw_retention: int = raw_retention
+        self.hourly_retention: int = hourly_retention
+        self.forecast_retention: int = forecast_retention
+        self._clock = clock
+        self._service = DatabaseService.shared(db_path)
+
+        self._observations: List[Tuple] = []
+        self._forecasts: List[Tuple] = []
+        self._last: Dict[Tuple[int, str], Tuple] = {}
+        self._condition = threading.Condition()
+        self._writing: bool = False
+        self._flush_requested: bool = False
+        self._closed: bool = False
+        self._written: int = 0
+        self._errors: int = 0
+        self._last_maintenance: Optional[float] = None
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="weather-history",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record_weather(self, weather: CurrentWeather) -> None:
+        """
+        Ставит наблюдение в очередь на запись.
+
+        Args:
+            weather (CurrentWeather): Текущая погода; время наблюдения
+                берётся из weather.dt, а при его отсутствии — текущее.
+        """
+        if weather.city_id is None:
+            return
+        ts = weather.dt if weather.dt is not None else int(self._clock())
+        self._add(self._observations, [(
+            weather.city_id, ts, weather.temperature, weather.feels_like,
+            weather.pressure, weather.humidity, weather.wind_speed,
+            weather.wind_deg, weather.clouds, weather.icon,
+        )], self._last_row(
+            weather.city_id, "weather", dataclasses.asdict(weather)
+        ))
+
+    def record_forecast(
+        self,
+        city_id: int,
+        forecast: List[ForecastDay]
+    ) -> None:
+        """
+        Ставит снимок прогноза в очередь на запись.
+
+        Args:
+            city_id (int): ID города.
+            forecast (List[ForecastDay]): Прогноз по дням.
+        """
+        fetched_at = int(self._clock())
+        self._add(self._forecasts, [
+            (
+                int(city_id), day.dt, fetched_at, day.temp_min,
+                day.temp_max, day.temp_mean, day.wind_speed,
+                day.precipitation, day.description, day.icon,
+            )
+            for day in forecast
+        ], self._last_row(
+            int(city_id), "forecast",
+            [dataclasses.asdict(day) for day in forecast]
+        ))
+
+    def _last_row(self, city_id: int, kind: str, payload: Any) -> Tuple:
+        """
+        Возвращает строку таблицы last_weather для данных города.
+        """
+        return (
+            city_id, kind, int(self._clock()),
+            json.dumps(payload, ensure_ascii=False),
+        )
+
+    def _add(
+        self,
+        pending: List[Tuple],
+        rows: List[Tuple],
+        last: Tuple
+    ) -> None:
+        """
+        Добавляет строки в очередь и будит поток записи,
+        если пачка заполнена. Из последних данных города в очереди
+        остаются только самые новые.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            pending.extend(rows)
+            self._last[last[0], last[1]] = last
+            if (
+                len(self._observations) + len(self._forecasts)
+                >= self.batch_size
+            ):
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Записывает накопленные строки, не дожидаясь flush_interval,
+        и дожидается окончания записи.
+
+        Args:
+            timeout (Optional[float]): Наибольшее время ожидания.
+
+        Return:
+            bool: True, если всё записано.
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not (
+                    self._observations or self._forecasts or self._last
+                    or self._writing
+                ),
+                timeout,
+            )
+
+    def close(self) -> None:
+        """
+        Записывает накопленные строки и останавливает поток.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=10)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает счётчики записи.
+
+        Return:
+            Dict[str, int]: pending — строк в очереди, written —
+            записано строк, errors — неудачных записей.
+        """
+        with self._condition:
+            return {
+                "pending": len(self._observations) + len(self._forecasts),
+                "written": self._written,
+                "errors": self._errors,
+            }
+
+    def last_known(
+        self,
+        city_id: int,
+        database: Database
+    ) -> Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+        """
+        Возвращает последние полученные данные о погоде в городе,
+        в том числе ещё не записанные в базу.
+
+        Args:
+            city_id (int): ID города.
+            database (Database):
+                Подключение к базе данных вызывающего потока.
+
+        Return:
+            Tuple[Optional[CurrentWeather], Optional[List[ForecastDay]]]:
+                Текущая погода и прогноз; None, если данных нет
+                или их не удалось прочитать.
+        """
+        stored = database.get_last_weather(int(city_id))
+        with self._condition:
+            for kind in ("weather", "forecast"):
+                row = self._last.get((int(city_id), kind))
+                if row is not None:
+                    stored[kind] = (row[2], row[3])
+
+        weather = forecast = None
+        try:
+            if "weather" in stored:
+                weather = CurrentWeather(**json.loads(stored["weather"][1]))
+            if "forecast" in stored:
+                forecast = [
+                    ForecastDay(**day)
+                    for day in json.loads(stored["forecast"][1])
+                ]
+        except (TypeError, ValueError) as e:
+            # Данные, сохранённые в другом формате, пропускаются
+            print(f"Ошибка чтения сохранённой погоды: {e}")
+        return weather, forecast
+
+    def _maintain(self, database: Database) -> None:
+        """
+        Пересчитывает агрегаты и удаляет устаревшие строки.
+        """
+        now = int(self._clock())
+        database.rollup_weather_history()
+        database.prune_weather_history(
+            now,
+            self.raw_retention,
+            self.hourly_retention,
+            self.forecast_retention,
+        )
+
+    def _run(self) -> None:
+        """
+        Цикл потока записи.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or self._flush_requested or (
+                        len(self._observations) + len(self._forecasts)
+                        >= self.batch_size
+                    ),
+                    self.flush_interval,
+                )
+                self._flush_requested = False
+                observations, self._observations = self._observations, []
+                forecasts, self._forecasts = self._forecasts, []
+                last, self._last = list(self._last.values()), {}
+                closed = self._closed
+                self._writing = True
+
+            try:
+                if observations or forecasts or last:
+                    self._service.write(
+                        lambda database: database.add_weather_history(
+                            observations, forecasts, last
+                        )
+                    ).result()
+                now = self._clock()
+                if (
+                    self._last_maintenance is None
+                    or now - self._last_maintenance
+                    >= self.maintenance_interval
+                ):
+                    self._last_maintenance = now
+                    self._service.write(self._maintain).result()
+                written, errors = len(observations) + len(forecasts), 0
+            except (sqlite3.Error, RuntimeError) as e:
+                print(f"Ошибка записи истории погоды: {e}")
+                written, errors = 0, 1
+
+            with self._condition:
+                self._written += written
+                self._errors += errors
+                self._writing = False
+                self._condition.notify_all()
+
+            if closed:
+                break
@@ -0,0 +1,344 @@
+"""
+Загрузка списка городов OpenWeatherMap в базу данных.
+
+Файл city.list.json (или city.list.json.gz) со страницы
+https://bulk.openweathermap.org/sample/ — массив записей вида
+{"id": 524901, "name": "Moscow", "country": "RU",
+"coord": {"lon": 37.61, "lat": 55.75}}. В некоторых выгрузках у записи
+есть поле "langs" с названиями на разных языках; русское название
+берётся оттуда. Названия можно дополнить файлом CSV со строками
+«id,название» (--names).
+
+Файл читается потоково, поэтому память не зависит от его размера.
+Избранные города и уже известные русские названия сохраняются.
+Запущенное приложение замечает загрузку по версии списка городов
+и перестраивает индекс поиска в памяти (см. CityGazetteer.is_current).
+
+Запуск:
+    python -m weather_app.db.importer city.list.json.gz [--names ru.csv]
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import re
+import sqlite3
+import sys
+import time
+from weather_app.db.database import Database
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+# Разделители элементов JSON-массива
+DELIMITER = re.compile(r'[,\]]')
+
+
+def open_text(path: str) -> IO[str]:
+    """
+    Открывает текстовый файл в UTF-8, распаковывая gzip по сигнатуре.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Return:
+        IO[str]: Открытый файл.
+    """
+    raw = open(path, 'rb')
+    if raw.peek(2)[:2] == b'\x1f\x8b':
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding='utf-8')
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+def iter_json_array(
+    stream: IO[str],
+    chunk_size: int = 1 << 20,
+    max_item: int = 1 << 24
+) -> Iterator[Any]:
+    """
+    Разбирает JSON-массив верхнего уровня по одному элементу.
+
+    В памяти держится не больше одного блока файла и одного элемента.
+
+    Args:
+        stream (IO[str]): Текстовый поток с JSON-массивом.
+        chunk_size (int): Размер читаемого блока в символах.
+        max_item (int):
+            Наибольший размер одного элемента в символах; защищает
+            от чтения в память всего повреждённого файла.
+
+    Return:
+        Iterator[Any]: Элементы массива.
+
+    Exception:
+        ValueError: Если поток не содержит корректного JSON-массива.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+        return not eof
+
+    def next_char() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not read_more():
+                raise ValueError("Неожиданный конец JSON-массива")
+
+    if next_char() != '[':
+        raise ValueError("Ожидался JSON-массив")
+    position += 1
+    if next_char() == ']':
+        return
+
+    while True:
+        next_char()
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Элемент не поместился в буфер
+            if len(buffer) - position < max_item and read_more():
+                continue
+            raise ValueError("Некорректный элемент JSON-массива")
+        if not eof and DELIMITER.search(buffer, end) is None and read_more():
+            # Число на границе блока могло прочитаться не целиком
+            continue
+        position = end
+        yield item
+
+        separator = next_char()
+        position += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError("Ожидалась запятая в JSON-массиве")
+
+
+def localized_name(record: Dict[str, Any], lang: str) -> Optional[str]:
+    """
+    Возвращает название города на языке lang из поля "langs".
+
+    Поле бывает списком словарей ([{"ru": "Москва"}, ...]) или
+    словарём ({"ru": "Москва"}).
+
+    Args:
+        record (Dict[str, Any]): Запись списка городов.
+        lang (str): Код языка.
+
+    Return:
+        Optional[str]: Название или None.
+    """
+    langs = record.get('langs')
+    if isinstance(langs, dict):
+        langs = [langs]
+    for entry in langs or ():
+        if isinstance(entry, dict) and entry.get(lang):
+            return entry[lang]
+    return None
+
+
+def city_rows(
+    records: Iterator[Dict[str, Any]],
+    lang: str = 'ru',
+    name_fallback: bool = False
+) -> Iterator[Tuple]:
+    """
+    Преобразует записи списка городов в строки таблицы cities.
+
+    Args:
+        records (Iterator[Dict[str, Any]]): Записи списка городов.
+        lang (str): Язык названия для столбца ru_name.
+        name_fallback (bool):
+            Использовать исходное название, если названия на языке
+            lang нет.
+
+    Return:
+        Iterator[Tuple]: Строки (id, country, name, ru_name, lat, lon).
+    """
+    for record in records:
+        coord = record.get('coord') or {}
+        name = record.get('name')
+        ru_name = localized_name(record, lang)
+        if ru_name is None and name_fallback:
+            ru_name = name or None
+        yield (
+            int(record['id']),
+            record.get('country') or None,
+            name,
+            ru_name,
+            coord.get('lat'),
+            coord.get('lon'),
+        )
+
+
+def name_rows(path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Читает названия городов из CSV со строками «id,название».
+
+    Строки, у которых первое поле не число (например, заголовок),
+    пропускаются.
+
+    Args:
+        path (str): Путь к файлу, возможно сжатому gzip.
+
+    Return:
+        Iterator[Tuple[int, str]]: Пары (id, название).
+    """
+    with open_text(path) as stream:
+        for row in csv.reader(stream):
+            if len(row) >= 2 and row[0].strip().isdigit() and row[1]:
+                yield int(row[0]), row[1].strip()
+
+
+def batched(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """
+    Делит поток строк на пачки.
+
+    Args:
+        rows (Iterator[Tuple]): Строки.
+        size (int): Размер пачки.
+
+    Return:
+        Iterator[List[Tuple]]: Пачки строк.
+    """
+    batch: List[Tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_cities(
+    db_path: str,
+    city_list_path: str,
+    names_path: Optional[str] = None,
+    lang: str = 'ru',
+    name_fallback: bool = False,
+    batch_size: int = 10_000,
+    transaction_rows: int = 200_000,
+) -> Dict[str, int]:
+    """
+    Загружает список городов в базу данных.
+
+    Индексы и триггеры таблицы cities на время загрузки удаляются,
+    строки вставляются пачками через executemany в крупных
+    транзакциях, затем индексы строятся заново одним проходом.
+    Индексы восстанавливаются и при ошибке загрузки.
+
+    Приложение на время загрузки лучше закрыть: поиск городов без
+    индексов работает медленно.
+
+    Args:
+        db_path (str): Путь к файлу базы данных.
+        city_list_path (str): Путь к city.list.json или .json.gz.
+        names_path (Optional[str]):
+            CSV с русскими названиями «id,название». Названия из него
+            заменяют названия из списка городов.
+        lang (str): Язык названия из поля "langs" для столбца ru_name.
+        name_fallback (bool):
+            Использовать исходное название, если русского нет.
+        batch_size (int): Строк в одном вызове executemany.
+        transaction_rows (int): Строк в одной транзакции.
+
+    Return:
+        Dict[str, int]: cities — загружено городов, names — применено
+        названий из names_path, named — городов с русским названием.
+
+    Exception:
+        ValueError: Если файл не является JSON-массивом городов.
+    """
+    conn = sqlite3.connect(db_path)
+    database = Database(db_path, conn, autocommit=False)
+    database.create_tables()
+    stats = {'cities': 0, 'names': 0, 'named': 0}
+    try:
+        conn.execute('PRAGMA cache_size = -65536')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        database.drop_city_indexes()
+
+        pending = 0
+        with open_text(city_list_path) as stream:
+            rows = city_rows(iter_json_array(stream), lang, name_fallback)
+            for batch in batched(rows, batch_size):
+                database.upsert_cities(batch)
+                stats['cities'] += len(batch)
+                pending += len(batch)
+                if pending >= transaction_rows:
+                    conn.commit()
+                    pending = 0
+        conn.commit()
+
+        if names_path:
+            for batch in batched(name_rows(names_path), batch_size):
+                database.set_city_names(batch)
+                stats['names'] += len(batch)
+            conn.commit()
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        database.create_search_index()
+        database.create_spatial_index()
+        conn.commit()
+        conn.execute('PRAGMA optimize')
+        database.cursor.execute(
+            'SELECT COUNT(*) FROM cities WHERE ru_name IS NOT NULL'
+        )
+        stats['named'] = database.cursor.fetchone()[0]
+        database.close()
+    return stats
+
+
+def main() -> None:
+    """
+    Точка входа загрузки списка городов.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('city_list', help='city.list.json или .json.gz')
+    parser.add_argument('--db', default='weather_app/db/database.db')
+    parser.add_argument('--names', help='CSV «id,название»')
+    parser.add_argument('--lang', default='ru')
+    parser.add_argument(
+        '--name-fallback',
+        action='store_true',
+        help='использовать исходное название, если русского нет',
+    )
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    try:
+        stats = import_cities(
+            args.db,
+            args.city_list,
+            names_path=args.names,
+            lang=args.lang,
+            name_fallback=args.name_fallback,
+        )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Ошибка загрузки списка городов: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"Загружено городов: {stats['cities']}, названий из файла: "
+        f"{stats['names']}, с русским названием: {stats['named']} "
+        f"за {time.perf_counter() - began:.1f} с"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+import atexit
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from weather_app.db.database import Database
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class DatabaseService:
+    """
+    Общий доступ к базе данных из любых потоков.
+
+    База переводится в режим WAL, поэтому чтение не блокируется
+    записью. Чтение идёт через пул подключений только для чтения
+    (см. reader), а все изменения — через очередь единственного
+    потока записи (см. write). Поток записи выполняет накопившиеся
+    в очереди задачи одной транзакцией (групповая фиксация), каждую
+    в своей точке сохранения: ошибка одной задачи не отменяет
+    остальные.
+
+    Подключения живут долго, поэтому кэш подготовленных выражений
+    sqlite3 (cached_statements) переиспользуется между запросами,
+    а схема создаётся один раз при запуске службы.
+
+    Attributes:
+        db_path (str): Путь к файлу базы данных.
+        max_readers (int): Наибольшее число подключений для чтения.
+        max_batch (int): Наибольшее число задач в одной транзакции.
+    """
+
+    _instances: Dict[str, 'DatabaseService'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str = 'weather_app/db/database.db',
+        max_readers: int = 4,
+        max_batch: int = 256,
+        busy_timeout: float = 5.0,
+        cached_statements: int = 256,
+    ):
+        """
+        Создаёт схему, включает WAL и запускает поток записи.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            max_readers (int): Размер пула подключений для чтения.
+            max_batch (int): Наибольшее число задач в транзакции.
+            busy_timeout (float):
+                Сколько секунд ждать освобождения заблокированной базы.
+            cached_statements (int):
+                Размер кэша подготовленных выражений подключения.
+        """
+        self.db_path: str = db_path
+        self.max_readers: int = max(1, max_readers)
+        self.max_batch: int = max(1, max_batch)
+        self._busy_timeout = busy_timeout
+        self._cached_statements = cached_statements
+
+        connection = self._connect()
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        self._writer = Database(db_path, connection, autocommit=False)
+        self._writer.create_tables()
+
+        self._readers: "queue.LifoQueue[Database]" = queue.LifoQueue()
+        self._opened_readers: int = 0
+        self._lock = threading.Lock()
+
+        self._tasks: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._closed: bool = False
+        self._batches: int = 0
+        self._writes: int = 0
+        self._largest_batch: int = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="database-writer",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def shared(
+        cls,
+        db_path: str = 'weather_app/db/database.db'
+    ) -> 'DatabaseService':
+        """
+        Возвращает общую службу для файла базы данных,
+        создавая её при первом обращении.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+
+        Return:
+            DatabaseService: Служба базы данных.
+        """
+        with cls._instances_lock:
+            service = cls._instances.get(db_path)
+            if service is None or service._closed:
+                service = cls._instances[db_path] = cls(db_path)
+            return service
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открывает подключение, которое можно передавать между потоками.
+        """
+        return sqlite3.connect(
+            self.db_path,
+            timeout=self._busy_timeout,
+            check_same_thread=False,
+            cached_statements=self._cached_statements,
+        )
+
+    def _acquire_reader(self) -> Database:
+        """
+        Берёт подключение для чтения из пула или открывает новое,
+        если пул ещё не заполнен; иначе ждёт освобождения.
+        """
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened_readers < self.max_readers
+            if can_open:
+                self._opened_readers += 1
+        if not can_open:
+            return self._readers.get()
+
+        connection = self._connect()
+        connection.execute('PRAGMA query_only = ON')
+        return Database(self.db_path, connection)
+
+    @contextmanager
+    def reader(self) -> Iterator[Database]:
+        """
+        Выдаёт подключение для чтения на время блока with.
+
+        Подключение нельзя использовать после выхода из блока
+        и для изменения данных.
+
+        Return:
+            Iterator[Database]: Подключение только для чтения.
+        """
+        if self._closed:
+            raise RuntimeError("База данных закрыта")
+        database = self._acquire_reader()
+        try:
+            yield database
+        finally:
+            if database.conn.in_transaction:
+                database.conn.rollback()
+            self._readers.put(database)
+
+    def write(self, task: Callable[[Database], T]) -> "Future[T]":
+        """
+        Ставит изменение в очередь потока записи.
+
+        Args:
+            task (Callable[[Database], T]):
+                Выполняет изменение через переданное подключение.
+                Не должна фиксировать транзакцию сама.
+
+        Return:
+            Future[T]: Результат task; завершается после фиксации
+            транзакции, в которую вошла задача.
+
+        Exception:
+            RuntimeError: Если служба закрыта.
+        """
+        future: "Future[T]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("База данных закрыта")
+            self._tasks.put((task, future))
+        return future
+
+    def _run(self) -> None:
+        """
+        Цикл потока записи.
+        """
+        conn = self._writer.conn
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                break
+            batch: List[Tuple] = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._execute(conn, batch)
+            if stop:
+                break
+        self._writer.close()
+
+    def _execute(self, conn: sqlite3.Connection, batch: List[Tuple]) -> None:
+        """
+        Выполняет пачку задач одной транзакцией.
+        """
+        outcomes: List[Tuple[Future, bool, object]] = []
+        try:
+            conn.execute('BEGIN')
+            for task, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute('SAVEPOINT task')
+                try:
+                    result = task(self._writer)
+                except Exception as e:
+                    conn.execute('ROLLBACK TO task')
+                    conn.execute('RELEASE task')
+                    outcomes.append((future, False, e))
+                else:
+                    conn.execute('RELEASE task')
+                    outcomes.append((future, True, result))
+            conn.commit()
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for _, future in batch:
+                if future.done():
+                    continue
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._writes += len(outcomes)
+        self._largest_batch = max(self._largest_batch, len(batch))
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает счётчики службы.
+
+        Return:
+            Dict[str, int]: batches — зафиксировано транзакций,
+            writes — выполнено задач записи, largest_batch — наибольшая
+            пачка, queued — задач в очереди, readers — открыто
+            подключений для чтения.
+        """
+        return {
+            "batches": self._batches,
+            "writes": self._writes,
+            "largest_batch": self._largest_batch,
+            "queued": self._tasks.qsize(),
+            "readers": self._opened_readers,
+        }
+
+    def close(self) -> None:
+        """
+        Выполняет задачи из очереди, останавливает поток записи
+        и закрывает подключения.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._tasks.put(None)
+        self._thread.join(timeout=10)
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,187 @@
+import atexit
+import threading
+from concurrent.futures import Future
+from weather_app.db.service import DatabaseService
+from typing import Callable, Dict, List, Optional
+
+
+class Settings:
+    """
+    Настройки приложения в памяти с отложенной записью в базу.
+
+    При создании все строки таблицы settings читаются одним запросом,
+    после чего get не обращается к базе. set сразу меняет значение
+    в памяти и оповещает подписчиков, а в базу изменения попадают
+    через flush_delay секунд одной задачей DatabaseService: частые
+    изменения одной настройки (например, LAST_SITY_ID при переборе
+    городов) дают одну запись с последним значением.
+
+    Значения хранятся строками, как в таблице settings.
+
+    Attributes:
+        service (DatabaseService): Служба базы данных.
+        flush_delay (float): Задержка записи изменений в секундах.
+    """
+
+    _instances: Dict[str, 'Settings'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, service: DatabaseService, flush_delay: float = 1.0):
+        """
+        Загружает все настройки из базы данных.
+
+        Args:
+            service (DatabaseService): Служба базы данных.
+            flush_delay (float): Задержка записи изменений в секундах.
+        """
+        self.service: DatabaseService = service
+        self.flush_delay: float = flush_delay
+        with service.reader() as database:
+            self._values: Dict[str, Optional[str]] = database.get_settings()
+        self._dirty: Dict[str, str] = {}
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._writing: Optional["Future[None]"] = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @classmethod
+    def shared(cls, db_path: str = 'weather_app/db/database.db') -> 'Settings':
+        """
+        Возвращает общие настройки для файла базы данных,
+        загружая их при первом обращении.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+
+        Return:
+            Settings: Настройки приложения.
+        """
+        with cls._instances_lock:
+            settings = cls._instances.get(db_path)
+            if settings is None:
+                settings = cls._instances[db_path] = cls(
+                    DatabaseService.shared(db_path)
+                )
+            return settings
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Возвращает значение настройки из памяти.
+
+        Args:
+            name (str): Название настройки.
+            default (Optional[str]): Значение, если настройки нет.
+
+        Return:
+            Optional[str]: Значение настройки.
+        """
+        value = self._values.get(name)
+        return default if value is None else value
+
+    def set(self, name: str, value: object) -> None:
+        """
+        Меняет значение настройки и оповещает подписчиков.
+
+        Подписчики вызываются в текущем потоке, только если значение
+        изменилось. Запись в базу откладывается (см. flush).
+
+        Args:
+            name (str): Название настройки.
+            value (object): Новое значение; сохраняется строкой.
+        """
+        value = str(value)
+        with self._lock:
+            if self._values.get(name) == value:
+                return
+            self._values[name] = value
+            self._dirty[name] = value
+            subscribers = list(self._subscribers.get(name, ()))
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        for callback in subscribers:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"Ошибка обработчика настройки {name}: {e}")
+
+    def subscribe(self, name: str, callback: Callable[[str], None]) -> None:
+        """
+        Подписывает на изменения настройки.
+
+        Args:
+            name (str): Название настройки.
+            callback (Callable[[str], None]):
+                Получает новое значение; вызывается в потоке,
+                изменившем настройку.
+        """
+        with self._lock:
+            self._subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name: str, callback: Callable[[str], None]) -> None:
+        """
+        Отменяет подписку на изменения настройки.
+
+        Args:
+            name (str): Название настройки.
+            callback (Callable[[str], None]): Ранее подписанный обработчик.
+        """
+        with self._lock:
+            callbacks = self._subscribers.get(name, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def flush(self) -> "Future[None]":
+        """
+        Записывает накопленные изменения в базу сейчас.
+
+        Если записать изменения не удалось, они остаются
+        несохранёнными и записываются следующим flush.
+
+        Return:
+            Future[None]: Завершается после фиксации транзакции или
+            с исключением, если записать изменения не удалось. Если
+            записывать нечего, возвращается последняя запись (она
+            может ещё выполняться, например, по таймеру в другом
+            потоке) или уже завершённый Future.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                if self._writing is not None:
+                    return self._writing
+                done: "Future[None]" = Future()
+                done.set_result(None)
+                return done
+
+            rows = list(dirty.items())
+            try:
+                future = self.service.write(
+                    lambda database: database.set_settings(rows)
+                )
+            except RuntimeError as e:
+                future = Future()
+                future.set_exception(e)
+            self._writing = future
+
+        future.add_done_callback(lambda done: self._written(done, dirty))
+        return future
+
+    def _written(self, future: "Future[None]", dirty: Dict[str, str]) -> None:
+        """
+        Возвращает в несохранённые изменения, которые не удалось
+        записать, если с тех пор они не были заменены новыми.
+        """
+        error = future.exception()
+        if error is None:
+            return
+        print(f"Ошибка сохранения настроек: {error}")
+        with self._lock:
+            for name, value in dirty.items():
+                self._dirty.setdefault(name, value)
@@ -1,8 +1,12 @@
 import sys
+# Импортируется первым: с него начинается отсчёт времени запуска
+from weather_app.startup import startup_timer
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
 from weather_app.ui.main_window import MainWindow
 
+startup_timer.mark("импорт модулей")
+
 
 def main() -> None:
     """
@@ -12,13 +16,19 @@ def main() -> None:
         1. Создаёт экземпляр QApplication.
         2. Устанавливает иконку приложения.
         3. Инициализирует и отображает главное окно приложения.
+           Страницы создаются после первой отрисовки окна.
         4. Запускает главный цикл событий.
 
+    При WEATHER_APP_STARTUP_REPORT=1 в stderr выводится время
+    запуска по этапам (см. weather_app.startup).
+
     Return:
         None
     """
     # Создаем экземпляр приложения
     app = QApplication(sys.argv)
+    startup_timer.mark("QApplication")
+    startup_timer.expect("главная страница", "список городов", "погода")
 
     # Устанавливаем иконку приложения
     app.setWindowIcon(QIcon("weather_app/ui/icons/ui/Home.png"))
@@ -27,6 +37,7 @@ def main() -> None:
     window = MainWindow()
     window.resize(1500, 900)
     window.show()
+    startup_timer.mark("создание окна")
 
     # Запускаем главный цикл приложения
     sys.exit(app.exec_())
@@ -0,0 +1,610 @@
+"""
+Локальный HTTP-сервер с данными о погоде для других программ.
+
+Отдаёт поиск городов по базе приложения и погоду через общий кэш
+WeatherService, поэтому несколько программ на одной машине делают
+к OpenWeatherMap не больше запросов, чем одна.
+
+Методы (ответы в JSON):
+    GET /cities?q=Моск&country=RU&limit=20&offset=0
+    GET /weather/<id города>
+    GET /forecast/<id города>
+    GET /metrics
+    GET /health
+
+Одинаковые одновременные запросы объединяются в один вызов API.
+Ответы содержат ETag (на If-None-Match сервер отвечает 304) и
+Cache-Control со временем, оставшимся до устаревания данных в кэше.
+
+Запуск:
+    python -m weather_app.server [--host 127.0.0.1] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import collections
+import dataclasses
+import hashlib
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+from weather_app.api.service import (
+    API_KEY_ENV,
+    DEFAULT_DB_PATH,
+    WeatherService,
+)
+from weather_app.api.weather_api import redact
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+# Элемент списка If-None-Match: «*» или тег, возможно слабый (W/"...")
+_ETAG_RE = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+class HttpError(Exception):
+    """
+    Ошибка запроса, которая отдаётся клиенту с кодом status.
+
+    Attributes:
+        status (int): HTTP-код ответа.
+    """
+
+    def __init__(self, status: int, message: str):
+        """
+        Args:
+            status (int): HTTP-код ответа.
+            message (str): Описание ошибки для клиента.
+        """
+        super().__init__(message)
+        self.status: int = status
+
+
+class ServerMetrics:
+    """
+    Счётчики запросов сервера.
+
+    Частота запросов считается по скользящему окну в window секунд.
+    Используется только из потока цикла событий.
+
+    Attributes:
+        window (float): Окно расчёта частоты запросов в секундах.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            window (float): Окно расчёта частоты запросов в секундах.
+            clock (Callable[[], float]): Источник времени.
+        """
+        self.window: float = window
+        self._clock = clock
+        self._started: float = clock()
+        self._recent: Deque[float] = collections.deque()
+        self._requests: int = 0
+        self._routes: Dict[str, int] = collections.Counter()
+        self._statuses: Dict[int, int] = collections.Counter()
+        self._latency: Dict[str, float] = collections.Counter()
+        self.upstream_calls: int = 0
+        self.coalesced: int = 0
+
+    def _trim(self, now: float) -> None:
+        """
+        Убирает из окна запросы старше window секунд.
+        """
+        while self._recent and now - self._recent[0] > self.window:
+            self._recent.popleft()
+
+    def record(self, route: str, status: int, elapsed: float) -> None:
+        """
+        Учитывает обработанный запрос.
+
+        Args:
+            route (str): Метод сервера, например '/weather'.
+            status (int): HTTP-код ответа.
+            elapsed (float): Время обработки в секундах.
+        """
+        now = self._clock()
+        self._recent.append(now)
+        self._trim(now)
+        self._requests += 1
+        self._routes[route] += 1
+        self._statuses[status] += 1
+        self._latency[route] += elapsed
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает счётчики.
+
+        Return:
+            Dict[str, Any]: requests — всего запросов, requests_per_second
+            — частота за окно, by_route и by_status — запросы по методам
+            и кодам ответа, avg_latency_ms — среднее время обработки по
+            методам, upstream_calls — вызовов кэша и API, coalesced —
+            запросов, дождавшихся уже идущего вызова.
+        """
+        now = self._clock()
+        self._trim(now)
+        span = min(self.window, max(now - self._started, 1e-9))
+        return {
+            "uptime": round(now - self._started, 3),
+            "requests": self._requests,
+            "requests_per_second": round(len(self._recent) / span, 3),
+            "by_route": dict(self._routes),
+            "by_status": {str(k): v for k, v in self._statuses.items()},
+            "avg_latency_ms": {
+                route: round(self._latency[route] / count * 1000, 3)
+                for route, count in self._routes.items()
+            },
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+        }
+
+
+class WeatherServer:
+    """
+    HTTP/1.1-сервер на asyncio поверх WeatherService.
+
+    Цикл событий только разбирает запросы и пишет ответы; обращения
+    к базе данных и API выполняются в пуле потоков. Одинаковые
+    запросы, пришедшие, пока первый ещё выполняется, ждут его
+    результата вместо собственного вызова.
+
+    Attributes:
+        service (WeatherService): Ядро приложения.
+        host (str): Адрес, на котором слушает сервер.
+        port (int): Порт сервера; 0 — выбирается свободный.
+        metrics (ServerMetrics): Счётчики запросов.
+    """
+
+    # Наибольший размер строки запроса и заголовков
+    MAX_LINE = 8192
+    MAX_HEADERS = 100
+
+    # Сколько секунд ждать следующего запроса в keep-alive соединении
+    KEEP_ALIVE = 15.0
+
+    # Время жизни ответа со списком городов в секундах
+    CITIES_MAX_AGE = 300
+
+    def __init__(
+        self,
+        service: WeatherService,
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            service (WeatherService): Ядро приложения.
+            host (str): Адрес, на котором слушает сервер.
+            port (int): Порт сервера; 0 — выбирается свободный.
+            max_workers (int):
+                Размер пула потоков для обращений к базе и API.
+        """
+        self.service: WeatherService = service
+        self.host: str = host
+        self.port: int = port
+        self.metrics: ServerMetrics = ServerMetrics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='weather-server'
+        )
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._closing: bool = False
+
+    async def start(self) -> None:
+        """
+        Начинает принимать соединения. Если port равен 0, после
+        запуска в нём оказывается выбранный порт.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            limit=self.MAX_LINE,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """
+        Запускает сервер и обслуживает запросы до вызова close.
+        После close ждёт закрытия открытых соединений.
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            if not self._closing:
+                raise
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def close(self) -> None:
+        """
+        Перестаёт принимать соединения, закрывает открытые
+        и останавливает пул потоков. Вызывается из потока цикла
+        событий.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for writer in self._connections.values():
+            writer.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _coalesced(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        Выполняет call в пуле потоков; одновременные вызовы с тем же
+        ключом получают результат первого.
+
+        Args:
+            key (Hashable): Ключ запроса, например ('weather', 524901).
+            call (Callable[[], Any]): Блокирующий вызов.
+
+        Return:
+            Any: Результат call.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.metrics.upstream_calls += 1
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, call
+        )
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    @staticmethod
+    def _city_id(value: str) -> int:
+        """
+        Разбирает ID города из пути.
+
+        Exception:
+            HttpError: Если ID не число.
+        """
+        if not value.isdigit():
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Некорректный ID города')
+        return int(value)
+
+    @staticmethod
+    def _int_param(params: Dict[str, str], name: str, default: int) -> int:
+        """
+        Разбирает неотрицательный целый параметр запроса.
+
+        Exception:
+            HttpError: Если параметр не число.
+        """
+        value = params.get(name)
+        if value is None:
+            return default
+        if not value.isdigit():
+            raise HttpError(
+                HTTPStatus.BAD_REQUEST, f'Некорректный параметр {name}'
+            )
+        return int(value)
+
+    @staticmethod
+    def _etag_matches(header: str, etag: str) -> bool:
+        """
+        Проверяет, совпадает ли ETag ответа с одним из тегов
+        заголовка If-None-Match.
+
+        Теги сравниваются целиком и без учёта признака слабого тега
+        W/, как требует RFC 9110 для If-None-Match; «*» совпадает
+        с любым тегом.
+        """
+        for tag in _ETAG_RE.findall(header):
+            if tag == '*' or tag.removeprefix('W/') == etag:
+                return True
+        return False
+
+    def _max_age(self, kind: str, city_id: int) -> int:
+        """
+        Возвращает, сколько секунд данные города ещё свежие в кэше.
+        """
+        api = self.service.api
+        ttl = api.weather_ttl if kind == 'weather' else api.forecast_ttl
+        age = api.cache.age((kind, city_id))
+        return 0 if age is None else max(0, int(ttl - age))
+
+    async def _route(
+        self,
+        path: str,
+        params: Dict[str, str]
+    ) -> Tuple[str, Any, int]:
+        """
+        Выполняет запрос к методу сервера.
+
+        Args:
+            path (str): Путь запроса.
+            params (Dict[str, str]): Параметры запроса.
+
+        Return:
+            Tuple[str, Any, int]: Метод сервера, данные ответа и
+            время жизни ответа в секундах.
+
+        Exception:
+            HttpError: Если запрос некорректен или данные не получены.
+        """
+        parts = [part for part in path.split('/') if part]
+        route = '/' + parts[0] if parts else '/'
+
+        if route == '/cities' and len(parts) == 1:
+            query = params.get('q', '')
+            country = params.get('country') or None
+            limit = min(self._int_param(params, 'limit', 20), 1000)
+            offset = self._int_param(params, 'offset', 0)
+            fields = self.service.CITY_FIELDS
+            rows = await self._coalesced(
+                ('cities', query, country, limit, offset),
+                lambda: self.service.search_cities(
+                    query, limit=limit, offset=offset, country=country
+                ),
+            )
+            return route, [dict(zip(fields, row)) for row in rows], (
+                self.CITIES_MAX_AGE
+            )
+
+        if route in ('/weather', '/forecast') and len(parts) == 2:
+            kind = route[1:]
+            city_id = self._city_id(parts[1])
+            api = self.service.api
+            fetch = (
+                api.fetch_weather_by_city_id if kind == 'weather'
+                else api.fetch_forecast_by_city_id
+            )
+            try:
+                data = await self._coalesced(
+                    (kind, city_id), lambda: fetch(city_id)
+                )
+            except RuntimeError as e:
+                # Подробности — только в журнал сервера: клиенту не нужны
+                # сведения о запросах к OpenWeatherMap
+                print(f'Ошибка получения {kind} для города {city_id}: '
+                      f'{redact(str(e))}', file=sys.stderr)
+                raise HttpError(
+                    HTTPStatus.BAD_GATEWAY,
+                    'Не удалось получить данные от OpenWeatherMap',
+                )
+            if isinstance(data, list):
+                body: Any = [dataclasses.asdict(day) for day in data]
+            else:
+                body = dataclasses.asdict(data)
+            return route, body, self._max_age(kind, city_id)
+
+        if route == '/metrics' and len(parts) == 1:
+            body = self.metrics.snapshot()
+            body['cache'] = self.service.api.cache.stats()
+            body['in_flight'] = len(self._in_flight)
+            return route, body, 0
+
+        if route == '/health' and len(parts) == 1:
+            return route, {'status': 'ok'}, 0
+
+        raise HttpError(HTTPStatus.NOT_FOUND, 'Метод не найден')
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+        """
+        Читает строку запроса и заголовки.
+
+        Return:
+            Optional[Tuple[str, str, str, Dict[str, str]]]:
+                Метод, цель, версия протокола и заголовки (с ключами
+                в нижнем регистре) или None, если клиент закрыл
+                соединение.
+
+        Exception:
+            HttpError: Если запрос некорректен.
+        """
+        line = await asyncio.wait_for(reader.readline(), self.KEEP_ALIVE)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Некорректный запрос')
+
+        headers: Dict[str, str] = {}
+        for _ in range(self.MAX_HEADERS + 1):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return method, target, version, headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise HttpError(
+            HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, 'Много заголовков'
+        )
+
+    async def _respond(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str]
+    ) -> Tuple[str, int, Dict[str, str], bytes]:
+        """
+        Формирует ответ на запрос.
+
+        Return:
+            Tuple[str, int, Dict[str, str], bytes]: Метод сервера,
+            HTTP-код, заголовки и тело ответа.
+        """
+        route = '?'
+        try:
+            if method not in ('GET', 'HEAD'):
+                raise HttpError(
+                    HTTPStatus.METHOD_NOT_ALLOWED, 'Поддерживается только GET'
+                )
+            url = urlsplit(target)
+            params = {
+                name: values[-1]
+                for name, values in parse_qs(url.query).items()
+            }
+            route, data, max_age = await self._route(unquote(url.path), params)
+            status = HTTPStatus.OK
+        except HttpError as e:
+            status, data, max_age = e.status, {'error': str(e)}, 0
+        except Exception as e:
+            print(f'Ошибка обработки {method} {target}: {redact(str(e))}',
+                  file=sys.stderr)
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            data, max_age = {'error': 'Внутренняя ошибка сервера'}, 0
+
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        response_headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Cache-Control': (
+                f'public, max-age={max_age}' if status == HTTPStatus.OK
+                else 'no-store'
+            ),
+        }
+        if status == HTTPStatus.OK and route not in ('/metrics', '/health'):
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            response_headers['ETag'] = etag
+            if self._etag_matches(headers.get('if-none-match', ''), etag):
+                return route, HTTPStatus.NOT_MODIFIED, response_headers, b''
+        return route, status, response_headers, body
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Обслуживает запросы одного соединения (с keep-alive).
+        """
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                began = time.perf_counter()
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    self._write(writer, e.status, {}, str(e).encode(), False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = (
+                    headers.get('connection', '').lower() != 'close'
+                    and version == 'HTTP/1.1'
+                )
+
+                route, status, response_headers, body = await self._respond(
+                    method, target, headers
+                )
+                self._write(
+                    writer, status, response_headers,
+                    b'' if method == 'HEAD' else body, keep_alive,
+                    len(body),
+                )
+                await writer.drain()
+                self.metrics.record(
+                    route, status, time.perf_counter() - began
+                )
+                if not keep_alive:
+                    break
+        except (
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ValueError,
+            ConnectionError,
+        ):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        keep_alive: bool,
+        length: Optional[int] = None
+    ) -> None:
+        """
+        Записывает ответ в соединение.
+        """
+        status = HTTPStatus(status)
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+        headers = dict(headers)
+        if status != HTTPStatus.NOT_MODIFIED:
+            headers['Content-Length'] = str(
+                len(body) if length is None else length
+            )
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(
+            ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+        )
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Точка входа HTTP-сервера.
+
+    Args:
+        argv (Optional[list]): Аргументы; по умолчанию sys.argv.
+
+    Return:
+        int: Код выхода.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m weather_app.server',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--api-key', help=f'API-ключ (или ${API_KEY_ENV})')
+    args = parser.parse_args(argv)
+
+    service = WeatherService(
+        args.db, prefetch_icons=False, api_key=args.api_key
+    )
+    server = WeatherServer(
+        service, args.host, args.port, max_workers=args.workers
+    )
+
+    async def run() -> None:
+        await server.start()
+        print(f'Сервер погоды: http://{server.host}:{server.port}/',
+              file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f'Ошибка запуска сервера: {e}', file=sys.stderr)
+        return 2
+    finally:
+        server.close()
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
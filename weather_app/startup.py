@@ -0,0 +1,119 @@
+"""Замер времени запуска приложения"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Set, Tuple
+
+
+class StartupTimer:
+    """
+    Отчёт о времени запуска по этапам.
+
+    Этапы отмечаются методом mark по мере запуска. Отчёт выводится
+    в stderr один раз: когда отмечены все ожидаемые этапы
+    (см. expect) или при выходе из приложения. Если отчёт выключен,
+    mark ничего не делает.
+
+    Включается переменной окружения WEATHER_APP_STARTUP_REPORT=1.
+
+    Attributes:
+        enabled (bool): Собираются ли замеры.
+    """
+
+    ENV_VAR = "WEATHER_APP_STARTUP_REPORT"
+
+    def __init__(
+        self,
+        enabled: bool,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Начинает отсчёт времени запуска.
+
+        Args:
+            enabled (bool): Собирать ли замеры.
+            clock (Callable[[], float]): Источник времени.
+        """
+        self.enabled: bool = enabled
+        self._clock = clock
+        self._started: float = clock()
+        self._phases: List[Tuple[str, float]] = []
+        self._pending: Set[str] = set()
+        self._expecting: bool = False
+        self._reported: bool = False
+        self._lock = threading.Lock()
+        if enabled:
+            atexit.register(self.report)
+
+    @classmethod
+    def from_env(cls) -> "StartupTimer":
+        """
+        Создаёт отчёт, включённый переменной окружения ENV_VAR.
+
+        Return:
+            StartupTimer: Отчёт о времени запуска.
+        """
+        return cls(os.environ.get(cls.ENV_VAR, "") not in ("", "0"))
+
+    def expect(self, *phases: str) -> None:
+        """
+        Добавляет этапы, после которых запуск считается завершённым.
+
+        Args:
+            *phases (str): Названия этапов.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.update(phases)
+            self._expecting = True
+
+    def mark(self, phase: str) -> None:
+        """
+        Отмечает окончание этапа. Повторные отметки этапа
+        не учитываются.
+
+        Args:
+            phase (str): Название этапа.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._reported or any(
+                name == phase for name, _ in self._phases
+            ):
+                return
+            self._phases.append((phase, self._clock()))
+            self._pending.discard(phase)
+            done = self._expecting and not self._pending
+        if done:
+            self.report()
+
+    def report(self) -> None:
+        """
+        Выводит отчёт: длительность каждого этапа и время
+        от начала запуска, в миллисекундах.
+        """
+        with self._lock:
+            if not self.enabled or self._reported:
+                return
+            self._reported = True
+            phases = list(self._phases)
+
+        width = max([len(name) for name, _ in phases] + [5])
+        lines = [f"{'Этап':<{width}}  {'мс':>8}  {'всего':>8}"]
+        previous = self._started
+        for name, at in phases:
+            lines.append(
+                f"{name:<{width}}  {(at - previous) * 1000:8.1f}  "
+                f"{(at - self._started) * 1000:8.1f}"
+            )
+            previous = at
+        print("Время запуска:\n" + "\n".join(lines), file=sys.stderr)
+
+
+# Общий отчёт приложения; отсчёт начинается с импорта модуля
+startup_timer = StartupTimer.from_env()
@@ -0,0 +1,76 @@
+"""Страница, создаваемая при первом показе"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+from typing import Callable, Optional
+
+
+class LazyPage(QtWidgets.QWidget):
+    """
+    Заглушка страницы, которая создаёт настоящую страницу
+    при первом показе.
+
+    Сначала отрисовывается заглушка с надписью «Загрузка...», затем
+    на следующей итерации цикла событий вызывается factory и страница
+    встраивается на место надписи. Так окно появляется сразу, а
+    импорт модулей страницы и её построение не задерживают первую
+    отрисовку. Страницы, которые пользователь не открывал, не создаются.
+
+    Signals:
+        page_created (QtWidgets.QWidget): Страница создана.
+
+    Attributes:
+        page (Optional[QtWidgets.QWidget]):
+            Созданная страница или None до первого показа.
+    """
+
+    page_created = QtCore.pyqtSignal(QtWidgets.QWidget)
+
+    def __init__(
+        self,
+        factory: Callable[[QtWidgets.QWidget], QtWidgets.QWidget],
+        parent: Optional[QtWidgets.QWidget] = None
+    ) -> None:
+        """
+        Создаёт заглушку страницы.
+
+        Args:
+            factory (Callable[[QtWidgets.QWidget], QtWidgets.QWidget]):
+                Создаёт страницу; получает родительский виджет.
+            parent (Optional[QtWidgets.QWidget], optional):
+                Родительский виджет. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.page: Optional[QtWidgets.QWidget] = None
+        self._factory = factory
+        self._scheduled: bool = False
+
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QtWidgets.QLabel("Загрузка...")
+        self._placeholder.setAlignment(QtCore.Qt.AlignCenter)
+        self._placeholder.setStyleSheet("font-size: 18px;")
+        self._layout.addWidget(self._placeholder)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """
+        Планирует создание страницы после первой отрисовки заглушки.
+        """
+        super().paintEvent(event)
+        if self.page is None and not self._scheduled:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self.ensure_page)
+
+    def ensure_page(self) -> QtWidgets.QWidget:
+        """
+        Создаёт страницу, если она ещё не создана.
+
+        Return:
+            QtWidgets.QWidget: Страница.
+        """
+        if self.page is None:
+            self.page = self._factory(self)
+            self._layout.removeWidget(self._placeholder)
+            self._placeholder.deleteLater()
+            self._layout.addWidget(self.page)
+            self.page_created.emit(self.page)
+        return self.page
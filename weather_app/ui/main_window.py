@@ -1,11 +1,47 @@
 """Главное окно программы"""
 
-from PyQt5 import QtCore, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QMainWindow
+from weather_app.startup import startup_timer
+from weather_app.ui.lazy_page import LazyPage
 from weather_app.ui.menu import Menu
-from weather_app.ui.pages.home_page.home_page import HomePage
-from weather_app.ui.pages.setting_pages.setting_pages import SettingPage
+
+
+def create_home_page(parent: QtWidgets.QWidget) -> QtWidgets.QWidget:
+    """
+    Создаёт главную страницу.
+
+    Модуль страницы импортируется здесь, а не при импорте окна:
+    вместе с ним загружаются requests и слой базы данных.
+
+    Args:
+        parent (QtWidgets.QWidget): Родительский виджет.
+
+    Return:
+        QtWidgets.QWidget: Главная страница.
+    """
+    from weather_app.ui.pages.home_page.home_page import HomePage
+
+    startup_timer.mark("импорт главной страницы")
+    page = HomePage(parent)
+    startup_timer.mark("главная страница")
+    return page
+
+
+def create_setting_page(parent: QtWidgets.QWidget) -> QtWidgets.QWidget:
+    """
+    Создаёт страницу настроек.
+
+    Args:
+        parent (QtWidgets.QWidget): Родительский виджет.
+
+    Return:
+        QtWidgets.QWidget: Страница настроек.
+    """
+    from weather_app.ui.pages.setting_pages.setting_pages import SettingPage
+
+    return SettingPage(parent)
 
 
 class MainWindow(QMainWindow):
@@ -27,6 +63,10 @@ class MainWindow(QMainWindow):
             Эффект тени для окна.
         window_layout (QtWidgets.QVBoxLayout):
             Основной вертикальный макет для меню и контента.
+        page_home (LazyPage):
+            Главная страница; создаётся после первой отрисовки окна.
+        page_settings (LazyPage):
+            Страница настроек; создаётся при первом переходе на неё.
     """
 
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
@@ -111,9 +151,13 @@ class MainWindow(QMainWindow):
             """
         )
 
-        # Страницы приложения
-        page_settings: SettingPage = SettingPage(self.visible_window)
-        page_home: HomePage = HomePage(self.visible_window)
+        # Страницы приложения создаются при первом показе
+        self.page_settings: LazyPage = LazyPage(
+            create_setting_page, self.visible_window
+        )
+        self.page_home: LazyPage = LazyPage(
+            create_home_page, self.visible_window
+        )
 
         # Стек виджетов
         stacked_widget: QtWidgets.QStackedWidget = (
@@ -139,11 +183,11 @@ class MainWindow(QMainWindow):
         # Кнопки управления
         self.button_group.addButton(
             self.menubar.push_button_home,
-            stacked_widget.addWidget(page_home),
+            stacked_widget.addWidget(self.page_home),
         )
         self.button_group.addButton(
             self.menubar.push_button_settings,
-            stacked_widget.addWidget(page_settings),
+            stacked_widget.addWidget(self.page_settings),
         )
 
         # Основной макет
@@ -166,6 +210,11 @@ class MainWindow(QMainWindow):
         # Установка центрального виджета
         self.setCentralWidget(self.centralwidget)
 
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """Отмечает первую отрисовку окна в отчёте о запуске."""
+        startup_timer.mark("первая отрисовка окна")
+        super().paintEvent(event)
+
     def minimize(self) -> None:
         """Свернуть окно."""
         self.showMinimized()
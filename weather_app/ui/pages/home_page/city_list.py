@@ -0,0 +1,312 @@
+"""Виртуализированный список городов главной страницы"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+from typing import Any, List, Optional
+
+
+class CityListModel(QtCore.QAbstractListModel):
+    """
+    Модель результатов поиска городов.
+
+    Хранит только загруженные страницы выдачи. Когда представление
+    прокручивается к концу, модель через сигнал more_requested
+    запрашивает следующую страницу.
+
+    Signals:
+        more_requested (int):
+            Запрос следующей страницы; аргумент — количество уже
+            загруженных городов.
+
+    Attributes:
+        page_size (int): Количество городов на странице выдачи.
+    """
+
+    CityIdRole = QtCore.Qt.UserRole + 1
+    CoordsRole = QtCore.Qt.UserRole + 2
+    FavoriteRole = QtCore.Qt.UserRole + 3
+
+    more_requested = QtCore.pyqtSignal(int)
+
+    def __init__(
+        self,
+        parent: Optional[QtCore.QObject] = None,
+        page_size: int = 100,
+    ) -> None:
+        """
+        Инициализирует пустую модель.
+
+        Args:
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+            page_size (int, optional):
+                Количество городов на странице. По умолчанию 100.
+        """
+        super().__init__(parent)
+        self.page_size: int = page_size
+        self._rows: List[list] = []
+        self._has_more: bool = False
+        self._fetching: bool = False
+
+    def rowCount(
+        self,
+        parent: QtCore.QModelIndex = QtCore.QModelIndex()
+    ) -> int:
+        """
+        Возвращает количество загруженных городов.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(
+        self,
+        index: QtCore.QModelIndex,
+        role: int = QtCore.Qt.DisplayRole
+    ) -> Any:
+        """
+        Возвращает данные города для указанной роли.
+
+        Строки модели имеют вид (id, ru_name, lat, lon, country, favorite).
+        """
+        if not index.isValid():
+            return None
+
+        city_id, city_name, lat, lon, country, favorite = (
+            self._rows[index.row()]
+        )
+        if role == QtCore.Qt.DisplayRole:
+            return f"{city_name} ({country})"
+        if role == self.CoordsRole:
+            return f"Широта: {lat:.4f}, Долгота: {lon:.4f}"
+        if role == self.CityIdRole:
+            return city_id
+        if role == self.FavoriteRole:
+            return bool(favorite)
+        return None
+
+    def set_cities(self, cities: List[tuple]) -> None:
+        """
+        Заменяет содержимое модели первой страницей новой выдачи.
+
+        Args:
+            cities (List[tuple]): Найденные города.
+        """
+        self.beginResetModel()
+        self._rows = [list(city) for city in cities]
+        self._has_more = len(cities) >= self.page_size
+        self._fetching = False
+        self.endResetModel()
+
+    def append_cities(self, offset: int, cities: List[tuple]) -> None:
+        """
+        Добавляет в конец модели следующую страницу выдачи.
+
+        Args:
+            offset (int): Смещение страницы в выдаче.
+            cities (List[tuple]): Города страницы.
+        """
+        self._fetching = False
+        if offset != len(self._rows):
+            return
+
+        self._has_more = len(cities) >= self.page_size
+        if not cities:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), first, first + len(cities) - 1
+        )
+        self._rows.extend(list(city) for city in cities)
+        self.endInsertRows()
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """
+        Сообщает представлению, есть ли ещё незагруженные города.
+        """
+        if parent.isValid():
+            return False
+        return self._has_more and not self._fetching
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """
+        Запрашивает следующую страницу выдачи.
+        """
+        if parent.isValid() or not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        self.more_requested.emit(len(self._rows))
+
+    def is_favorite(self, city_id: int) -> Optional[bool]:
+        """
+        Возвращает признак избранного у загруженного города.
+
+        Args:
+            city_id (int): ID города.
+
+        Return:
+            Optional[bool]: Статус избранного или None, если города
+            нет в модели.
+        """
+        for city in self._rows:
+            if city[0] == city_id:
+                return bool(city[5])
+        return None
+
+    def set_favorite(self, city_id: int, is_favorite: bool) -> None:
+        """
+        Обновляет признак избранного у загруженного города.
+
+        Args:
+            city_id (int): ID города.
+            is_favorite (bool): Новый статус избранного.
+        """
+        for row, city in enumerate(self._rows):
+            if city[0] == city_id:
+                city[5] = int(is_favorite)
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [self.FavoriteRole])
+
+
+class CityCardDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Делегат, рисующий карточку города: название, координаты и сердце.
+
+    Карточки не являются виджетами, поэтому отрисовываются только
+    видимые строки списка.
+
+    Signals:
+        city_clicked (int): Клик по карточке города.
+        favorite_clicked (int): Клик по иконке сердца.
+    """
+
+    city_clicked = QtCore.pyqtSignal(int)
+    favorite_clicked = QtCore.pyqtSignal(int)
+
+    CARD_HEIGHT = 120
+    CARD_MARGIN = 6
+    HEART_SIZE = 40
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """
+        Инициализирует делегат и загружает иконки сердца.
+
+        Args:
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.heart_pixmap = QtGui.QPixmap("weather_app/ui/icons/ui/Heart.png")
+        self.no_heart_pixmap = QtGui.QPixmap(
+            "weather_app/ui/icons/ui/NoHeart.png"
+        )
+
+        self.title_font = QtGui.QFont("Microsoft YaHei")
+        self.title_font.setPixelSize(18)
+        self.title_font.setBold(True)
+        self.coords_font = QtGui.QFont("Microsoft YaHei")
+        self.coords_font.setPixelSize(14)
+
+    def _card_rect(self, rect: QtCore.QRect) -> QtCore.QRect:
+        """
+        Возвращает прямоугольник карточки внутри строки списка.
+        """
+        return rect.adjusted(0, self.CARD_MARGIN, 0, -self.CARD_MARGIN)
+
+    def _heart_rect(self, rect: QtCore.QRect) -> QtCore.QRect:
+        """
+        Возвращает прямоугольник иконки сердца внутри строки списка.
+        """
+        card = self._card_rect(rect)
+        return QtCore.QRect(
+            card.right() - 15 - self.HEART_SIZE,
+            card.center().y() - self.HEART_SIZE // 2,
+            self.HEART_SIZE,
+            self.HEART_SIZE,
+        )
+
+    def sizeHint(
+        self,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        """
+        Возвращает размер строки списка.
+        """
+        return QtCore.QSize(option.rect.width(), self.CARD_HEIGHT)
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex
+    ) -> None:
+        """
+        Рисует карточку города.
+        """
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        card = self._card_rect(option.rect)
+        if option.state & QtWidgets.QStyle.State_MouseOver:
+            painter.setPen(QtGui.QPen(QtGui.QColor("#969696"), 1))
+        else:
+            painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor("white"))
+        painter.drawRoundedRect(
+            QtCore.QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 10, 10
+        )
+
+        # Название сверху, координаты снизу от середины карточки
+        text_rect = card.adjusted(10, 5, -(self.HEART_SIZE + 30), -5)
+        title_rect = QtCore.QRect(text_rect)
+        title_rect.setBottom(text_rect.center().y())
+        coords_rect = QtCore.QRect(text_rect)
+        coords_rect.setTop(text_rect.center().y() + 2)
+
+        painter.setPen(QtGui.QColor("black"))
+        painter.setFont(self.title_font)
+        painter.drawText(
+            title_rect,
+            QtCore.Qt.AlignLeft | QtCore.Qt.AlignBottom,
+            index.data(QtCore.Qt.DisplayRole),
+        )
+
+        painter.setPen(QtGui.QColor("#555"))
+        painter.setFont(self.coords_font)
+        painter.drawText(
+            coords_rect,
+            QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop,
+            index.data(CityListModel.CoordsRole),
+        )
+
+        heart = (
+            self.heart_pixmap
+            if index.data(CityListModel.FavoriteRole)
+            else self.no_heart_pixmap
+        )
+        painter.drawPixmap(self._heart_rect(option.rect), heart)
+
+        painter.restore()
+
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex
+    ) -> bool:
+        """
+        Обрабатывает клики по карточке и по иконке сердца.
+        """
+        if (
+            event.type() == QtCore.QEvent.MouseButtonPress
+            and event.button() == QtCore.Qt.LeftButton
+        ):
+            city_id = index.data(CityListModel.CityIdRole)
+            if self._heart_rect(option.rect).contains(event.pos()):
+                self.favorite_clicked.emit(city_id)
+            else:
+                self.city_clicked.emit(city_id)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,276 @@
+"""Асинхронный поиск городов для главной страницы"""
+
+import queue
+import sqlite3
+import threading
+from PyQt5 import QtCore
+from weather_app.db.database import Database
+from weather_app.db.gazetteer import CityGazetteer
+from weather_app.db.service import DatabaseService
+from typing import List, Optional, Tuple
+
+
+class CitySearchController(QtCore.QObject):
+    """
+    Контроллер поиска городов с задержкой ввода и отменой запросов.
+
+    Ввод откладывается на debounce_ms миллисекунд, запрос выполняется
+    в отдельном потоке через пул чтения DatabaseService. Каждому
+    запросу присваивается номер поколения: устаревшие запросы
+    прерываются или отбрасываются, поэтому в интерфейс попадает
+    только результат последнего запроса.
+
+    Если включён use_gazetteer, после первого запроса поток загружает
+    индекс городов в память (CityGazetteer) и дальше отвечает из него.
+
+    Выдача загружается страницами по page_size городов: первая
+    страница — при поиске, следующие — по запросу fetch_more.
+
+    Signals:
+        results_ready (int, str, int, list):
+            Номер поколения, запрос, смещение страницы и найденные города.
+
+    Attributes:
+        fields (List[str]): Поля городов, запрашиваемые из базы данных.
+        page_size (int): Количество городов на странице выдачи.
+        generation (int): Номер последнего отправленного запроса.
+        shown_generation (int): Номер запроса, первая страница которого
+            отображается; следующие страницы запрашиваются для него.
+    """
+
+    results_ready = QtCore.pyqtSignal(int, str, int, list)
+
+    def __init__(
+        self,
+        parent: Optional[QtCore.QObject] = None,
+        fields: Optional[List[str]] = None,
+        page_size: int = 100,
+        debounce_ms: int = 250,
+        use_gazetteer: bool = False,
+    ) -> None:
+        """
+        Инициализирует контроллер и запускает поток поиска.
+
+        Args:
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+            fields (Optional[List[str]], optional):
+                Поля городов. По умолчанию все поля.
+            page_size (int, optional):
+                Количество городов на странице. По умолчанию 100.
+            debounce_ms (int, optional):
+                Задержка после последнего нажатия клавиши, мс.
+            use_gazetteer (bool, optional):
+                Искать по индексу городов в памяти. По умолчанию False.
+        """
+        super().__init__(parent)
+        self.fields: Optional[List[str]] = fields
+        self.page_size: int = page_size
+        self.generation: int = 0
+        self.shown_generation: int = 0
+        self.use_gazetteer: bool = use_gazetteer
+
+        self._pending_query: str = ""
+        self._query: str = ""
+        self._shown_query: str = ""
+        self._queue: "queue.Queue[Optional[Tuple[int, str, int]]]" = (
+            queue.Queue()
+        )
+        self._database: Optional[Database] = None
+        self._busy_generation: int = 0
+        self._lock = threading.Lock()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._submit_pending)
+        # Подключается раньше обработчиков страницы, поэтому к их вызову
+        # shown_generation уже обновлён
+        self.results_ready.connect(self._on_results)
+
+        self._worker = threading.Thread(
+            target=self._run,
+            name="city-search",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def search(self, query: str) -> None:
+        """
+        Откладывает поиск до окончания ввода.
+
+        Args:
+            query (str): Поисковый запрос.
+        """
+        self._pending_query = query
+        self._timer.start()
+
+    def search_now(self, query: str) -> None:
+        """
+        Запускает поиск немедленно, без задержки.
+
+        Args:
+            query (str): Поисковый запрос.
+        """
+        self._timer.stop()
+        self._pending_query = query
+        self._submit_pending()
+
+    def _submit_pending(self) -> None:
+        """
+        Отправляет отложенный запрос в поток поиска и прерывает
+        выполняющийся устаревший запрос.
+        """
+        self.generation += 1
+        self._query = self._pending_query
+        self._queue.put((self.generation, self._query, 0))
+
+        with self._lock:
+            if (
+                self._database
+                and 0 < self._busy_generation < self.generation
+            ):
+                self._database.interrupt()
+
+    @QtCore.pyqtSlot(int, str, int, list)
+    def _on_results(
+        self,
+        generation: int,
+        query: str,
+        offset: int,
+        cities: List[tuple]
+    ) -> None:
+        """
+        Запоминает запрос, первая страница которого отображается.
+        """
+        if offset == 0 and generation == self.generation:
+            self.shown_generation = generation
+            self._shown_query = query
+
+    def fetch_more(self, offset: int) -> None:
+        """
+        Запрашивает следующую страницу отображаемой выдачи.
+
+        Пока первая страница нового запроса не получена, отображается
+        старая выдача: её страницы не нужны, а страницы нового запроса
+        нельзя дописывать к старому списку, поэтому запрос не
+        отправляется.
+
+        Args:
+            offset (int): Количество уже загруженных городов.
+        """
+        if self.shown_generation != self.generation:
+            return
+        self._queue.put((self.shown_generation, self._shown_query, offset))
+
+    def _run(self) -> None:
+        """
+        Цикл потока поиска: выполняет только самый свежий запрос
+        из очереди и публикует его результат.
+        """
+        service = DatabaseService.shared()
+
+        while True:
+            items = [self._queue.get()]
+            while items[-1] is not None:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if items[-1] is None:
+                break
+
+            # Из накопившихся запросов важен только последний, но первую
+            # страницу его выдачи пропускать нельзя
+            item = items[-1]
+            item = next(
+                (
+                    other for other in items
+                    if other[0] == item[0] and other[2] == 0
+                ),
+                item,
+            )
+            generation, query, offset = item
+            if generation != self.generation:
+                continue
+
+            try:
+                with service.reader() as database:
+                    cities = self._search(
+                        database, generation, query, offset
+                    )
+            except sqlite3.OperationalError as e:
+                # Запрос прерван более новым. Если прерывание случайно
+                # задело актуальный запрос, повторяем его.
+                if 'interrupted' not in str(e):
+                    print(f"Ошибка поиска городов: {e}")
+                elif generation == self.generation:
+                    self._queue.put(item)
+                continue
+            except (sqlite3.Error, RuntimeError) as e:
+                # Ошибка одного запроса не должна останавливать поток:
+                # следующий ввод снова запускает поиск
+                print(f"Ошибка поиска городов: {e}")
+                continue
+
+            if generation == self.generation:
+                self.results_ready.emit(generation, query, offset, cities)
+
+            # Индекс загружается в простое, чтобы не задерживать
+            # первый результат
+            if (
+                self.use_gazetteer
+                and CityGazetteer.loaded(service.db_path) is None
+                and self._queue.empty()
+            ):
+                try:
+                    with service.reader() as database:
+                        database.enable_gazetteer()
+                except (sqlite3.Error, RuntimeError) as e:
+                    print(f"Ошибка загрузки индекса городов: {e}")
+
+    def _search(
+        self,
+        database: Database,
+        generation: int,
+        query: str,
+        offset: int
+    ) -> List[tuple]:
+        """
+        Выполняет запрос через подключение из пула. На время запроса
+        подключение доступно для прерывания из потока интерфейса.
+
+        Args:
+            database (Database): Подключение для чтения.
+            generation (int): Номер поколения запроса.
+            query (str): Поисковый запрос.
+            offset (int): Смещение страницы в выдаче.
+
+        Return:
+            List[tuple]: Найденные города.
+        """
+        # Общий индекс, загруженный через другое подключение пула
+        if self.use_gazetteer and CityGazetteer.loaded(database.db_path):
+            database.enable_gazetteer()
+
+        with self._lock:
+            self._database = database
+            self._busy_generation = generation
+        try:
+            return database.get_cities(
+                fields=self.fields,
+                ru_name=query,
+                limit=self.page_size,
+                offset=offset,
+            )
+        finally:
+            with self._lock:
+                self._database = None
+                self._busy_generation = 0
+
+    def close(self) -> None:
+        """
+        Останавливает поток поиска.
+        """
+        self._timer.stop()
+        self._queue.put(None)
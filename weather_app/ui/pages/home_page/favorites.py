@@ -0,0 +1,222 @@
+"""Панель избранных городов главной страницы"""
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+from weather_app.api.models import CurrentWeather
+from typing import Callable, Dict, List, Optional
+
+
+class FavoriteTile(QtWidgets.QFrame):
+    """
+    Плитка избранного города: название, иконка и температура.
+
+    Signals:
+        clicked (int): Клик по плитке; аргумент — ID города.
+
+    Attributes:
+        city_id (int): ID города.
+        icon_code (Optional[str]): Код отображаемой иконки погоды.
+    """
+
+    clicked = QtCore.pyqtSignal(int)
+
+    def __init__(
+        self,
+        city_id: int,
+        city_name: str,
+        parent: Optional[QtWidgets.QWidget] = None
+    ) -> None:
+        """
+        Создаёт плитку без данных о погоде.
+
+        Args:
+            city_id (int): ID города.
+            city_name (str): Название города.
+            parent (Optional[QtWidgets.QWidget], optional):
+                Родительский виджет. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.city_id: int = city_id
+        self.icon_code: Optional[str] = None
+        self.setFixedSize(130, 110)
+        self.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.setStyleSheet(
+            """
+            QFrame {
+                background-color: #FFFFFF;
+                border-radius: 10px;
+            }
+            """
+        )
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(2)
+
+        name_label = QtWidgets.QLabel(city_name)
+        name_label.setAlignment(QtCore.Qt.AlignCenter)
+        name_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(name_label)
+
+        self.icon_label = QtWidgets.QLabel()
+        self.icon_label.setFixedSize(50, 50)
+        self.icon_label.setScaledContents(True)
+        layout.addWidget(self.icon_label, alignment=QtCore.Qt.AlignCenter)
+
+        self.temp_label = QtWidgets.QLabel("- ℃")
+        self.temp_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.temp_label.setStyleSheet("font-size: 16px;")
+        layout.addWidget(self.temp_label)
+
+    def set_weather(
+        self,
+        weather_data: CurrentWeather,
+        pixmap: QtGui.QPixmap
+    ) -> None:
+        """
+        Отображает текущую погоду в городе.
+
+        Args:
+            weather_data (CurrentWeather): Данные о текущей погоде.
+            pixmap (QtGui.QPixmap): Иконка погоды.
+        """
+        self.temp_label.setText(f"{weather_data.temperature} ℃")
+        self.icon_code = weather_data.icon
+        self.icon_label.setPixmap(pixmap)
+        self.setToolTip(weather_data.description)
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        """
+        Обрабатывает клик по плитке.
+        """
+        if event.button() == QtCore.Qt.LeftButton:
+            self.clicked.emit(self.city_id)
+        super().mousePressEvent(event)
+
+
+class FavoritesDashboard(QtWidgets.QWidget):
+    """
+    Панель с плитками избранных городов.
+
+    Данные о погоде приходят из потока планировщика обновлений
+    через сигнал weather_received: сигнал испускается в чужом потоке,
+    а обработчик выполняется в потоке интерфейса (queued-соединение).
+
+    Signals:
+        city_selected (int): Выбор избранного города.
+        weather_received (int, object):
+            Новые данные о погоде города; можно испускать
+            из любого потока.
+    """
+
+    city_selected = QtCore.pyqtSignal(int)
+    weather_received = QtCore.pyqtSignal(int, object)
+
+    def __init__(
+        self,
+        parent: Optional[QtWidgets.QWidget] = None,
+        icon_loader: Optional[Callable[[str], QtGui.QPixmap]] = None
+    ) -> None:
+        """
+        Создаёт пустую панель.
+
+        Args:
+            parent (Optional[QtWidgets.QWidget], optional):
+                Родительский виджет. По умолчанию None.
+            icon_loader (Optional[Callable[[str], QtGui.QPixmap]]):
+                Возвращает иконку погоды по коду. Вызывается
+                в потоке интерфейса при отрисовке плитки.
+        """
+        super().__init__(parent)
+        self._icon_loader = icon_loader or (lambda code: QtGui.QPixmap())
+        self._tiles: Dict[int, FavoriteTile] = {}
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(10, 0, 10, 0)
+        layout.setSpacing(5)
+
+        title = QtWidgets.QLabel("Избранное")
+        title.setStyleSheet("font-size: 18px; font-weight: bold;")
+        layout.addWidget(title)
+
+        self.empty_label = QtWidgets.QLabel(
+            "Добавьте города в избранное, нажав на сердце"
+        )
+        self.empty_label.setStyleSheet("font-size: 14px; color: #555;")
+        layout.addWidget(self.empty_label)
+
+        self.scroll_area = QtWidgets.QScrollArea(self)
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setFixedHeight(130)
+        self.scroll_area.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.scroll_area.setVerticalScrollBarPolicy(
+            QtCore.Qt.ScrollBarAlwaysOff
+        )
+        tiles_widget = QtWidgets.QWidget()
+        self.tiles_layout = QtWidgets.QHBoxLayout(tiles_widget)
+        self.tiles_layout.setContentsMargins(0, 0, 0, 0)
+        self.tiles_layout.setSpacing(10)
+        self.tiles_layout.addStretch()
+        self.scroll_area.setWidget(tiles_widget)
+        layout.addWidget(self.scroll_area)
+
+        self.weather_received.connect(self.update_city_weather)
+
+    def set_cities(self, cities: List[tuple]) -> None:
+        """
+        Перестраивает плитки по списку избранных городов.
+
+        Плитки городов, оставшихся в избранном, сохраняются
+        вместе с уже полученной погодой.
+
+        Args:
+            cities (List[tuple]): Города в виде (id, ru_name).
+        """
+        tiles = {}
+        for city_id, city_name in cities:
+            tile = self._tiles.pop(city_id, None)
+            if tile is None:
+                tile = FavoriteTile(city_id, city_name)
+                tile.clicked.connect(self.city_selected)
+            tiles[city_id] = tile
+
+        for tile in self._tiles.values():
+            tile.deleteLater()
+
+        # Плитки добавляются перед растяжкой в порядке списка
+        for position, tile in enumerate(tiles.values()):
+            self.tiles_layout.insertWidget(position, tile)
+
+        self._tiles = tiles
+        self.empty_label.setVisible(not tiles)
+        self.scroll_area.setVisible(bool(tiles))
+
+    @QtCore.pyqtSlot(int, object)
+    def update_city_weather(
+        self,
+        city_id: int,
+        weather_data: CurrentWeather
+    ) -> None:
+        """
+        Отображает погоду на плитке города, если он в избранном.
+
+        Args:
+            city_id (int): ID города.
+            weather_data (CurrentWeather): Данные о текущей погоде.
+        """
+        tile = self._tiles.get(city_id)
+        if tile is not None:
+            tile.set_weather(
+                weather_data, self._icon_loader(weather_data.icon)
+            )
+
+    def update_icon(self, code: str) -> None:
+        """
+        Перерисовывает иконку на плитках, которые её показывают,
+        например, после её загрузки в фоне.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+        """
+        for tile in self._tiles.values():
+            if tile.icon_code == code:
+                tile.icon_label.setPixmap(self._icon_loader(code))
@@ -0,0 +1,696 @@
+"""График истории погоды для главной страницы"""
+
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from PyQt5 import QtCore, QtGui, QtWidgets
+from weather_app.db.database import Database
+from weather_app.db.service import DatabaseService
+from typing import Dict, List, Optional, Tuple
+
+# Показатели графика: название, единицы, столбцы минимума и максимума
+# в строках Database.get_weather_history и множитель значений
+METRICS: Dict[str, Tuple[str, str, int, int, float]] = {
+    'temperature': ("Температура", "℃", 1, 2, 1.0),
+    # Давление переводится из гПа в мм рт. ст., как на экране погоды
+    'pressure': ("Давление", "мм рт. ст.", 4, 4, 0.750063755),
+    'humidity': ("Влажность", "%", 5, 5, 1.0),
+}
+
+
+def decimate_min_max(
+    ts: array,
+    low: array,
+    high: array,
+    start: float,
+    end: float,
+    width: int
+) -> List[Tuple[int, float, float]]:
+    """
+    Сводит точки ряда к минимуму и максимуму на каждый пиксель.
+
+    Отрисовка после прореживания стоит O(width), а не O(числа точек),
+    при этом пики и провалы ряда не теряются. Пропущенные значения
+    (NaN) не учитываются; столбец без значений остаётся NaN.
+
+    Args:
+        ts (array): Время точек в порядке возрастания.
+        low (array): Нижние значения точек.
+        high (array): Верхние значения точек.
+        start (float): Начало видимого периода.
+        end (float): Конец видимого периода.
+        width (int): Ширина области графика в пикселях.
+
+    Return:
+        List[Tuple[int, float, float]]:
+            Столбцы (x, минимум, максимум) в порядке x.
+    """
+    if width <= 0 or end <= start:
+        return []
+
+    first = bisect_left(ts, start)
+    last = bisect_left(ts, end)
+    scale = width / (end - start)
+
+    buckets: List[Tuple[int, float, float]] = []
+    column = -1
+    column_low = column_high = 0.0
+    for i in range(first, last):
+        x = int((ts[i] - start) * scale)
+        value_low = low[i]
+        value_high = high[i]
+        if x != column:
+            if column >= 0:
+                buckets.append((column, column_low, column_high))
+            column, column_low, column_high = x, value_low, value_high
+        else:
+            # NaN не равно самому себе: пустой столбец принимает
+            # первое значение, а NaN в сравнениях не побеждает
+            if value_low < column_low or column_low != column_low:
+                column_low = value_low
+            if value_high > column_high or column_high != column_high:
+                column_high = value_high
+    if column >= 0:
+        buckets.append((column, column_low, column_high))
+    return buckets
+
+
+class HistorySeries:
+    """
+    Загруженный непрерывный отрезок истории одного разрешения.
+
+    Отрезок только расширяется влево и вправо, поэтому при прокрутке
+    и масштабировании догружаются лишь недостающие края.
+
+    Attributes:
+        start (Optional[int]): Начало загруженного отрезка.
+        end (Optional[int]): Конец загруженного отрезка.
+        requested_start (Optional[int]):
+            Начало отрезка с учётом запрошенных, но не пришедших данных.
+        requested_end (Optional[int]):
+            Конец отрезка с учётом запрошенных данных.
+        columns (List[array]): Столбцы строк истории.
+    """
+
+    COLUMNS = 7
+
+    def __init__(self) -> None:
+        """
+        Создаёт пустой отрезок.
+        """
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self.requested_start: Optional[int] = None
+        self.requested_end: Optional[int] = None
+        # Запрошенные отрезки сброшены после ошибки, а загруженных
+        # данных ещё нет (см. fail)
+        self._reset: bool = False
+        self.columns: List[array] = [
+            array('d') for _ in range(self.COLUMNS)
+        ]
+
+    def missing(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Возвращает отрезки, которые нужно запросить, и помечает
+        их запрошенными.
+
+        Args:
+            start (int): Начало нужного периода.
+            end (int): Конец нужного периода.
+
+        Return:
+            List[Tuple[int, int]]: Отрезки [start, end) для загрузки.
+        """
+        if self.requested_start is None:
+            self.requested_start, self.requested_end = start, end
+            return [(start, end)]
+
+        ranges = []
+        if start < self.requested_start:
+            ranges.append((start, self.requested_start))
+            self.requested_start = start
+        if end > self.requested_end:
+            ranges.append((self.requested_end, end))
+            self.requested_end = end
+        return ranges
+
+    def merge(self, start: int, end: int, rows: List[Tuple]) -> None:
+        """
+        Добавляет загруженные строки к отрезку.
+
+        Запросы выполняются по порядку, поэтому каждый загруженный
+        отрезок примыкает к уже имеющимся данным слева или справа.
+        Отрезок, не примыкающий к ним (запрошенный за отрезком,
+        который не удалось загрузить), отбрасывается.
+
+        Args:
+            start (int): Начало загруженного периода.
+            end (int): Конец загруженного периода.
+            rows (List[Tuple]): Строки Database.get_weather_history.
+        """
+        if self.start is not None and end != self.start and start != self.end:
+            return
+
+        loaded = [
+            array('d', (float('nan') if v is None else v for v in column))
+            for column in zip(*rows)
+        ] if rows else [array('d') for _ in range(self.COLUMNS)]
+
+        if self.start is None:
+            self.columns = loaded
+            self.start, self.end = start, end
+            if self._reset:
+                # Запросы, сделанные до ошибки, могли покрывать другой
+                # период: остальное будет запрошено заново
+                self.requested_start, self.requested_end = start, end
+                self._reset = False
+        elif end <= self.start:
+            self.columns = [
+                new + old for new, old in zip(loaded, self.columns)
+            ]
+            self.start = start
+        else:
+            for old, new in zip(self.columns, loaded):
+                old.extend(new)
+            self.end = end
+
+    def fail(self, start: int, end: int) -> None:
+        """
+        Снимает отметку запроса с отрезка, который не удалось
+        загрузить, чтобы он был запрошен снова при следующей
+        прокрутке или масштабировании.
+
+        Запрошенные за ним отрезки той же стороны тоже запрашиваются
+        заново: их данные не примкнут к загруженным (см. merge).
+
+        Args:
+            start (int): Начало периода.
+            end (int): Конец периода.
+        """
+        if self.start is None:
+            self.requested_start = self.requested_end = None
+            self._reset = True
+        elif end <= self.start:
+            self.requested_start = self.start
+        else:
+            self.requested_end = self.end
+
+
+class HistoryLoader(QtCore.QObject):
+    """
+    Загрузка истории погоды в отдельном потоке.
+
+    Запросы выполняются по порядку через пул чтения DatabaseService.
+    Каждому городу соответствует номер поколения: результаты
+    для предыдущего города отбрасываются.
+
+    Signals:
+        loaded (int, str, int, int, list):
+            Поколение, разрешение, начало и конец периода, строки.
+        failed (int, str, int, int):
+            Поколение, разрешение, начало и конец периода, который
+            не удалось загрузить.
+    """
+
+    loaded = QtCore.pyqtSignal(int, str, int, int, list)
+    failed = QtCore.pyqtSignal(int, str, int, int)
+
+    def __init__(
+        self,
+        db_path: str,
+        parent: Optional[QtCore.QObject] = None
+    ) -> None:
+        """
+        Инициализирует загрузчик и запускает его поток.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.db_path: str = db_path
+        self.generation: int = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run,
+            name="history-loader",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def request(
+        self,
+        generation: int,
+        city_id: int,
+        resolution: str,
+        start: int,
+        end: int
+    ) -> None:
+        """
+        Ставит загрузку периода в очередь.
+
+        Args:
+            generation (int): Поколение запроса.
+            city_id (int): ID города.
+            resolution (str): Разрешение истории.
+            start (int): Начало периода.
+            end (int): Конец периода.
+        """
+        self._queue.put((generation, city_id, resolution, start, end))
+
+    def _run(self) -> None:
+        """
+        Цикл потока загрузки.
+        """
+        service = DatabaseService.shared(self.db_path)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, city_id, resolution, start, end = item
+            if generation != self.generation:
+                continue
+            try:
+                with service.reader() as database:
+                    rows = database.get_weather_history(
+                        city_id, start, end, resolution
+                    )
+            except (sqlite3.Error, RuntimeError) as e:
+                print(f"Ошибка загрузки истории погоды: {e}")
+                self.failed.emit(generation, resolution, start, end)
+                continue
+            self.loaded.emit(generation, resolution, start, end, rows)
+
+    def close(self) -> None:
+        """
+        Останавливает поток загрузки.
+        """
+        self._queue.put(None)
+
+
+class HistoryChart(QtWidgets.QWidget):
+    """
+    График истории погоды с прокруткой и масштабированием.
+
+    Колесо мыши масштабирует график относительно курсора,
+    перетаскивание прокручивает его по времени. Разрешение данных
+    выбирается по длине видимого периода (Database.history_resolution),
+    недостающие данные догружаются с запасом в половину периода
+    с каждой стороны. Перед отрисовкой ряд прореживается
+    до минимума и максимума на пиксель.
+
+    Attributes:
+        metric (str): Отображаемый показатель (ключ METRICS).
+        view_start (float): Начало видимого периода, время Unix.
+        view_end (float): Конец видимого периода, время Unix.
+    """
+
+    MIN_SPAN = 2 * 3600
+    MAX_SPAN = 5 * 365 * 86400
+    DEFAULT_SPAN = 7 * 86400
+    ZOOM_STEP = 1.25
+    MARGINS = QtCore.QMargins(55, 15, 15, 30)
+
+    def __init__(
+        self,
+        db_path: str,
+        parent: Optional[QtWidgets.QWidget] = None
+    ) -> None:
+        """
+        Создаёт пустой график.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            parent (Optional[QtWidgets.QWidget], optional):
+                Родительский виджет. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.metric: str = 'temperature'
+        self.view_end: float = time.time()
+        self.view_start: float = self.view_end - self.DEFAULT_SPAN
+
+        self._city_id: Optional[int] = None
+        self._generation: int = 0
+        self._series: Dict[str, HistorySeries] = {}
+        self._drag_x: Optional[int] = None
+
+        self.loader = HistoryLoader(db_path, self)
+        self.loader.loaded.connect(self._on_loaded)
+        self.loader.failed.connect(self._on_failed)
+
+        self.setMinimumHeight(200)
+        self.setMouseTracking(True)
+        self.setCursor(QtGui.QCursor(QtCore.Qt.OpenHandCursor))
+
+        self.axis_font = QtGui.QFont("Microsoft YaHei")
+        self.axis_font.setPixelSize(12)
+
+    def set_city(self, city_id: int) -> None:
+        """
+        Показывает историю города за последние DEFAULT_SPAN секунд.
+
+        Args:
+            city_id (int): ID города.
+        """
+        self._city_id = int(city_id)
+        self.view_end = time.time()
+        self.view_start = self.view_end - self.DEFAULT_SPAN
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Сбрасывает загруженные данные и загружает видимый период заново,
+        сохраняя масштаб.
+        """
+        self._generation += 1
+        self.loader.generation = self._generation
+        self._series = {}
+        self._ensure_loaded()
+        self.update()
+
+    def set_metric(self, metric: str) -> None:
+        """
+        Переключает отображаемый показатель.
+
+        Args:
+            metric (str): Ключ METRICS.
+        """
+        self.metric = metric
+        self.update()
+
+    def _resolution(self) -> str:
+        """
+        Возвращает разрешение данных для видимого периода.
+        """
+        return Database.history_resolution(
+            int(self.view_end - self.view_start)
+        )
+
+    def _ensure_loaded(self) -> None:
+        """
+        Запрашивает недостающие данные видимого периода с запасом.
+        """
+        if self._city_id is None:
+            return
+        resolution = self._resolution()
+        series = self._series.setdefault(resolution, HistorySeries())
+        padding = (self.view_end - self.view_start) / 2
+        for start, end in series.missing(
+            int(self.view_start - padding),
+            int(self.view_end + padding) + 1,
+        ):
+            self.loader.request(
+                self._generation, self._city_id, resolution, start, end
+            )
+
+    @QtCore.pyqtSlot(int, str, int, int, list)
+    def _on_loaded(
+        self,
+        generation: int,
+        resolution: str,
+        start: int,
+        end: int,
+        rows: List[Tuple]
+    ) -> None:
+        """
+        Добавляет загруженные данные и перерисовывает график.
+        """
+        if generation != self._generation:
+            return
+        self._series.setdefault(resolution, HistorySeries()).merge(
+            start, end, rows
+        )
+        if resolution == self._resolution():
+            self.update()
+
+    @QtCore.pyqtSlot(int, str, int, int)
+    def _on_failed(
+        self,
+        generation: int,
+        resolution: str,
+        start: int,
+        end: int
+    ) -> None:
+        """
+        Снимает отметку запроса с периода, который не удалось загрузить.
+        """
+        if generation != self._generation:
+            return
+        series = self._series.get(resolution)
+        if series is not None:
+            series.fail(start, end)
+
+    def _plot_rect(self) -> QtCore.QRect:
+        """
+        Возвращает область построения графика без подписей осей.
+        """
+        return self.rect().marginsRemoved(self.MARGINS)
+
+    def _set_view(self, start: float, end: float) -> None:
+        """
+        Устанавливает видимый период и догружает данные.
+        """
+        self.view_start, self.view_end = start, end
+        self._ensure_loaded()
+        self.update()
+
+    def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        """
+        Масштабирует график относительно курсора.
+        """
+        plot = self._plot_rect()
+        if plot.width() <= 0 or not event.angleDelta().y():
+            return
+        span = self.view_end - self.view_start
+        factor = (
+            1 / self.ZOOM_STEP if event.angleDelta().y() > 0
+            else self.ZOOM_STEP
+        )
+        new_span = min(self.MAX_SPAN, max(self.MIN_SPAN, span * factor))
+        ratio = min(1.0, max(0.0, (event.x() - plot.left()) / plot.width()))
+        anchor = self.view_start + span * ratio
+        self._set_view(
+            anchor - new_span * ratio,
+            anchor + new_span * (1 - ratio),
+        )
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        """
+        Начинает прокрутку перетаскиванием.
+        """
+        if event.button() == QtCore.Qt.LeftButton:
+            self._drag_x = event.x()
+            self.setCursor(QtGui.QCursor(QtCore.Qt.ClosedHandCursor))
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        """
+        Прокручивает график по времени.
+        """
+        plot = self._plot_rect()
+        if self._drag_x is None or plot.width() <= 0:
+            return
+        shift = (
+            (self._drag_x - event.x())
+            * (self.view_end - self.view_start) / plot.width()
+        )
+        self._drag_x = event.x()
+        self._set_view(self.view_start + shift, self.view_end + shift)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
+        """
+        Завершает прокрутку перетаскиванием.
+        """
+        self._drag_x = None
+        self.setCursor(QtGui.QCursor(QtCore.Qt.OpenHandCursor))
+
+    def _time_label(self, ts: float) -> str:
+        """
+        Форматирует метку времени оси X по длине видимого периода.
+        """
+        moment = datetime.fromtimestamp(ts)
+        if self.view_end - self.view_start <= 2 * 86400:
+            return moment.strftime('%d.%m %H:%M')
+        return moment.strftime('%d.%m.%Y')
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """
+        Рисует оси и прореженный ряд выбранного показателя.
+        """
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QtGui.QColor("white"))
+        painter.setFont(self.axis_font)
+
+        plot = self._plot_rect()
+        _, unit, low_column, high_column, scale = METRICS[self.metric]
+        series = self._series.get(self._resolution())
+
+        buckets: List[Tuple[int, float, float]] = []
+        if series is not None and series.start is not None:
+            buckets = [
+                (x, low * scale, high * scale)
+                for x, low, high in decimate_min_max(
+                    series.columns[0],
+                    series.columns[low_column],
+                    series.columns[high_column],
+                    self.view_start,
+                    self.view_end,
+                    plot.width(),
+                )
+                # NaN (нет значения) не равно самому себе
+                if low == low and high == high
+            ]
+
+        # Подписи оси X
+        painter.setPen(QtGui.QColor("#555"))
+        for ratio, alignment in (
+            (0.0, QtCore.Qt.AlignLeft),
+            (0.5, QtCore.Qt.AlignHCenter),
+            (1.0, QtCore.Qt.AlignRight),
+        ):
+            ts = self.view_start + (self.view_end - self.view_start) * ratio
+            x = plot.left() + int(plot.width() * ratio)
+            label_rect = QtCore.QRect(x - 60, plot.bottom() + 5, 120, 20)
+            if ratio == 0.0:
+                label_rect.moveLeft(x)
+            elif ratio == 1.0:
+                label_rect.moveRight(x)
+            painter.drawText(
+                label_rect, alignment | QtCore.Qt.AlignTop,
+                self._time_label(ts)
+            )
+
+        if not buckets:
+            painter.drawText(
+                plot, QtCore.Qt.AlignCenter,
+                "Нет данных за период" if self._city_id is not None
+                else "Выберите город"
+            )
+            painter.end()
+            return
+
+        minimum = min(low for _, low, _ in buckets)
+        maximum = max(high for _, _, high in buckets)
+        if maximum - minimum < 1e-9:
+            minimum, maximum = minimum - 1, maximum + 1
+        padding = (maximum - minimum) * 0.05
+        minimum -= padding
+        maximum += padding
+
+        def y_of(value: float) -> float:
+            return plot.bottom() - (
+                (value - minimum) / (maximum - minimum) * plot.height()
+            )
+
+        # Сетка и подписи оси Y
+        ticks = 4
+        for i in range(ticks + 1):
+            value = minimum + (maximum - minimum) * i / ticks
+            y = int(y_of(value))
+            painter.setPen(QtGui.QColor("#e0e0e0"))
+            painter.drawLine(plot.left(), y, plot.right(), y)
+            painter.setPen(QtGui.QColor("#555"))
+            painter.drawText(
+                QtCore.QRect(0, y - 10, plot.left() - 5, 20),
+                QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter,
+                f"{value:.0f}",
+            )
+        painter.drawText(
+            QtCore.QRect(0, 0, plot.left() - 5, plot.top()),
+            QtCore.Qt.AlignRight | QtCore.Qt.AlignTop,
+            unit,
+        )
+
+        # Ряд: для каждого пикселя отрезок от минимума до максимума
+        polyline = QtGui.QPolygonF()
+        for x, low, high in buckets:
+            px = plot.left() + x
+            polyline.append(QtCore.QPointF(px, y_of(high)))
+            polyline.append(QtCore.QPointF(px, y_of(low)))
+        painter.setClipRect(plot)
+        painter.setPen(QtGui.QPen(QtGui.QColor("#3a7bd5"), 1.5))
+        painter.drawPolyline(polyline)
+        painter.end()
+
+
+class HistoryPanel(QtWidgets.QWidget):
+    """
+    Панель истории погоды: переключатель показателя и график.
+
+    Attributes:
+        chart (HistoryChart): График истории.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        parent: Optional[QtWidgets.QWidget] = None
+    ) -> None:
+        """
+        Создаёт панель.
+
+        Args:
+            db_path (str): Путь к файлу базы данных.
+            parent (Optional[QtWidgets.QWidget], optional):
+                Родительский виджет. По умолчанию None.
+        """
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(5)
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+        buttons_layout.setSpacing(5)
+        self._buttons = QtWidgets.QButtonGroup(self)
+        for metric, (title, *_) in METRICS.items():
+            button = QtWidgets.QPushButton(title)
+            button.setCheckable(True)
+            button.setChecked(metric == 'temperature')
+            button.setStyleSheet(
+                """
+                QPushButton {
+                    background-color: #FFFFFF;
+                    border-radius: 8px;
+                    padding: 4px 10px;
+                    font-size: 14px;
+                }
+                QPushButton:checked {
+                    background-color: #3a7bd5;
+                    color: white;
+                }
+                """
+            )
+            button.clicked.connect(
+                lambda _, metric=metric: self.chart.set_metric(metric)
+            )
+            self._buttons.addButton(button)
+            buttons_layout.addWidget(button)
+        buttons_layout.addStretch()
+
+        hint = QtWidgets.QLabel("Колесо — масштаб, перетаскивание — сдвиг")
+        hint.setStyleSheet("font-size: 12px; color: #555;")
+        buttons_layout.addWidget(hint)
+        layout.addLayout(buttons_layout)
+
+        self.chart = HistoryChart(db_path, self)
+        layout.addWidget(self.chart)
+
+    def set_city(self, city_id: int) -> None:
+        """
+        Показывает историю города.
+
+        Args:
+            city_id (int): ID города.
+        """
+        self.chart.set_city(city_id)
+
+    def reload(self) -> None:
+        """
+        Перезагружает историю текущего города.
+        """
+        self.chart.reload()
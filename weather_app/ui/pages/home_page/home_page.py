@@ -5,14 +5,27 @@ from PyQt5.QtWidgets import (
     QLabel,
     QVBoxLayout,
     QHBoxLayout,
-    QScrollArea,
+    QListView,
     QStackedWidget,
     QLineEdit
 )
-from weather_app.api.weather_api import WeatherAPI
+from weather_app.api.models import CurrentWeather, ForecastDay
+from weather_app.api.scheduler import RefreshScheduler
+from weather_app.api.service import WeatherService
+from weather_app.api.tasks import INTERACTIVE, CancellationToken
 from weather_app.db.database import Database
-from typing import Any, Dict, List, Optional
-import threading
+from weather_app.startup import startup_timer
+from weather_app.ui.pages.home_page.city_list import (
+    CityCardDelegate,
+    CityListModel,
+)
+from weather_app.ui.pages.home_page.city_search import CitySearchController
+from weather_app.ui.pages.home_page.favorites import FavoritesDashboard
+from weather_app.ui.pages.home_page.history_chart import HistoryPanel
+from weather_app.ui.task_runner import TaskRunner
+from weather_app.ui.weather_icons import WeatherIcons
+from typing import List, Optional, Tuple
+import time
 
 
 class HomePage(QtWidgets.QWidget):
@@ -21,10 +34,19 @@ class HomePage(QtWidgets.QWidget):
     отображения информации о погоде.
 
     Attributes:
-        database (Database):
-            Объект для работы с базой данных.
-        weather_api (WeatherAPI):
-            Объект для получения данных о погоде.
+        service (WeatherService):
+            Ядро приложения без интерфейса; страница лишь отображает
+            его данные.
+        database (DatabaseService):
+            Общая служба базы данных.
+        settings (Settings):
+            Настройки приложения.
+        weather_api (CachedWeatherAPI):
+            Объект для получения данных о погоде с кэшированием ответов.
+        weather_icons (WeatherIcons):
+            Декодированные иконки погоды.
+        refresh_scheduler (RefreshScheduler):
+            Планировщик фонового обновления избранных городов.
         default_city_id (int):
             ID города по умолчанию, полученный из базы данных.
         main_layout (QtWidgets.QHBoxLayout):
@@ -35,27 +57,94 @@ class HomePage(QtWidgets.QWidget):
             Правая секция интерфейса.
         forecast_cards (List[QtWidgets.QWidget]):
             Список карточек прогноза погоды для трех дней.
+        history_panel (HistoryPanel):
+            Графики истории погоды выбранного города.
+        favorites_dashboard (FavoritesDashboard):
+            Панель избранных городов.
+        current_city_id (Optional[int]):
+            ID города, погода в котором отображается.
+        shown_weather (Optional[CurrentWeather]):
+            Отображаемые данные о текущей погоде.
+        weather_generation (int):
+            Номер последнего запроса погоды; результаты более ранних
+            запросов отбрасываются.
+        tasks (TaskRunner):
+            Фоновые задачи страницы в пуле WeatherService.tasks.
     """
 
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
         """
         Инициализация главной страницы приложения.
 
-        Загружает настройки и обновляет данные о погоде для города, который был
-        установлен по умолчанию в базе данных.
+        Строит интерфейс, а начальные данные (список городов, избранное
+        и погоду в городе, выбранном в прошлый раз) загружает после
+        отрисовки страницы, см. load_initial_data.
 
         Args:
             parent (Optional[QtWidgets.QWidget], optional):
                 Родительский объект для текущего виджета (по умолчанию None).
         """
         super().__init__(parent)
-        self.database = Database()
-        self.weather_api = WeatherAPI(self.database)
+        self.service = WeatherService()
+        self.database = self.service.database
+        self.settings = self.service.settings
+        self.weather_api = self.service.api
+        self.weather_icons = WeatherIcons(
+            self.weather_api.api.icon_cache,
+            pool=self.service.tasks,
+            parent=self,
+        )
+        self.weather_icons.icon_loaded.connect(self.on_icon_loaded)
+        # Изначальный город получаем из настроек
+        self.default_city_id = self.settings.get('LAST_SITY_ID')
+        self.current_city_id: Optional[int] = None
+        self.shown_weather: Optional[CurrentWeather] = None
+        self.weather_generation: int = 0
+        self.tasks = TaskRunner(self.service.tasks, self)
+        self._weather_token: Optional[CancellationToken] = None
+        self._favorites_token: Optional[CancellationToken] = None
 
         self.init_ui()
 
-        # Изначальный город получаем из БД и обновляем
-        self.default_city_id = self.database.get_setting('LAST_SITY_ID')
+        # Смена состояния сети приходит из рабочих потоков
+        self.weather_api.api.transport.connectivity.add_listener(
+            lambda online: QtCore.QMetaObject.invokeMethod(
+                self,
+                "on_connectivity_changed",
+                QtCore.Qt.QueuedConnection,
+                QtCore.Q_ARG(bool, online),
+            )
+        )
+        # Новый API-ключ может прийти со страницы настроек
+        self.settings.subscribe(
+            'OPEN_WEATHER_MAP_API_KEY',
+            lambda _: QtCore.QMetaObject.invokeMethod(
+                self, "on_api_key_changed", QtCore.Qt.QueuedConnection
+            )
+        )
+
+        # Избранные города обновляются в фоне, результаты попадают
+        # в кэш и на панель избранного
+        self.refresh_scheduler = RefreshScheduler(
+            self.weather_api,
+            favorites=self.service.favorite_city_ids,
+            on_weather=self.favorites_dashboard.weather_received.emit,
+            on_error=lambda e: print(f"Ошибка фонового обновления: {e}"),
+            pool=self.service.tasks,
+        )
+
+        QtCore.QTimer.singleShot(0, self.load_initial_data)
+
+    def load_initial_data(self) -> None:
+        """
+        Запускает начальную загрузку данных страницы.
+
+        Вызывается из цикла событий после создания страницы, чтобы
+        запросы к базе данных и сети не задерживали её появление.
+        """
+        self.city_search.search_now("")
+        self.update_favorites_dashboard()
+        self.refresh_scheduler.start()
         self.update_weather(self.default_city_id)
 
     def degrees_to_compass(self, deg: float) -> str:
@@ -106,8 +195,8 @@ class HomePage(QtWidgets.QWidget):
     def create_left_section(self):
         """
         Создает левую секцию с состоянием загрузки,
-        отображением данных о текущей погоде
-        и прогнозом на 3 дня вперёд.
+        отображением данных о текущей погоде,
+        прогнозом на 3 дня вперёд и историей погоды.
         """
         section = QtWidgets.QWidget(self)
         section.setFixedWidth(720)
@@ -137,12 +226,35 @@ class HomePage(QtWidgets.QWidget):
 
         section_layout.addWidget(self.stack_widget)
 
-        # Секция "Прогноз на три дня"
+        # Вкладки "Прогноз на три дня" и "История"
         self.three_days_ahead = self.create_three_days_ahead()
-        section_layout.addWidget(self.three_days_ahead)
+        self.history_panel = HistoryPanel(self.database.db_path, section)
+        self.details_tabs = QtWidgets.QTabWidget(section)
+        self.details_tabs.addTab(self.three_days_ahead, "Прогноз")
+        self.details_tabs.addTab(self.history_panel, "История")
+        self.details_tabs.currentChanged.connect(self.on_details_tab_changed)
+        section_layout.addWidget(self.details_tabs)
+
+        # Панель избранных городов
+        self.favorites_dashboard = FavoritesDashboard(
+            section, icon_loader=self.icon_pixmap
+        )
+        self.favorites_dashboard.city_selected.connect(self.on_card_click)
+        section_layout.addWidget(self.favorites_dashboard)
 
         return section
 
+    def on_details_tab_changed(self, index: int) -> None:
+        """
+        Обновляет историю при открытии вкладки, чтобы на графике
+        появились наблюдения, сохранённые после выбора города.
+
+        Args:
+            index (int): Номер открытой вкладки.
+        """
+        if self.details_tabs.widget(index) is self.history_panel:
+            self.history_panel.reload()
+
     def create_three_days_ahead(self) -> QtWidgets.QWidget:
         """
         Создает секцию для прогноза на три дня в виде карточек.
@@ -232,27 +344,30 @@ class HomePage(QtWidgets.QWidget):
 
         return card_widget
 
-    def update_forecast(self, forecast_data: list[dict]) -> None:
+    def update_forecast(self, forecast_data: List[ForecastDay]) -> None:
         """
         Обновляет данные прогноза погоды в карточках.
 
+        Карточки дней, которых нет в прогнозе, очищаются, чтобы
+        в них не остался прогноз ранее выбранного города.
+
         Args:
-            forecast_data (list[dict]):
-                Список данных прогноза для трех дней.
-                Каждый элемент списка должен быть словарем с ключами:
-                'date', 'pixmap', 'temp_min', 'temp_max', 'description'.
+            forecast_data (List[ForecastDay]):
+                Прогноз по дням; отображаются первые три дня.
         """
-        for i, data in enumerate(forecast_data):
+        for i, data in enumerate(forecast_data[:len(self.forecast_cards)]):
             # Обновляем карточку для каждого дня
             card = self.forecast_cards[i]
 
             # Обновляем дату
             date_label = card.findChild(QtWidgets.QLabel, f"date_label_{i}")
-            date_label.setText(data['date'])
+            date_label.setText(data.date)
 
-            # Обновляем иконку
+            # Обновляем иконку; код нужен, чтобы показать иконку,
+            # загруженную позже (см. on_icon_loaded)
             icon_label = card.findChild(QtWidgets.QLabel, f"icon_label_{i}")
-            icon_label.setPixmap(data['pixmap'])
+            icon_label.setProperty("icon_code", data.icon)
+            icon_label.setPixmap(self.icon_pixmap(data.icon))
 
             # Обновляем температуру
             temp_min_label = card.findChild(
@@ -263,12 +378,14 @@ class HomePage(QtWidgets.QWidget):
                 QtWidgets.QLabel,
                 f"temp_max_label_{i}"
             )
-            temp_min_label.setText(f"Мин. температура: {data['temp_min']}°C")
-            temp_max_label.setText(f"Макс. температура: {data['temp_max']}°C")
+            temp_min_label.setText(f"Мин. температура: {data.temp_min}°C")
+            temp_max_label.setText(f"Макс. температура: {data.temp_max}°C")
 
             # Обновляем описание
             desc_label = card.findChild(QtWidgets.QLabel, f"desc_label_{i}")
-            desc_label.setText(f"{data['description']}")
+            desc_label.setText(f"{data.description}")
+
+        self.clear_forecast("Нет данных", start=len(forecast_data))
 
     def create_loading_screen(self) -> QtWidgets.QWidget:
         """
@@ -282,15 +399,16 @@ class HomePage(QtWidgets.QWidget):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
 
-        label = QLabel("Загрузка данных...")
-        label.setStyleSheet(
+        self.loading_label = QLabel("Загрузка данных...")
+        self.loading_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.loading_label.setStyleSheet(
             """
             font-size: 18px;
             font-weight: bold;
             text-align: center;
             """
         )
-        layout.addWidget(label, alignment=QtCore.Qt.AlignCenter)
+        layout.addWidget(self.loading_label, alignment=QtCore.Qt.AlignCenter)
 
         return widget
 
@@ -324,6 +442,19 @@ class HomePage(QtWidgets.QWidget):
             """)
         self.weather_layout.addWidget(self.weather_title)
 
+        # Предупреждение об устаревших данных (скрыто для свежих)
+        self.stale_label = QLabel()
+        self.stale_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.stale_label.setStyleSheet(
+            """
+            font-size: 14px;
+            color: #8a5a00;
+            background-color: #fff3cd;
+            """
+        )
+        self.stale_label.hide()
+        self.weather_layout.addWidget(self.stale_label)
+
         # Основной горизонтальный компоновщик
         main_layout = QHBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -508,13 +639,15 @@ class HomePage(QtWidgets.QWidget):
         layout.addWidget(search_widget)
         layout.addWidget(line_widget, alignment=QtCore.Qt.AlignBottom)
 
-        # Прокручиваемая область для кнопок
-        scroll_area = QScrollArea(section)
-        scroll_area.setStyleSheet(
+        # Список городов: карточки рисуются делегатом,
+        # отрисовываются только видимые строки
+        self.city_list_view = QListView(section)
+        self.city_list_view.setStyleSheet(
             """
-            QScrollArea {
+            QListView {
                 padding-left: 5px;
                 padding-right: 5px;
+                background-color: transparent;
             }
 
             QScrollBar:vertical, QScrollBar:horizontal {
@@ -550,32 +683,49 @@ class HomePage(QtWidgets.QWidget):
             }
             """
         )
-        scroll_area.setWidgetResizable(True)
-        scroll_content = QtWidgets.QWidget()
-        scroll_content.setStyleSheet("border-radius: 10px;")
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.setSpacing(0)
-        scroll_layout.setAlignment(QtCore.Qt.AlignTop)
-
-        # Изначальное получение списка городов
-        self.city_buttons_layout = scroll_layout
-        self.update_city_list()
-
-        scroll_content.setLayout(scroll_layout)
-        scroll_area.setWidget(scroll_content)
-        layout.addWidget(scroll_area)
+        self.city_list_view.setUniformItemSizes(True)
+        self.city_list_view.setMouseTracking(True)
+        self.city_list_view.setSelectionMode(QListView.NoSelection)
+        self.city_list_view.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.city_list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.city_list_view.setHorizontalScrollBarPolicy(
+            QtCore.Qt.ScrollBarAlwaysOff
+        )
+        self.city_list_view.viewport().setCursor(
+            QtGui.QCursor(QtCore.Qt.PointingHandCursor)
+        )
+
+        self.city_list_model = CityListModel(self, page_size=100)
+        self.city_list_view.setModel(self.city_list_model)
+
+        city_card_delegate = CityCardDelegate(self.city_list_view)
+        city_card_delegate.city_clicked.connect(self.on_card_click)
+        city_card_delegate.favorite_clicked.connect(self.toggle_favorite)
+        self.city_list_view.setItemDelegate(city_card_delegate)
+
+        # Поиск городов выполняется в фоне, в интерфейс попадает
+        # только результат последнего запроса
+        self.city_search = CitySearchController(
+            self,
+            fields=['id', 'ru_name', 'lat', 'lon', 'country', 'favorite'],
+            page_size=self.city_list_model.page_size,
+            use_gazetteer=True,
+        )
+        self.city_search.results_ready.connect(self.show_city_list)
+        self.city_list_model.more_requested.connect(
+            self.city_search.fetch_more
+        )
+
+        layout.addWidget(self.city_list_view)
 
         return section
 
     def update_city_list(self, query: str = "") -> None:
         """
-        Обновляет список городов на основе поискового запроса.
+        Запрашивает обновление списка городов по поисковому запросу.
 
-        Эта функция очищает старые карточки
-        городов и добавляет новые карточки
-        с данными о городах, соответствующих запросу.
-        Максимум добавляется 100 городов.
+        Запрос выполняется в фоне после паузы во вводе,
+        результат отображается методом show_city_list.
 
         Args:
             query (str, optional):
@@ -585,177 +735,195 @@ class HomePage(QtWidgets.QWidget):
         Returns:
             None
         """
+        self.city_search.search(query)
 
-        # TODO: Реализовать lazy loading списка городов.
-
-        cities = self.database.get_cities(
-            fields=['id', 'ru_name', 'lat', 'lon', 'country', 'favorite'],
-            ru_name=query
-        )
+    @QtCore.pyqtSlot(int, str, int, list)
+    def show_city_list(
+        self,
+        generation: int,
+        query: str,
+        offset: int,
+        cities: List[tuple]
+    ) -> None:
+        """
+        Отображает найденные города.
 
-        # Очищаем старые карточки
-        for i in range(self.city_buttons_layout.count()):
-            widget = self.city_buttons_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-
-        # Добавляем новые карточки, максимум 100
-        for city_id, city_name, lat, lon, country, favorite in cities[:100]:
-            if city_name:
-                # Создаем контейнер для карточки города
-                card_widget = QtWidgets.QWidget()
-                card_widget.setCursor(
-                    QtGui.QCursor(QtCore.Qt.PointingHandCursor)
-                )
-                card_widget.setStyleSheet(
-                    """
-                    QWidget {
-                        background-color: white;
-                        border-radius: 10px;
-                        margin-top: 6px;
-                        margin-bottom: 6px;
-                    }
-
-                    QWidget:hover {
-                        border: 1px solid #969696;
-                    }
-
-                    QLabel:hover {
-                        border: 0px solid transparent;
-                    }
-                    """
-                )
-                card_widget.setFixedHeight(120)
-                card_layout = QtWidgets.QHBoxLayout(card_widget)
-                card_layout.setContentsMargins(10, 5, 10, 5)
-                card_layout.setSpacing(10)
-
-                # Создаем вертикальный layout для названия города и координат
-                city_info_layout = QtWidgets.QVBoxLayout()
-                city_info_layout.setContentsMargins(0, 0, 0, 0)
-                city_info_layout.setSpacing(2)
-
-                # Метка с названием города
-                city_label = QtWidgets.QLabel(f"{city_name} ({country})")
-                city_label.setStyleSheet("font-size: 18px; font-weight: bold;")
-                city_info_layout.addWidget(city_label)
-
-                # Метка с широтой и долготой
-                coords_label = QtWidgets.QLabel(
-                    f"Широта: {lat:.4f}, Долгота: {lon:.4f}"
-                )
-                coords_label.setStyleSheet("font-size: 14px; color: #555;")
-                city_info_layout.addWidget(coords_label)
-
-                card_layout.addLayout(city_info_layout)
-
-                # Создаем spacer (будет занимать оставшееся пространство)
-                spacer = QtWidgets.QSpacerItem(
-                    40,
-                    20,
-                    QtWidgets.QSizePolicy.Expanding,
-                    QtWidgets.QSizePolicy.Minimum
-                )
-                card_layout.addItem(spacer)
-
-                # Создаем метку для отображения иконки сердца
-                heart_icon = QtWidgets.QLabel()
-                if favorite:
-                    heart_icon.setPixmap(
-                        QtGui.QPixmap("weather_app/ui/icons/ui/Heart.png")
-                    )
-                    heart_icon.setStyleSheet("margin-right: 10px;")
-                else:
-                    heart_icon.setPixmap(
-                        QtGui.QPixmap("weather_app/ui/icons/ui/NoHeart.png")
-                    )
-                    heart_icon.setStyleSheet("margin-right: 15px;")
+        Первая страница выдачи заменяет содержимое списка,
+        следующие страницы дописываются в конец при прокрутке.
+        Результаты устаревших запросов отбрасываются.
 
-                heart_icon.mousePressEvent = (
-                    lambda event, city_id=city_id, heart_icon=heart_icon: (
-                        self.toggle_favorite(city_id, heart_icon)
-                    )
-                )
-                card_layout.addWidget(heart_icon)
+        Args:
+            generation (int): Номер поколения поискового запроса.
+            query (str): Поисковый запрос.
+            offset (int): Смещение страницы в выдаче.
+            cities (List[tuple]): Найденные города.
 
-                # Обработчик клика по карточке (по всей карточке)
-                card_widget.mousePressEvent = (
-                    lambda event, city_id=city_id: (
-                        self.on_card_click(city_id)
-                    )
-                )
+        Returns:
+            None
+        """
+        if generation != self.city_search.generation:
+            return
 
-                self.city_buttons_layout.addWidget(card_widget)
+        if offset == 0:
+            self.city_list_model.set_cities(cities)
+            self.city_list_view.scrollToTop()
+            startup_timer.mark("список городов")
+        else:
+            self.city_list_model.append_cities(offset, cities)
 
-    def toggle_favorite(
-            self,
-            city_id: int,
-            heart_icon: QtWidgets.QLabel
-    ) -> None:
+    def toggle_favorite(self, city_id: int) -> None:
         """
         Обработчик клика по иконке сердца для
         добавления/удаления города из избранного.
 
+        Иконка меняется сразу, а запись в базу данных выполняется
+        в очереди потока записи; интерфейс её не ждёт. После записи
+        обновляется панель избранного, а при ошибке иконка
+        возвращается в прежнее состояние.
+
         Args:
             city_id (int):
                 ID города, который нужно
                 добавить или удалить из избранного.
-            heart_icon (QtWidgets.QLabel):
-                Иконка сердца, которую нужно обновить
-                в зависимости от состояния избранного города.
 
         Return:
             None
         """
-        # Получаем текущее состояние города из базы данных
-        is_favorite = self.database.is_city_favorite(city_id)
+        current = self.city_list_model.is_favorite(city_id)
+        if current is not None:
+            self.city_list_model.set_favorite(city_id, not current)
+
+        def toggle(database: Database) -> bool:
+            # Состояние города, которого нет в списке, читается в той
+            # же задаче записи
+            is_favorite = (
+                not current if current is not None
+                else not database.is_city_favorite(city_id)
+            )
+            database.update_city_favorite(city_id, is_favorite)
+            return is_favorite
+
+        def on_saved(is_favorite: bool) -> None:
+            if current is None:
+                self.city_list_model.set_favorite(city_id, is_favorite)
+            # Обновляем панель избранного; новый город загружается сразу
+            self.update_favorites_dashboard()
+            if is_favorite:
+                self.refresh_scheduler.refresh_now([city_id])
+
+        def on_error(error: BaseException) -> None:
+            print(f"Ошибка сохранения избранного: {error}")
+            if current is not None:
+                self.city_list_model.set_favorite(city_id, current)
+
+        self.tasks.watch(
+            self.database.write(toggle), on_result=on_saved, on_error=on_error
+        )
+
+    def icon_pixmap(self, code: str) -> QtGui.QPixmap:
+        """
+        Возвращает иконку погоды по коду для отрисовки.
 
-        # Обновить информацию о городе в базе данных
-        self.database.update_city_favorite(city_id, not is_favorite)
+        Иконки загружаются в кэш в рабочем потоке вместе с данными,
+        поэтому здесь они читаются из памяти или с диска. Иконка,
+        которой там нет, загружается в фоне и отрисовывается позже
+        (см. on_icon_loaded).
 
-        # После обновления в базе данных, получаем новое состояние
-        new_favorite_state = not is_favorite
-        # Обновляем иконку в зависимости от нового состояния
-        if new_favorite_state:
-            heart_icon.setPixmap(
-                QtGui.QPixmap("weather_app/ui/icons/ui/Heart.png")
-            )
-            heart_icon.setStyleSheet("margin-right: 10px;")
-        else:
-            heart_icon.setPixmap(
-                QtGui.QPixmap("weather_app/ui/icons/ui/NoHeart.png")
-            )
-            heart_icon.setStyleSheet("margin-right: 15px;")
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+
+        Return:
+            QtGui.QPixmap: Иконка или пустой QPixmap, если её нет.
+        """
+        try:
+            return self.weather_icons.get_pixmap(code)
+        except Exception as e:
+            print(f"Ошибка загрузки иконки погоды: {e}")
+            return QtGui.QPixmap()
+
+    def on_icon_loaded(self, code: str) -> None:
+        """
+        Отрисовывает иконку, загруженную в фоне, везде, где она
+        должна быть показана.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+        """
+        if self.shown_weather is not None and self.shown_weather.icon == code:
+            self.weather_icon_label.setPixmap(self.icon_pixmap(code))
+        for i, card in enumerate(self.forecast_cards):
+            icon_label = card.findChild(QtWidgets.QLabel, f"icon_label_{i}")
+            if icon_label.property("icon_code") == code:
+                icon_label.setPixmap(self.icon_pixmap(code))
+        self.favorites_dashboard.update_icon(code)
+
+    def update_favorites_dashboard(self) -> None:
+        """
+        Перестраивает панель избранного по базе данных и показывает
+        последнюю известную погоду для уже загружавшихся городов.
+
+        Избранное и сохранённая погода читаются в пуле задач, панель
+        заполняется по результату. Результат более раннего вызова,
+        если он ещё не пришёл, отбрасывается.
+        """
+        def load() -> Tuple[List[tuple], List[tuple]]:
+            with self.database.reader() as database:
+                cities = database.get_favorite_cities(['id', 'ru_name'])
+                weather = [
+                    (
+                        city_id,
+                        self.weather_api.last_known(city_id, database)[0],
+                    )
+                    for city_id, _ in cities
+                ]
+            return cities, weather
+
+        def on_loaded(data: Tuple[List[tuple], List[tuple]]) -> None:
+            cities, weather = data
+            self.favorites_dashboard.set_cities(cities)
+            for city_id, weather_data in weather:
+                if weather_data is not None:
+                    self.favorites_dashboard.update_city_weather(
+                        city_id, weather_data
+                    )
+
+        if self._favorites_token is not None:
+            self._favorites_token.cancel()
+        self._favorites_token = self.tasks.run(
+            load,
+            on_result=on_loaded,
+            on_error=lambda e: print(f"Ошибка загрузки избранного: {e}"),
+        )
 
     def on_card_click(self, city_id: int) -> None:
         """
         Обработчик клика по карточке города.
 
         Этот метод сохраняет выбранный city_id
-        в базе данных как последний выбранный город,
-        и обновляет данные о погоде.
+        в настройках как последний выбранный город,
+        и обновляет данные о погоде. При быстром переборе
+        городов в базу записывается только последний.
 
         Args:
             city_id (int): ID выбранного города.
         """
-        self.database.set_setting('LAST_SITY_ID', city_id)
+        self.settings.set('LAST_SITY_ID', city_id)
+        self.refresh_scheduler.mark_viewed(city_id)
         self.update_weather(city_id)
 
-    def get_weather_data(self, city_id: int) -> Optional[Dict[str, Any]]:
+    def get_weather_data(self, city_id: int) -> Optional[CurrentWeather]:
         """
         Получает данные о погоде для заданного города.
 
         Этот метод запрашивает данные о
-        погоде для города с помощью API и Return
-        данные в виде словаря.
+        погоде для города с помощью API.
 
         Args:
             city_id (int): ID города для получения данных о погоде.
 
         Return:
-            Optional[Dict[str, Any]]:
-                Данные о погоде в формате
-                словаря или None в случае ошибки.
+            Optional[CurrentWeather]:
+                Данные о погоде или None в случае ошибки.
         """
         try:
             return self.weather_api.fetch_weather_by_city_id(city_id)
@@ -767,20 +935,136 @@ class HomePage(QtWidgets.QWidget):
         """
         Обновляет данные о погоде в левой секции для выбранного города.
 
-        Этот метод обновляет интерфейс
-        с прогнозом погоды, отображая экран загрузки
-        и обновляя карточки для прогноза на три дня.
+        Свежие данные из кэша отображаются сразу. Иначе отображаются
+        последние известные данные города с пометкой об их времени,
+        а новые загружаются в фоне. В потоке интерфейса читается
+        только кэш в памяти; если в нём нет города, сохранённые
+        данные читаются из базы первой задачей в пуле, а до их
+        прихода показывается экран загрузки.
+        Ошибка загрузки не оставляет экран загрузки висеть:
+        выводится сообщение, а после восстановления связи данные
+        загружаются снова (см. on_connectivity_changed).
+
+        Каждый вызов начинает новое поколение: ответы, пришедшие
+        для ранее выбранных городов, не перерисовывают интерфейс
+        (см. on_weather_loaded), а повторные клики по одному городу
+        используют один выполняющийся запрос (см. SingleFlight).
+        Загрузка выполняется в пуле задач с приоритетом INTERACTIVE;
+        загрузка предыдущего города, если она ещё не началась,
+        отменяется.
 
         Args:
             city_id (int):
                 ID города для получения и
                 отображения данных о погоде.
         """
-        # Показать экран загрузки текущей погоды
-        self.stack_widget.setCurrentWidget(self.loading_widget)
+        if city_id is None:
+            self.loading_label.setText("Выберите город в списке справа")
+            startup_timer.mark("погода")
+            return
+        self.weather_generation += 1
+        generation = self.weather_generation
+        if self._weather_token is not None:
+            self._weather_token.cancel()
+            self._weather_token = None
+        self.current_city_id = int(city_id)
+        self.history_panel.set_city(city_id)
+
+        # Свежие данные из кэша (например, избранного города,
+        # обновлённого в фоне) показываем сразу, без экрана загрузки.
+        # Значения читаются без загрузки: если запись успела пропасть
+        # из кэша, данные загружаются в фоне, как обычно
+        if (
+            self.weather_api.is_fresh("weather", city_id)
+            and self.weather_api.is_fresh("forecast", city_id)
+        ):
+            weather_data = self.weather_api.cached_weather(city_id)
+            forecast_data = self.weather_api.cached_forecast(city_id)
+            if weather_data is not None and forecast_data is not None:
+                self.update_weather_ui(weather_data, forecast_data)
+                return
+
+        # Обе задачи города отменяются вместе при выборе другого
+        token = CancellationToken()
+        self._weather_token = token
+
+        weather_data = self.weather_api.cached_weather(city_id)
+        if weather_data is not None:
+            self.show_last_known(
+                generation,
+                weather_data,
+                self.weather_api.cached_forecast(city_id),
+            )
+        else:
+            # Показать экран загрузки текущей погоды
+            self.loading_label.setText("Загрузка данных...")
+            self.stack_widget.setCurrentWidget(self.loading_widget)
+            self.clear_forecast("Загрузка...")
+            self.tasks.run(
+                lambda: self.service.last_known(city_id),
+                on_result=lambda data: self.show_last_known(
+                    generation, *data
+                ),
+                on_error=lambda e: print(
+                    f"Ошибка чтения сохранённой погоды: {e}"
+                ),
+                priority=INTERACTIVE,
+                token=token,
+            )
+
+        def on_error(error: BaseException) -> None:
+            print(f"Ошибка получения данных о погоде: {error}")
+            self.show_weather_error(generation, int(city_id))
+
+        self.tasks.run(
+            lambda: self.weather_api.fetch_weather_and_forecast(city_id),
+            on_result=lambda data: self.on_weather_loaded(generation, *data),
+            on_error=on_error,
+            priority=INTERACTIVE,
+            token=token,
+        )
+
+    def show_last_known(
+        self,
+        generation: int,
+        weather_data: Optional[CurrentWeather],
+        forecast_data: Optional[List[ForecastDay]]
+    ) -> None:
+        """
+        Отображает последние известные данные города, пока загружаются
+        новые.
+
+        Данные не отображаются, если с тех пор выбран другой город
+        или данные города уже на экране (например, новые пришли
+        раньше сохранённых).
+
+        Args:
+            generation (int): Номер поколения запроса погоды.
+            weather_data (Optional[CurrentWeather]):
+                Данные о текущей погоде; None, если их нет.
+            forecast_data (Optional[List[ForecastDay]]):
+                Прогноз погоды; None, если его нет.
+        """
+        if generation != self.weather_generation or weather_data is None:
+            return
+        if (
+            self.shown_weather is not None
+            and self.shown_weather.city_id == self.current_city_id
+        ):
+            return
+        self.update_weather_ui(weather_data, forecast_data or [])
+        if not forecast_data:
+            self.clear_forecast("Загрузка...")
+
+    def clear_forecast(self, text: str, start: int = 0) -> None:
+        """
+        Очищает карточки прогноза, оставляя в них сообщение.
 
-        # Показать загрузку для карточек прогноза на 3 дня
-        for i in range(0, 3):
+        Args:
+            text (str): Сообщение вместо описания погоды.
+            start (int): Номер первой очищаемой карточки.
+        """
+        for i in range(start, len(self.forecast_cards)):
             # Обновляем карточку для каждого дня
             card = self.forecast_cards[i]
 
@@ -790,6 +1074,7 @@ class HomePage(QtWidgets.QWidget):
 
             # Обновляем иконку
             icon_label = card.findChild(QtWidgets.QLabel, f"icon_label_{i}")
+            icon_label.setProperty("icon_code", "")
             icon_label.setPixmap(QtGui.QPixmap())
 
             # Обновляем температуру
@@ -806,68 +1091,148 @@ class HomePage(QtWidgets.QWidget):
 
             # Обновляем описание
             desc_label = card.findChild(QtWidgets.QLabel, f"desc_label_{i}")
-            desc_label.setText("Загрузка...")
+            desc_label.setText(text)
 
-        def fetch_and_update():
-            weather_data = self.weather_api.fetch_weather_by_city_id(city_id)
-            forecast_data = self.weather_api.fetch_forecast_by_city_id(city_id)
-            QtCore.QMetaObject.invokeMethod(
-                self,
-                "update_weather_ui",
-                QtCore.Qt.QueuedConnection,
-                QtCore.Q_ARG(dict, weather_data),
-                QtCore.Q_ARG(list, forecast_data),
+    def on_weather_loaded(
+        self,
+        generation: int,
+        weather_data: CurrentWeather,
+        forecast_data: List[ForecastDay]
+    ) -> None:
+        """
+        Отображает погоду, загруженную в фоне, если с начала загрузки
+        не был выбран другой город или не начата новая загрузка.
+
+        Args:
+            generation (int): Номер поколения запроса погоды.
+            weather_data (CurrentWeather): Данные о текущей погоде.
+            forecast_data (List[ForecastDay]): Прогноз погоды.
+        """
+        if generation != self.weather_generation:
+            return
+        self.update_weather_ui(weather_data, forecast_data)
+
+    def show_weather_error(self, generation: int, city_id: int) -> None:
+        """
+        Сообщает о неудачной загрузке погоды в городе.
+
+        Если данные города уже отображаются, остаются они с пометкой
+        об их времени; иначе экран загрузки заменяется сообщением.
+        Ошибки устаревших запросов не отображаются.
+
+        Args:
+            generation (int): Номер поколения запроса погоды.
+            city_id (int): ID города, загрузка которого не удалась.
+        """
+        if generation != self.weather_generation:
+            return
+        startup_timer.mark("погода")
+        if (
+            self.shown_weather is not None
+            and self.shown_weather.city_id == city_id
+        ):
+            self.update_stale_label()
+            return
+
+        if self.weather_api.api.transport.connectivity.online:
+            self.loading_label.setText(
+                "Не удалось загрузить данные о погоде"
             )
+        else:
+            self.loading_label.setText(
+                "Нет связи с сервером погоды.\n"
+                "Данные загрузятся, когда связь восстановится."
+            )
+        self.stack_widget.setCurrentWidget(self.loading_widget)
+        self.clear_forecast("Нет данных")
+
+    @QtCore.pyqtSlot(bool)
+    def on_connectivity_changed(self, online: bool) -> None:
+        """
+        Обрабатывает потерю и восстановление связи.
+
+        После восстановления связи обновляются избранные города
+        и отображаемый город, если его данные устарели.
+
+        Args:
+            online (bool): True, если связь восстановлена.
+        """
+        self.update_stale_label()
+        if not online:
+            return
+
+        self.refresh_scheduler.refresh_now()
+        city_id = self.current_city_id
+        if city_id is not None and not (
+            self.weather_api.is_fresh("weather", city_id)
+            and self.weather_api.is_fresh("forecast", city_id)
+        ):
+            self.update_weather(city_id)
+
+    @QtCore.pyqtSlot()
+    def on_api_key_changed(self) -> None:
+        """
+        Загружает погоду заново после смены API-ключа,
+        если до этого её не удалось получить.
+        """
+        if self.shown_weather is None and self.current_city_id is not None:
+            self.update_weather(self.current_city_id)
 
-        threading.Thread(target=fetch_and_update, daemon=True).start()
+    def update_stale_label(self) -> None:
+        """
+        Показывает время отображаемых данных о погоде, если они
+        устарели, и скрывает пометку для свежих данных.
+        """
+        weather_data = self.shown_weather
+        if (
+            weather_data is None
+            or weather_data.city_id is None
+            or self.weather_api.is_fresh("weather", weather_data.city_id)
+        ):
+            self.stale_label.hide()
+            return
+
+        if weather_data.dt is not None:
+            shown_at = time.strftime(
+                "%d.%m %H:%M", time.localtime(weather_data.dt)
+            )
+            text = f"Показаны данные на {shown_at}"
+        else:
+            text = "Показаны сохранённые данные"
+        if not self.weather_api.api.transport.connectivity.online:
+            text = f"Нет связи. {text}"
+        self.stale_label.setText(text)
+        self.stale_label.show()
 
-    @QtCore.pyqtSlot(dict, list)
+    @QtCore.pyqtSlot(object, list)
     def update_weather_ui(
         self,
-        weather_data: Dict[str, str],
-        forecast_data: List[Dict[str, str]]
+        weather_data: CurrentWeather,
+        forecast_data: List[ForecastDay]
     ) -> None:
         """
         Обновляет интерфейс левой секции данными о
         текущей погоде и прогнозе на несколько дней.
 
         Args:
-            weather_data (dict):
-                Словарь с данными о текущей погоде.
-                Ожидаемые ключи:
-                    'city',
-                    'temperature',
-                    'description',
-                    'pressure',
-                    'feels_like',
-                    'humidity',
-                    'wind_speed',
-                    'wind_deg',
-                    'pixmap'.
-            forecast_data (list):
-                Список словарей с данными
-                прогноза погоды на несколько дней.
-                Каждый элемент списка должен быть
-                словарем с ключами:
-                    'date',
-                    'pixmap',
-                    'temp_min',
-                    'temp_max',
-                    'description'.
+            weather_data (CurrentWeather):
+                Данные о текущей погоде.
+            forecast_data (List[ForecastDay]):
+                Прогноз погоды на несколько дней.
 
         Return:
             None
         """
         # Обновляем данные о текущей погоде
-        city_name = weather_data["city"]
-        temp = weather_data["temperature"]
-        description = weather_data["description"]
-        pressure = weather_data["pressure"]
-        feels_like = weather_data["feels_like"]
-        humidity = weather_data["humidity"]
+        city_name = weather_data.city
+        temp = weather_data.temperature
+        description = weather_data.description
+        pressure = weather_data.pressure
+        feels_like = weather_data.feels_like
+        humidity = weather_data.humidity
         wind = (
-            f"{weather_data['wind_speed']} м/с, "
-            f"{self.degrees_to_compass(weather_data['wind_deg'])}"
+            f"{weather_data.wind_speed} м/с, "
+            f"{self.degrees_to_compass(weather_data.wind_deg)}"
         )
 
         self.weather_title.setText(f"Текущая погода в: {city_name}")
@@ -877,7 +1242,9 @@ class HomePage(QtWidgets.QWidget):
         self.pressure_label.setText(
             f"{round(pressure * 0.750063755)} мм рт. ст. "
         )
-        self.weather_icon_label.setPixmap(weather_data['pixmap'])
+        self.weather_icon_label.setPixmap(
+            self.icon_pixmap(weather_data.icon)
+        )
         self.feels_like_label.setText(f"Ощущается как {feels_like} ℃")
         self.humidity_label.setText(f"{humidity}% ")
         self.wind_label.setText(wind)
@@ -885,5 +1252,9 @@ class HomePage(QtWidgets.QWidget):
         # Обновляем данные прогноза
         self.update_forecast(forecast_data)
 
+        self.shown_weather = weather_data
+        self.update_stale_label()
+        startup_timer.mark("погода")
+
         # Показать экран с погодой
         self.stack_widget.setCurrentWidget(self.weather_widget)
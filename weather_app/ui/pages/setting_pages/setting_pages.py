@@ -8,16 +8,22 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QPushButton,
 )
-from weather_app.db.database import Database
+from weather_app.db.settings import Settings
+from typing import Optional
 
 
 class SettingPage(QtWidgets.QWidget):
     """
     Класс страницы настроек приложения.
 
+    Signals:
+        api_key_saved (object):
+            Запись API Key в базу завершена; аргумент — исключение
+            или None при успехе. Испускается из потока записи.
+
     Attributes:
-        database (Database):
-            Экземпляр класса для взаимодействия с базой данных.
+        settings (Settings):
+            Настройки приложения.
         layout (QVBoxLayout):
             Основной вертикальный компоновщик страницы.
         title (QLabel):
@@ -30,6 +36,8 @@ class SettingPage(QtWidgets.QWidget):
             Кнопка сохранения API Key.
     """
 
+    api_key_saved = QtCore.pyqtSignal(object)
+
     def __init__(self, parent: QtWidgets.QWidget):
         """
         Инициализация страницы настроек.
@@ -39,7 +47,10 @@ class SettingPage(QtWidgets.QWidget):
                 Родительский объект (основное окно приложения).
         """
         super().__init__(parent)
-        self.database: Database = Database()
+        self.settings: Settings = Settings.shared()
+        self.api_key_saved.connect(
+            self.show_save_result, QtCore.Qt.QueuedConnection
+        )
 
         # Основной layout
         self.layout: QVBoxLayout = QVBoxLayout(self)
@@ -91,7 +102,7 @@ class SettingPage(QtWidgets.QWidget):
         self.api_key_input: QLineEdit = QLineEdit()
         self.api_key_input.setPlaceholderText("Введите API Key")
         self.api_key_input.setText(
-            self.database.get_setting('OPEN_WEATHER_MAP_API_KEY') or ""
+            self.settings.get('OPEN_WEATHER_MAP_API_KEY', "")
         )
         api_key_layout.addWidget(self.api_key_input)
 
@@ -118,24 +129,45 @@ class SettingPage(QtWidgets.QWidget):
         # Добавляем этот контейнер в основной layout
         self.layout.addWidget(api_key_container)
 
+    @QtCore.pyqtSlot(object)
+    def show_save_result(self, error: Optional[BaseException]) -> None:
+        """
+        Сообщает о результате записи API Key в базу.
+
+        Args:
+            error (Optional[BaseException]):
+                Исключение записи или None при успехе.
+        """
+        self.save_button.setEnabled(True)
+        msg_box = QtWidgets.QMessageBox()
+        if error is None:
+            msg_box.setIcon(QtWidgets.QMessageBox.Information)
+            msg_box.setWindowTitle("Сохранено")
+            msg_box.setText("API Key успешно сохранён.")
+        else:
+            msg_box.setIcon(QtWidgets.QMessageBox.Warning)
+            msg_box.setWindowTitle("Ошибка")
+            msg_box.setText(f"Не удалось сохранить API Key: {error}")
+        msg_box.exec_()
+
     def save_api_key(self) -> None:
         """
         Сохраняет введённый API Key в базу данных.
 
+        Новый ключ сразу применяется к запросам погоды (см.
+        Settings.subscribe), а запись в базу не откладывается.
         Если поле ввода пустое, отображает предупреждение.
-        При успешном сохранении отображает сообщение об успешной операции.
+        Результат записи отображается после её завершения
+        (см. show_save_result); интерфейс запись не ждёт.
         """
         new_api_key: str = self.api_key_input.text().strip()
         if new_api_key:
-            self.database.set_setting('OPEN_WEATHER_MAP_API_KEY', new_api_key)
-
-            # Создаём QMessageBox и настраиваем его стиль
-            msg_box = QtWidgets.QMessageBox()
-            msg_box.setIcon(QtWidgets.QMessageBox.Information)
-            msg_box.setWindowTitle("Сохранено")
-            msg_box.setText("API Key успешно сохранён.")
-
-            msg_box.exec_()
+            self.settings.set('OPEN_WEATHER_MAP_API_KEY', new_api_key)
+            saved = self.settings.flush()
+            self.save_button.setEnabled(False)
+            saved.add_done_callback(
+                lambda done: self.api_key_saved.emit(done.exception())
+            )
         else:
             # Аналогично для предупреждения
             msg_box = QtWidgets.QMessageBox(self)
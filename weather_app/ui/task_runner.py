@@ -0,0 +1,145 @@
+"""Фоновые задачи интерфейса с доставкой результатов в поток Qt"""
+
+from concurrent.futures import CancelledError, Future
+from PyQt5 import QtCore
+from weather_app.api.tasks import INTERACTIVE, CancellationToken, TaskPool
+from typing import Any, Callable, Optional, Tuple
+
+# Задача интерфейса: обработчик результата, обработчик ошибки
+# и признак отмены
+_Task = Tuple[
+    Optional[Callable[[Any], None]],
+    Optional[Callable[[BaseException], None]],
+    CancellationToken,
+]
+
+
+class TaskRunner(QtCore.QObject):
+    """
+    Запускает задачи в TaskPool и передаёт их результаты и ошибки
+    в поток интерфейса сигналами.
+
+    Обработчики вызываются в потоке, которому принадлежит TaskRunner
+    (потоке интерфейса), поэтому могут менять виджеты. Результаты
+    и ошибки отменённых задач не доставляются.
+
+    Signals:
+        finished (object, object): Задача и её результат.
+        failed (object, object): Задача и её исключение.
+
+    Attributes:
+        pool (TaskPool): Пул потоков задач.
+    """
+
+    finished = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, object)
+
+    def __init__(
+        self,
+        pool: TaskPool,
+        parent: Optional[QtCore.QObject] = None
+    ) -> None:
+        """
+        Инициализирует запуск задач поверх пула.
+
+        Args:
+            pool (TaskPool): Пул потоков задач.
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.pool: TaskPool = pool
+        # Очередь событий, даже если задача завершилась до возврата
+        # из run: обработчики никогда не вызываются внутри run
+        self.finished.connect(self._on_finished, QtCore.Qt.QueuedConnection)
+        self.failed.connect(self._on_failed, QtCore.Qt.QueuedConnection)
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        priority: int = INTERACTIVE,
+        token: Optional[CancellationToken] = None
+    ) -> CancellationToken:
+        """
+        Запускает функцию в пуле.
+
+        Args:
+            fn (Callable[[], Any]): Функция задачи.
+            on_result (Optional[Callable[[Any], None]]):
+                Получает результат в потоке интерфейса.
+            on_error (Optional[Callable[[BaseException], None]]):
+                Получает исключение в потоке интерфейса. Без него
+                ошибка выводится в консоль.
+            priority (int): Приоритет задачи в пуле.
+            token (Optional[CancellationToken]):
+                Признак отмены. По умолчанию создаётся новый.
+
+        Return:
+            CancellationToken: Признак отмены задачи.
+        """
+        token = token or CancellationToken()
+        future = self.pool.submit(fn, priority=priority, token=token)
+        return self.watch(future, on_result, on_error, token)
+
+    def watch(
+        self,
+        future: "Future[Any]",
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        token: Optional[CancellationToken] = None
+    ) -> CancellationToken:
+        """
+        Передаёт итог уже запущенной работы (например, задачи записи
+        DatabaseService.write) в поток интерфейса, не блокируя его.
+
+        Args:
+            future (Future[Any]): Будущий результат работы.
+            on_result (Optional[Callable[[Any], None]]):
+                Получает результат в потоке интерфейса.
+            on_error (Optional[Callable[[BaseException], None]]):
+                Получает исключение в потоке интерфейса.
+            token (Optional[CancellationToken]):
+                Признак отмены доставки. По умолчанию создаётся новый.
+
+        Return:
+            CancellationToken: Признак отмены доставки.
+        """
+        token = token or CancellationToken()
+        task: _Task = (on_result, on_error, token)
+        future.add_done_callback(lambda done: self._deliver(task, done))
+        return token
+
+    def _deliver(self, task: _Task, future: "Future[Any]") -> None:
+        """
+        Передаёт итог задачи в поток интерфейса. Вызывается в потоке,
+        завершившем работу (пула или записи базы данных).
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.finished.emit(task, future.result())
+        elif not isinstance(error, CancelledError):
+            self.failed.emit(task, error)
+
+    def _on_finished(self, task: _Task, result: Any) -> None:
+        """
+        Вызывает обработчик результата, если задача не отменена.
+        """
+        on_result, _, token = task
+        if not token.cancelled and on_result is not None:
+            on_result(result)
+
+    def _on_failed(self, task: _Task, error: BaseException) -> None:
+        """
+        Вызывает обработчик ошибки, если задача не отменена.
+        """
+        _, on_error, token = task
+        if token.cancelled:
+            return
+        if on_error is not None:
+            on_error(error)
+        else:
+            print(f"Ошибка фоновой задачи: {error}")
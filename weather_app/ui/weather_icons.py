@@ -0,0 +1,141 @@
+"""Иконки погоды для интерфейса"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from PyQt5 import QtCore
+from PyQt5.QtGui import QPixmap
+from weather_app.api.icon_cache import IconCache
+from weather_app.api.tasks import BACKGROUND, TaskPool
+from typing import Optional, Set
+
+
+class WeatherIcons(QtCore.QObject):
+    """
+    LRU декодированных иконок погоды поверх IconCache.
+
+    IconCache не зависит от Qt и отдаёт PNG-данные, а здесь они
+    превращаются в QPixmap. QPixmap можно создавать только в потоке
+    интерфейса, поэтому методы вызываются только из него; рабочие
+    потоки заранее загружают данные в IconCache.
+
+    При отрисовке иконки ищутся только в памяти и на диске. Иконка,
+    которой там нет (например, её предварительная загрузка не
+    удалась), скачивается в пуле задач с приоритетом BACKGROUND,
+    а после загрузки испускается icon_loaded, чтобы интерфейс
+    перерисовал её.
+
+    Signals:
+        icon_loaded (str): Код иконки, загруженной в фоне.
+
+    Attributes:
+        icon_cache (IconCache): Кэш PNG-данных иконок.
+        max_pixmaps (int): Максимальное число QPixmap в памяти.
+        pool (Optional[TaskPool]):
+            Пул для загрузки отсутствующих иконок; без него такие
+            иконки не загружаются.
+    """
+
+    icon_loaded = QtCore.pyqtSignal(str)
+    # Итог фоновой загрузки: код иконки и признак успеха
+    _downloaded = QtCore.pyqtSignal(str, bool)
+
+    def __init__(
+        self,
+        icon_cache: IconCache,
+        max_pixmaps: int = 32,
+        pool: Optional[TaskPool] = None,
+        parent: Optional[QtCore.QObject] = None
+    ):
+        """
+        Инициализирует кэш декодированных иконок.
+
+        Args:
+            icon_cache (IconCache): Кэш PNG-данных иконок.
+            max_pixmaps (int): Размер LRU декодированных иконок.
+            pool (Optional[TaskPool]):
+                Пул для загрузки отсутствующих иконок.
+            parent (Optional[QtCore.QObject], optional):
+                Родительский объект. По умолчанию None.
+        """
+        super().__init__(parent)
+        self.icon_cache: IconCache = icon_cache
+        self.max_pixmaps: int = max_pixmaps
+        self.pool: Optional[TaskPool] = pool
+        self._pixmaps: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._downloading: Set[str] = set()
+        self._downloaded.connect(
+            self._on_downloaded, QtCore.Qt.QueuedConnection
+        )
+
+    def get_pixmap(self, code: str) -> QPixmap:
+        """
+        Возвращает декодированную иконку из LRU или из IconCache
+        без обращения к сети.
+
+        Args:
+            code (str): Код иконки OpenWeatherMap.
+
+        Return:
+            QPixmap: Иконка погоды или пустой QPixmap, если её ещё
+            нет локально (тогда она загружается в фоне).
+
+        Exception:
+            ValueError: Если код иконки некорректен.
+        """
+        pixmap = self._pixmaps.get(code)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(code)
+            return pixmap
+
+        data = self.icon_cache.get_cached(code)
+        if data is None:
+            self._download(code)
+            return QPixmap()
+
+        pixmap = QPixmap()
+        pixmap.loadFromData(data)
+        self._pixmaps[code] = pixmap
+        while len(self._pixmaps) > self.max_pixmaps:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def _download(self, code: str) -> None:
+        """
+        Ставит загрузку иконки в пул, если она ещё не загружается.
+        """
+        if self.pool is None or code in self._downloading:
+            return
+        try:
+            future = self.pool.submit(
+                self.icon_cache.get_bytes, code, priority=BACKGROUND
+            )
+        except RuntimeError:
+            # Пул остановлен при закрытии приложения
+            return
+        self._downloading.add(code)
+        future.add_done_callback(lambda done: self._finished(code, done))
+
+    def _finished(self, code: str, future: "Future[bytes]") -> None:
+        """
+        Передаёт итог загрузки в поток интерфейса. Вызывается
+        в потоке пула.
+        """
+        if future.cancelled():
+            ok = False
+        else:
+            error = future.exception()
+            if error is not None:
+                print(f"Ошибка загрузки иконки погоды: {error}")
+            ok = error is None
+        self._downloaded.emit(code, ok)
+
+    @QtCore.pyqtSlot(str, bool)
+    def _on_downloaded(self, code: str, ok: bool) -> None:
+        """
+        Снимает отметку загрузки и сообщает о загруженной иконке.
+        Иконка, которую не удалось загрузить, будет запрошена снова
+        при следующей отрисовке.
+        """
+        self._downloading.discard(code)
+        if ok:
+            self.icon_loaded.emit(code)